@@ -0,0 +1,5 @@
+"""Benchmarks for performance sensitive parts of the CLI.
+
+Each module is runnable on its own, e.g., ``python -m benchmarks.src_exclude``.
+`benchmarks.commands` times whole CLI commands, rather than parts of them.
+"""
@@ -0,0 +1,418 @@
+"""Time CLI commands end to end against synthetic templates.
+
+Builds a template-infra-like template and an application template locally,
+with a configurable number of apps, files and tags, served over ``file://`` so
+the remote template code paths (mirrors, tag listing, etc.) are exercised. Each
+command then runs in a fresh process (see `benchmarks.phases`), on a fresh copy
+of a prepared project, both with an empty ("cold") and a primed ("warm") cache
+directory. Process startup is measured separately.
+
+Results can be saved as JSON with ``--output`` and checked against a previous
+run with ``--compare``, which exits non-zero if anything got slower than the
+threshold allows.
+
+Run with ``python -m benchmarks.commands``.
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+from nava.platform.util.git import GitProject
+
+# how much slower than the baseline a result can be before it's a regression,
+# as a fraction of the baseline
+DEFAULT_THRESHOLD = 0.2
+
+# differences smaller than this (in seconds) are noise, whatever the fraction
+MIN_REGRESSION_SECONDS = 0.05
+
+INFRA_TEMPLATE_NAME = "template-infra"
+APP_TEMPLATE_NAME = "template-application-bench"
+
+GIT_ENV = {
+    "GIT_AUTHOR_NAME": "Benchmark",
+    "GIT_AUTHOR_EMAIL": "benchmark@example.com",
+    "GIT_COMMITTER_NAME": "Benchmark",
+    "GIT_COMMITTER_EMAIL": "benchmark@example.com",
+}
+
+
+@dataclass
+class Params:
+    apps: int
+    files: int
+    tags: int
+
+    @property
+    def versions(self) -> list[str]:
+        return [f"v0.{i}.0" for i in range(self.tags)]
+
+    @property
+    def app_names(self) -> list[str]:
+        return [f"app{i}" for i in range(self.apps)]
+
+
+@dataclass
+class Fixtures:
+    root: Path
+    params: Params
+    infra_template_uri: str
+    app_template_uri: str
+    installed_project: Path
+    """Project with all the apps on the second to last template versions."""
+
+
+def write_files(root: Path, files: dict[str, str]) -> None:
+    for rel_path, content in files.items():
+        path = root / rel_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+
+
+def infra_template_files(params: Params, version: str) -> dict[str, str]:
+    files = {
+        ".template-infra/{{_copier_conf.answers_file}}.jinja": (
+            "{{ _copier_answers|to_nice_yaml -}}"
+        ),
+        ".github/workflows/ci-{{app_name}}-pr-environment-checks.yml": "{{ app_name }}\n",
+        ".github/workflows/pr-environment-checks.yml": "",
+        ".github/workflows/template-only-ci-infra.yml": "",
+        "bin/publish-release": "",
+        "infra/networks/main.tf.jinja": (
+            "{% for app_name in app_names %}# {{ app_name }}\n{% endfor %}"
+        ),
+        "infra/project-config/main.tf": f"# {version}\n",
+        "template-only-bin/install-template": "",
+    }
+
+    for i in range(params.files):
+        for file_name in ("main.tf", "variables.tf", "outputs.tf"):
+            files[f"infra/modules/module-{i}/{file_name}"] = f"# module {i}\n"
+            files[f"infra/{{{{app_name}}}}/module-{i}/{file_name}.jinja"] = (
+                f"# {{{{ app_name }}}} module {i}\n"
+            )
+
+    return files
+
+
+def app_template_files(params: Params, version: str) -> dict[str, str]:
+    files = {
+        f".{APP_TEMPLATE_NAME}/{{{{_copier_conf.answers_file}}}}.jinja": (
+            "{{ _copier_answers|to_nice_yaml -}}"
+        ),
+        "{{app_name}}/VERSION": f"{version}\n",
+        # so the app name is in the answers file, for rendering the old version
+        # during an update
+        "copier.yml": "app_name:\n  type: str\n",
+    }
+
+    for i in range(params.files):
+        files[f"{{{{app_name}}}}/src/file_{i}.py.jinja"] = f"# {{{{ app_name }}}} {i}\n"
+
+    return files
+
+
+def make_template(
+    path: Path, params: Params, files: Callable[[Params, str], dict[str, str]]
+) -> str:
+    """Create a template repo with a commit and tag per version, return its URI."""
+    path.mkdir(parents=True)
+    git = GitProject(path)
+    git.init()
+
+    for version in params.versions:
+        write_files(path, files(params, version))
+        git.commit_all(f"Release {version}")
+        git.tag(version)
+
+    return f"git+file://{path}"
+
+
+def run(args: list[str], env: dict[str, str], phases_file: Path | None = None) -> None:
+    if phases_file is None:
+        command = [sys.executable, *args]
+    else:
+        command = [sys.executable, "-m", "benchmarks.phases", str(phases_file), *args]
+
+    result = subprocess.run(command, env=env, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(
+            f"{' '.join(args)} failed ({result.returncode}):\n{result.stdout}\n{result.stderr}"
+        )
+
+
+def cli_env(cache_dir: Path) -> dict[str, str]:
+    return os.environ | GIT_ENV | {"XDG_CACHE_HOME": str(cache_dir), "LOG_TO_FILE": "false"}
+
+
+def cli(*args: str) -> list[str]:
+    return ["-m", "nava.platform.cli.main", *args]
+
+
+def make_fixtures(root: Path, params: Params) -> Fixtures:
+    infra_template_uri = make_template(
+        root / "templates" / INFRA_TEMPLATE_NAME, params, infra_template_files
+    )
+    app_template_uri = make_template(
+        root / "templates" / APP_TEMPLATE_NAME, params, app_template_files
+    )
+
+    project = root / "installed-project"
+    project.mkdir()
+    GitProject(project).init()
+
+    previous_version = params.versions[-2]
+    env = cli_env(root / "setup-cache")
+    first_app, *other_apps = params.app_names
+    run(
+        cli(
+            "infra", "install", str(project), "--template-uri", infra_template_uri,
+            "--version", previous_version, "--data", f"app_name={first_app}", "--commit",
+        ),
+        env,
+    )  # fmt: skip
+    for app_name in other_apps:
+        run(
+            cli(
+                "infra", "add-app", str(project), app_name,
+                "--template-uri", infra_template_uri,
+            ),
+            env,
+        )  # fmt: skip
+    run(
+        cli(
+            "app", "install", str(project), first_app, "--template-uri", app_template_uri,
+            "--version", previous_version, "--commit",
+        ),
+        env,
+    )  # fmt: skip
+
+    return Fixtures(
+        root=root,
+        params=params,
+        infra_template_uri=infra_template_uri,
+        app_template_uri=app_template_uri,
+        installed_project=project,
+    )
+
+
+@dataclass
+class Scenario:
+    name: str
+    args: Callable[[Fixtures, Path], list[str]]
+    """The CLI arguments, given the fixtures and the project to run against."""
+    installed: bool = True
+    """Start from the installed project, rather than an empty one."""
+
+
+SCENARIOS = [
+    Scenario(
+        "infra install",
+        lambda f, project: [
+            "infra", "install", str(project), "--template-uri", f.infra_template_uri,
+            "--data", "app_name=app0", "--commit",
+        ],
+        installed=False,
+    ),
+    Scenario(
+        "infra add-app",
+        lambda f, project: [
+            "infra", "add-app", str(project), f"app{f.params.apps}",
+            "--template-uri", f.infra_template_uri,
+        ],
+    ),
+    Scenario("infra update", lambda f, project: ["infra", "update", str(project)]),
+    Scenario("app update", lambda f, project: ["app", "update", str(project), "app0"]),
+    Scenario("infra info", lambda f, project: ["infra", "info", str(project)]),
+]  # fmt: skip
+
+STARTUP = {
+    "import": ["-c", "import nava.platform.cli.main"],
+    "help": ["-m", "nava.platform.cli.main", "--help"],
+}
+
+
+def prepare_project(fixtures: Fixtures, scenario: Scenario, dest: Path) -> Path:
+    if scenario.installed:
+        shutil.copytree(fixtures.installed_project, dest, symlinks=True)
+    else:
+        dest.mkdir()
+        GitProject(dest).init()
+
+    return dest
+
+
+def time_scenario(
+    fixtures: Fixtures, scenario: Scenario, warm: bool, repeat: int
+) -> dict[str, Any]:
+    runs_dir = Path(tempfile.mkdtemp(dir=fixtures.root, prefix="runs-"))
+    warm_cache = runs_dir / "cache"
+
+    def run_once(i: int) -> dict[str, Any]:
+        project = prepare_project(fixtures, scenario, runs_dir / f"project-{i}")
+        cache = warm_cache if warm else runs_dir / f"cache-{i}"
+        phases_file = runs_dir / f"phases-{i}.json"
+
+        start = time.perf_counter()
+        run(scenario.args(fixtures, project), cli_env(cache), phases_file)
+        wall = time.perf_counter() - start
+
+        result: dict[str, Any] = json.loads(phases_file.read_text())
+        # everything before the runner could start its clock
+        result["phases"]["interpreter"] = wall - result["total"]
+        result["total"] = wall
+        return result
+
+    if warm:
+        run_once(-1)
+
+    runs = [run_once(i) for i in range(repeat)]
+    shutil.rmtree(runs_dir, ignore_errors=True)
+
+    return summarize(runs)
+
+
+def time_startup(args: list[str], repeat: int) -> dict[str, Any]:
+    env = cli_env(Path(tempfile.gettempdir()))
+    # the first run may need to write bytecode
+    run(args, env)
+
+    totals = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run(args, env)
+        totals.append(time.perf_counter() - start)
+
+    return {"total": statistics.median(totals), "phases": {}}
+
+
+def summarize(runs: list[dict[str, Any]]) -> dict[str, Any]:
+    phase_names = sorted({name for run in runs for name in run["phases"]})
+    return {
+        "total": statistics.median(run["total"] for run in runs),
+        "phases": {
+            name: statistics.median(run["phases"].get(name, 0.0) for run in runs)
+            for name in phase_names
+        },
+    }
+
+
+def compare(baseline: dict[str, Any], current: dict[str, Any], threshold: float) -> list[str]:
+    """Print how ``current`` compares to ``baseline``, return the regressed results."""
+    if baseline["meta"]["params"] != current["meta"]["params"]:
+        print(f"Baseline was run with different parameters: {baseline['meta']['params']}")
+
+    regressions = []
+    for name, result in current["results"].items():
+        if name not in baseline["results"]:
+            continue
+
+        before = baseline["results"][name]["total"]
+        after = result["total"]
+        change = (after - before) / before if before else 0.0
+        regressed = after - before > max(before * threshold, MIN_REGRESSION_SECONDS)
+        if regressed:
+            regressions.append(name)
+
+        flag = "  REGRESSION" if regressed else ""
+        print(
+            f"{name:>24}: {before * 1000:8.0f} ms -> {after * 1000:8.0f} ms ({change:+.0%}){flag}"
+        )
+
+    return regressions
+
+
+def print_result(name: str, result: dict[str, Any]) -> None:
+    phases = ", ".join(
+        f"{phase} {seconds * 1000:.0f}"
+        for phase, seconds in sorted(result["phases"].items(), key=lambda item: -item[1])
+    )
+    print(f"{name:>24}: {result['total'] * 1000:8.0f} ms" + (f"  ({phases})" if phases else ""))
+
+
+def git_commit() -> str | None:
+    result = subprocess.run(
+        ["git", "rev-parse", "HEAD"],
+        cwd=Path(__file__).parent,
+        capture_output=True,
+        text=True,
+    )
+    return result.stdout.strip() if result.returncode == 0 else None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0] if __doc__ else None)
+    parser.add_argument("--apps", type=int, default=3, help="apps in the project")
+    parser.add_argument("--files", type=int, default=20, help="modules/files per directory")
+    parser.add_argument("--tags", type=int, default=3, help="template versions (at least 2)")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per measurement")
+    parser.add_argument(
+        "--scenario",
+        action="append",
+        choices=[scenario.name for scenario in SCENARIOS],
+        help="only run these (default: all)",
+    )
+    parser.add_argument("--output", type=Path, help="write the results as JSON here")
+    parser.add_argument("--compare", type=Path, help="previous results to check against")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="fraction slower than --compare that counts as a regression",
+    )
+    args = parser.parse_args()
+
+    params = Params(apps=args.apps, files=args.files, tags=max(args.tags, 2))
+    scenarios = [s for s in SCENARIOS if not args.scenario or s.name in args.scenario]
+
+    results: dict[str, Any] = {}
+    for name, startup_args in STARTUP.items():
+        results[f"startup {name}"] = time_startup(startup_args, args.repeat)
+        print_result(f"startup {name}", results[f"startup {name}"])
+
+    with tempfile.TemporaryDirectory() as dir:
+        fixtures = make_fixtures(Path(dir), params)
+
+        for scenario in scenarios:
+            for warm in (False, True):
+                name = f"{scenario.name} ({'warm' if warm else 'cold'})"
+                results[name] = time_scenario(fixtures, scenario, warm, args.repeat)
+                print_result(name, results[name])
+
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "created": datetime.now(UTC).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "params": vars(params) | {"repeat": args.repeat},
+        },
+        "results": results,
+    }
+
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2) + "\n")
+
+    if args.compare:
+        print()
+        regressions = compare(json.loads(args.compare.read_text()), report, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Run a CLI command, recording how long it spends in each phase.
+
+Used by `benchmarks.commands`, which runs this in a fresh process per command:
+
+    python -m benchmarks.phases OUTPUT_JSON ARGS...
+
+The phases are exclusive of each other, time spent checking out a template
+during a render counts towards ``checkout``, not ``render``. Whatever isn't in
+a phase is ``other``.
+"""
+
+import time
+
+START = time.perf_counter()
+
+import functools  # noqa: E402
+import importlib  # noqa: E402
+import json  # noqa: E402
+import sys  # noqa: E402
+from collections import defaultdict  # noqa: E402
+from collections.abc import Callable  # noqa: E402
+from pathlib import Path  # noqa: E402
+from typing import Any  # noqa: E402
+
+# phase name -> methods to time, as (module, class, method)
+PHASES = {
+    "checkout": [("nava.platform.templates.checkouts", "TemplateCheckouts", "checkout")],
+    "render": [("nava.platform.copier_worker", "NavaWorker", "_render_template")],
+    "tasks": [("nava.platform.copier_worker", "NavaWorker", "_execute_tasks")],
+    "commit": [
+        ("nava.platform.util.git", "GitProject", "commit_all"),
+        ("nava.platform.util.git", "GitProject", "commit_paths"),
+    ],
+}
+
+_durations: defaultdict[str, float] = defaultdict(float)
+# time spent in nested phases, for each phase currently running
+_child_durations: list[float] = []
+
+
+def timed(phase: str, func: Callable[..., Any]) -> Callable[..., Any]:
+    @functools.wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        start = time.perf_counter()
+        _child_durations.append(0.0)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start
+            _durations[phase] += elapsed - _child_durations.pop()
+            if _child_durations:
+                _child_durations[-1] += elapsed
+
+    return wrapper
+
+
+def instrument() -> None:
+    for phase, methods in PHASES.items():
+        for module_name, class_name, method_name in methods:
+            cls = getattr(importlib.import_module(module_name), class_name)
+            setattr(cls, method_name, timed(phase, getattr(cls, method_name)))
+
+
+def main() -> None:
+    output, *args = sys.argv[1:]
+
+    import nava.platform.cli.main
+
+    _durations["import"] = time.perf_counter() - START
+
+    # importing what's timed is part of running the command, not the phases
+    load_start = time.perf_counter()
+    instrument()
+    _durations["load"] = time.perf_counter() - load_start
+
+    exit_code: int | str | None = 0
+    try:
+        nava.platform.cli.main.app(args, prog_name="nava-platform")
+    except SystemExit as e:
+        exit_code = e.code
+
+    total = time.perf_counter() - START
+    _durations["other"] = total - sum(_durations.values())
+
+    Path(output).write_text(
+        json.dumps({"exit_code": exit_code, "total": total, "phases": dict(_durations)})
+    )
+    sys.exit(exit_code)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""Compare walking a template-infra sized tree with and without compiled exclusions.
+
+The "upstream" cases are what Copier does: walk every path in the template and
+check each one against a `pathspec.PathSpec`. The "compiled" cases are what
+`NavaWorker` does: walk with `SrcExcludeMatcher`, skipping directories where
+everything is excluded. The "match" cases time just the matching, over every
+path in the tree.
+
+Run with ``python -m benchmarks.src_exclude``.
+"""
+
+import argparse
+import os
+import tempfile
+import timeit
+from collections.abc import Callable, Iterator
+from pathlib import Path
+
+from pathspec import PathSpec
+
+from nava.platform.templates.src_exclude import SrcExcludeMatcher
+
+# template-infra has a handful of app-specific directories, each with a
+# number of modules, alongside shared modules, docs, CI config, etc.
+APP_DIRS = ["infra/{{app_name}}", ".github/workflows/{{app_name}}", "docs/{{app_name}}"]
+SHARED_DIRS = ["infra/modules", "infra/project-config", "docs/infra", ".github/workflows", "bin"]
+
+PATTERN_SETS = {
+    "base": [".git", "*{{app_name}}*"],
+    "app": [".git", "*", "!*{{app_name}}*", "!/.template-infra/"],
+}
+
+
+def make_tree(root: Path, width: int) -> int:
+    """Create ``width`` modules of files under each directory, return the file count."""
+    count = 0
+    for dir_name in APP_DIRS + SHARED_DIRS:
+        for module in range(width):
+            module_dir = root / dir_name / f"module-{module}"
+            module_dir.mkdir(parents=True)
+            for file_name in ("main.tf", "variables.tf", "outputs.tf", "README.md"):
+                (module_dir / file_name).write_text("")
+                count += 1
+
+    return count
+
+
+def walk(
+    root: Path, is_excluded: Callable[[Path], bool], is_dir_excluded: Callable[[Path], bool]
+) -> int:
+    def scan(path: str) -> Iterator[os.DirEntry[str]]:
+        for entry in os.scandir(path):
+            yield entry
+            if entry.is_dir() and not is_dir_excluded(Path(entry.path).relative_to(root)):
+                yield from scan(entry.path)
+
+    return sum(
+        1 for entry in scan(str(root)) if not is_excluded(Path(entry.path).relative_to(root))
+    )
+
+
+def bench(root: Path, name: str, patterns: list[str], number: int) -> None:
+    spec = PathSpec.from_lines("gitwildmatch", patterns)
+    all_paths = [p.relative_to(root) for p in root.rglob("*")]
+
+    def upstream_match() -> list[bool]:
+        return [spec.match_file(p) for p in all_paths]
+
+    def compiled_match() -> list[bool]:
+        matcher = SrcExcludeMatcher(patterns)
+        return [matcher(p) for p in all_paths]
+
+    def upstream_walk() -> int:
+        return walk(root, spec.match_file, lambda _: False)
+
+    def compiled_walk() -> int:
+        # not cached, to include the compile time
+        matcher = SrcExcludeMatcher(patterns)
+        return walk(root, matcher, matcher.is_dir_excluded)
+
+    assert upstream_match() == compiled_match()
+    assert upstream_walk() == compiled_walk()
+
+    for case, func in (
+        ("upstream match", upstream_match),
+        ("compiled match", compiled_match),
+        ("upstream walk", upstream_walk),
+        ("compiled walk", compiled_walk),
+    ):
+        seconds = min(timeit.repeat(func, number=number, repeat=3)) / number
+        print(f"{name:>5} {case:>15}: {seconds * 1000:8.2f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0] if __doc__ else None)
+    parser.add_argument("--width", type=int, default=40, help="modules per directory")
+    parser.add_argument("--number", type=int, default=10, help="runs per measurement")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as dir:
+        root = Path(dir)
+        file_count = make_tree(root, args.width)
+        print(f"{file_count} files")
+
+        for name, patterns in PATTERN_SETS.items():
+            bench(root, name, patterns, args.number)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,6 @@
 from pathlib import Path
 from typing import Annotated, cast
 
-import questionary
 import typer
 
 import nava.platform.util.collections.dict as dict_util
@@ -10,13 +9,15 @@ from nava.platform.cli.commands.common import (
     opt_commit,
     opt_data,
     opt_force_update,
+    opt_jobs,
     opt_template_uri,
     opt_version,
 )
 from nava.platform.cli.context import CliContext
-from nava.platform.projects.migrate_from_legacy_template import MigrateFromLegacyTemplate
-from nava.platform.projects.project import Project
-from nava.platform.templates.template import Template
+
+# The command implementations (and Copier, etc.) are imported inside each
+# command, so only the command that runs pays for its imports, see
+# `nava.platform.cli.lazy_group`
 
 app = typer.Typer(help="Manage application templates")
 
@@ -41,12 +42,16 @@ def install(
             help="The name of the template. Usually this can be derived from the repository name automatically, but if you are running from a local checkout under a different name, you will need to specify the upstream name here."
         ),
     ] = None,
+    jobs: Annotated[int, opt_jobs] = 1,
 ) -> None:
     """Install application template in project."""
+    from nava.platform.projects.project import Project
+    from nava.platform.templates.template import Template
+
     ctx = typer_context.ensure_object(CliContext)
 
     with ctx.handle_exceptions():
-        template = Template(ctx, template_uri=template_uri, template_name=template_name)
+        template = Template(ctx, template_uri=template_uri, template_name=template_name, jobs=jobs)
         project = Project(project_dir)
         template.install(
             project=project,
@@ -82,15 +87,23 @@ def update(
     ] = None,
     answers_only: Annotated[bool, opt_answers_only] = False,
     force: Annotated[bool, opt_force_update] = False,
+    jobs: Annotated[int, opt_jobs] = 1,
 ) -> None:
     """Update application based on template in project."""
+    import questionary
+
+    from nava.platform.projects.project import Project
+    from nava.platform.templates.template import Template
+
     ctx = typer_context.ensure_object(CliContext)
 
     with ctx.handle_exceptions():
         project = Project(project_dir)
 
         if template_uri:
-            template = Template(ctx, template_uri=template_uri, template_name=template_name)
+            template = Template(
+                ctx, template_uri=template_uri, template_name=template_name, jobs=jobs
+            )
         else:
             installed_templates_for_app = list(
                 filter(
@@ -113,7 +126,7 @@ def update(
                 )
 
             template = Template.from_existing(
-                ctx, project, app_name=app_name, template_name=template_name
+                ctx, project, app_name=app_name, template_name=template_name, jobs=jobs
             )
 
         ctx.console.rule(f"{app_name} ({template.template_name.id})")
@@ -160,6 +173,9 @@ def migrate_from_legacy(
     ] = None,
 ) -> None:
     """Migrate an older version of a template to platform-cli setup."""
+    from nava.platform.projects.migrate_from_legacy_template import MigrateFromLegacyTemplate
+    from nava.platform.projects.project import Project
+
     ctx = typer_context.ensure_object(CliContext)
 
     with ctx.handle_exceptions():
@@ -23,3 +23,10 @@ opt_commit = typer.Option(help="Commit changes with standard message if able.")
 opt_answers_only = typer.Option(help="Do not change the version.")
 
 opt_force_update = typer.Option(help="Ignore smart update algorithm.")
+
+opt_jobs = typer.Option(
+    "--jobs",
+    "-j",
+    min=1,
+    help="Number of template files to render in parallel, or apps to update in parallel when updating more than one with --commit.",
+)
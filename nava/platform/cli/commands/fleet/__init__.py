@@ -0,0 +1,82 @@
+from pathlib import Path
+from typing import Annotated
+
+import typer
+
+import nava.platform.util.collections.dict as dict_util
+from nava.platform.cli.context import CliContext
+
+# The command implementations (and Copier, etc.) are imported inside each
+# command, so only the command that runs pays for its imports, see
+# `nava.platform.cli.lazy_group`
+
+app = typer.Typer(
+    help="""Manage many projects at once
+
+    Projects are given as directories, or manifest files listing them (see
+    `fleet update --help`).
+    """
+)
+
+
+# keeps `update` a subcommand, rather than the whole of `fleet`, while it's
+# the only one
+@app.callback()
+def fleet() -> None:
+    pass
+
+
+@app.command()
+def update(
+    typer_context: typer.Context,
+    targets: Annotated[
+        list[Path],
+        typer.Argument(
+            exists=True,
+            help="Project directories, or YAML manifest files listing them.",
+        ),
+    ],
+    version: Annotated[
+        list[str] | None,
+        typer.Option(
+            help="Template version to update to, in the form TEMPLATE=VERSION (e.g., template-infra=v0.15.0). Defaults to the latest tag version of each template.",
+        ),
+    ] = None,
+    jobs: Annotated[
+        int, typer.Option("--jobs", "-j", min=1, help="Number of projects to update at once.")
+    ] = 4,
+    report: Annotated[
+        Path | None,
+        typer.Option(
+            dir_okay=False,
+            help="Write a JSON report of the result, duration and any conflicts for each project to this file.",
+        ),
+    ] = None,
+) -> None:
+    """Update every template installed in each project.
+
+    A manifest lists projects, relative to the manifest, and optionally the
+    versions to update them to, which take precedence over --version:
+
+        versions:
+          template-infra: v0.15.0
+        projects:
+          - path: ../project-a
+          - path: ../project-b
+            versions:
+              template-application-rails: v0.5.0
+
+    Projects are updated in parallel, each update is committed. Projects with
+    merge conflicts are left for them to be resolved.
+    """
+    from . import update_command
+
+    ctx = typer_context.ensure_object(CliContext)
+
+    with ctx.handle_exceptions():
+        try:
+            projects = update_command.load_projects(targets, dict_util.from_str_values(version))
+        except ValueError as e:
+            ctx.fail(str(e))
+
+        update_command.update(ctx, projects, jobs=jobs, report=report)
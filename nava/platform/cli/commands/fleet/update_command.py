@@ -0,0 +1,275 @@
+import contextlib
+import io
+import json
+import multiprocessing
+import time
+import traceback
+from collections.abc import Iterable
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import Any, NoReturn
+
+import structlog
+import typer
+import yaml
+from rich.console import Console
+from rich.table import Table
+
+import nava.platform.cli.logging.config as logging_config
+from nava.platform.cli.config import OutputLevel
+from nava.platform.cli.console import ConsoleWrapper
+from nava.platform.cli.context import CliContext
+from nava.platform.cli.exceptions import exception_handler
+from nava.platform.projects.infra_project import InfraProject
+from nava.platform.templates.checkouts import template_checkouts
+from nava.platform.templates.errors import MergeConflictsDuringUpdateError
+from nava.platform.templates.template import Template
+
+from ..infra import update_command as infra_update_command
+
+INFRA_TEMPLATE = "template-infra"
+
+
+@dataclass
+class FleetProject:
+    path: Path
+    versions: dict[str, str] = field(default_factory=dict)
+    """Template versions to update to, by template (repo) name."""
+
+
+@dataclass
+class ProjectUpdateResult:
+    path: str
+    status: str
+    """One of "updated", "up to date", "merge conflicts" or "failed"."""
+    duration: float
+    """Seconds."""
+    templates: list[str] = field(default_factory=list)
+    """The templates (and apps) that were updated, or attempted."""
+    conflicts: list[str] = field(default_factory=list)
+    """Files with merge conflicts, relative to the project."""
+    error: str | None = None
+    output: str = ""
+
+
+def load_projects(
+    targets: Iterable[Path], versions: dict[str, str] | None = None
+) -> list[FleetProject]:
+    """Get the projects to update from project directories and manifest files.
+
+    A manifest is a YAML (or JSON) file like:
+
+        versions:
+          template-infra: v0.15.0
+        projects:
+          - path: ../project-a
+          - path: ../project-b
+            versions:
+              template-application-rails: v0.5.0
+          - ../project-c
+
+    where relative paths are relative to the manifest. Versions for a project
+    take precedence over the manifest's, which take precedence over
+    ``versions``.
+    """
+    projects = []
+    for target in targets:
+        if target.is_dir():
+            projects.append(FleetProject(target, dict(versions or {})))
+            continue
+
+        manifest = yaml.safe_load(target.read_text()) or {}
+        if not isinstance(manifest, dict) or not isinstance(manifest.get("projects"), list):
+            raise ValueError(f"Manifest {target} should have a list of `projects`")
+
+        manifest_versions = (versions or {}) | _manifest_versions(
+            manifest.get("versions"), f"Manifest {target}"
+        )
+        for i, entry in enumerate(manifest["projects"]):
+            if isinstance(entry, str):
+                entry = {"path": entry}
+
+            where = f"Project {i + 1} of manifest {target}"
+            if not isinstance(entry, dict) or not isinstance(entry.get("path"), str):
+                raise ValueError(f"{where} should be a path, or have a `path`, got: {entry!r}")
+
+            projects.append(
+                FleetProject(
+                    path=target.parent / entry["path"],
+                    versions=manifest_versions | _manifest_versions(entry.get("versions"), where),
+                )
+            )
+
+    return projects
+
+
+def _manifest_versions(versions: Any, where: str) -> dict[str, str]:
+    if versions is None:
+        return {}
+
+    if not isinstance(versions, dict):
+        raise ValueError(
+            f"{where} should have `versions` of template names to versions, got: {versions!r}"
+        )
+
+    return {str(name): str(version) for name, version in versions.items()}
+
+
+def update(
+    ctx: CliContext,
+    projects: list[FleetProject],
+    *,
+    jobs: int = 4,
+    report: Path | None = None,
+) -> None:
+    """Update every template installed in each of ``projects``, ``jobs`` at a time.
+
+    Each project is updated in a separate worker process (Copier changes the
+    working directory as it goes), all sharing one checkout of each template
+    version. Every update is committed, so a project ends up either with new
+    commits, untouched or with merge conflicts to resolve.
+    """
+    if not projects:
+        ctx.fail("No projects to update")
+
+    checkouts_dir = TemporaryDirectory(prefix="nava-platform-checkouts.")
+    with (
+        checkouts_dir,
+        ProcessPoolExecutor(
+            max_workers=min(jobs, len(projects)),
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(checkouts_dir.name, ctx.output_level),
+        ) as executor,
+    ):
+        futures = [executor.submit(update_project, project) for project in projects]
+        results = []
+        for project, future in zip(projects, futures, strict=True):
+            ctx.console.rule(str(project.path))
+            result = future.result()
+            results.append(result)
+
+            # only the details of what needs attention, unless asked for more
+            if result.status in ("failed", "merge conflicts") or (
+                ctx.output_level is not OutputLevel.NORMAL
+            ):
+                ctx.console.out(result.output, highlight=False)
+            ctx.console.print(f"{result.status} ({result.duration:.1f}s)")
+
+    table = Table("Project", "Result", "Duration", "Conflicts")
+    for result in results:
+        table.add_row(
+            result.path, result.status, f"{result.duration:.1f}s", "\n".join(result.conflicts)
+        )
+    ctx.console.print(table)
+
+    if report:
+        report.write_text(
+            json.dumps({"projects": [asdict(result) for result in results]}, indent=2) + "\n"
+        )
+
+    if any(result.status in ("failed", "merge conflicts") for result in results):
+        ctx.exit(1)
+
+
+def _init_worker(checkouts_dir: str, output_level: OutputLevel) -> None:
+    template_checkouts.share_root(Path(checkouts_dir))
+    logging_config.configure(
+        log_level=output_level.to_standard_logging_level(),
+        log_to_console=False,
+        log_to_file=False,
+        log_file=None,
+    )
+
+
+def update_project(project: FleetProject) -> ProjectUpdateResult:
+    """Update all the templates in ``project``, in a worker process."""
+    start = time.monotonic()
+    output = io.StringIO()
+    ctx = _worker_context(output, project.path)
+    result = ProjectUpdateResult(path=str(project.path), status="up to date", duration=0)
+
+    infra_project = InfraProject(project.path)
+    head = infra_project.git.get_commit_hash_for_head()
+
+    try:
+        with contextlib.redirect_stdout(output), contextlib.redirect_stderr(output):
+            _update_templates(ctx, infra_project, project.versions, result)
+    except MergeConflictsDuringUpdateError as e:
+        result.status = "merge conflicts"
+        result.conflicts = infra_project.git.status().unmerged
+        ctx.console.error.print(e.message)
+    except typer.Exit as e:
+        if e.exit_code != 0:
+            result.status = "failed"
+            result.error = f"Exited with {e.exit_code}"
+    except Exception as e:
+        result.status = "failed"
+        result.error = str(e) or type(e).__name__
+        output.write(traceback.format_exc())
+    else:
+        if infra_project.git.get_commit_hash_for_head() != head:
+            result.status = "updated"
+
+    result.duration = time.monotonic() - start
+    result.output = output.getvalue()
+    return result
+
+
+def _update_templates(
+    ctx: CliContext,
+    project: InfraProject,
+    versions: dict[str, str],
+    result: ProjectUpdateResult,
+) -> None:
+    template_names = [name.removeprefix(".") for name in project.state.state_dir_names()]
+    if not template_names:
+        raise ValueError("No templates installed in project")
+
+    for template_name in template_names:
+        if template_name == INFRA_TEMPLATE:
+            result.templates.append(INFRA_TEMPLATE)
+            ctx.console.rule(INFRA_TEMPLATE)
+            infra_update_command.update(ctx, str(project.dir), version=versions.get(INFRA_TEMPLATE))
+            continue
+
+        for answers_file in project.state.answers_files(f".{template_name}"):
+            app_name = answers_file.stem
+            result.templates.append(f"{template_name} ({app_name})")
+
+            template = Template.from_existing(
+                ctx, project, app_name=app_name, template_name=template_name
+            )
+            ctx.console.rule(f"{app_name} ({template.template_name.id})")
+            template.update(
+                project, app_name=app_name, version=versions.get(template_name), commit=True
+            )
+
+
+def _worker_context(output: io.StringIO, project_dir: Path) -> CliContext:
+    console = ConsoleWrapper(
+        output_level=OutputLevel.NORMAL,
+        default=Console(file=output),
+        warning=Console(file=output, style="yellow"),
+        error=Console(file=output, style="bold red"),
+    )
+
+    def exit(code: int) -> NoReturn:
+        raise typer.Exit(code)
+
+    def fail_with_usage(message: str) -> NoReturn:
+        console.error.print(message)
+        raise typer.Exit(2)
+
+    log: Any = structlog.stdlib.get_logger().bind(project=str(project_dir))
+
+    return CliContext(
+        output_level=OutputLevel.NORMAL,
+        log=log,
+        console=console,
+        fail_with_usage=fail_with_usage,
+        exit=exit,
+        exception_handler=exception_handler,
+    )
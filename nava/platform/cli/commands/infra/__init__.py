@@ -9,18 +9,15 @@ from nava.platform.cli.commands.common import (
     opt_commit,
     opt_data,
     opt_force_update,
+    opt_jobs,
     opt_version,
 )
 from nava.platform.cli.context import CliContext
 from nava.platform.templates.errors import MergeConflictsDuringUpdateError
 
-from . import (
-    add_app_command,
-    info_command,
-    install_command,
-    migrate_from_legacy_command,
-    update_command,
-)
+# The command implementations (and Copier, etc.) are imported inside each
+# command, so only the command that runs pays for its imports, see
+# `nava.platform.cli.lazy_group`
 
 app = typer.Typer(
     help="""Manage template-infra usage
@@ -49,8 +46,11 @@ def install(
     version: Annotated[str | None, opt_version] = DEFAULT_VERSION,
     data: Annotated[list[str] | None, opt_data] = None,
     commit: Annotated[bool, opt_commit] = False,
+    jobs: Annotated[int, opt_jobs] = 1,
 ) -> None:
     """Install template-infra in project."""
+    from . import install_command
+
     ctx = typer_context.ensure_object(CliContext)
 
     with ctx.handle_exceptions():
@@ -61,6 +61,7 @@ def install(
             version=version,
             data=dict_util.from_str_values(data),
             commit=commit,
+            jobs=jobs,
         )
 
 
@@ -74,6 +75,8 @@ def add_app(
     commit: Annotated[bool, opt_commit] = True,
 ) -> None:
     """Add infra for APP_NAME."""
+    from . import add_app_command
+
     ctx = typer_context.ensure_object(CliContext)
 
     with ctx.handle_exceptions():
@@ -96,6 +99,7 @@ def update(
     data: Annotated[list[str] | None, opt_data] = None,
     answers_only: Annotated[bool, opt_answers_only] = False,
     force: Annotated[bool, opt_force_update] = False,
+    jobs: Annotated[int, opt_jobs] = 1,
 ) -> None:
     """Update base and application infrastructure.
 
@@ -104,6 +108,8 @@ def update(
     save progress. You can merge all these commits together after if you would
     like.
     """
+    from . import update_command
+
     ctx = typer_context.ensure_object(CliContext)
 
     with ctx.handle_exceptions():
@@ -116,6 +122,7 @@ def update(
                 data=dict_util.from_str_values(data),
                 answers_only=answers_only,
                 force=force,
+                jobs=jobs,
             )
         except MergeConflictsDuringUpdateError:
             message = (
@@ -135,8 +142,11 @@ def update_base(
     commit: Annotated[bool, opt_commit] = True,
     answers_only: Annotated[bool, opt_answers_only] = False,
     force: Annotated[bool, opt_force_update] = False,
+    jobs: Annotated[int, opt_jobs] = 1,
 ) -> None:
     """Update base infrastructure."""
+    from . import update_command
+
     ctx = typer_context.ensure_object(CliContext)
 
     with ctx.handle_exceptions():
@@ -149,6 +159,7 @@ def update_base(
             commit=commit,
             answers_only=answers_only,
             force=force,
+            jobs=jobs,
         )
 
 
@@ -164,8 +175,11 @@ def update_app(
     all: Annotated[bool, typer.Option("--all", help="Attempt to update all known apps")] = False,
     answers_only: Annotated[bool, opt_answers_only] = False,
     force: Annotated[bool, opt_force_update] = False,
+    jobs: Annotated[int, opt_jobs] = 1,
 ) -> None:
     """Update application(s) infrastructure."""
+    from . import update_command
+
     ctx = typer_context.ensure_object(CliContext)
 
     with ctx.handle_exceptions():
@@ -180,13 +194,20 @@ def update_app(
             all=all,
             answers_only=answers_only,
             force=force,
+            jobs=jobs,
         )
 
 
 @app.command()
 def migrate_from_legacy(
     typer_context: typer.Context,
-    project_dir: str,
+    project_dirs: Annotated[
+        list[str],
+        typer.Argument(
+            metavar="PROJECT_DIR...",
+            help="Legacy project(s) to migrate. Migrating many at once shares the work of finding the migration point for each.",
+        ),
+    ],
     origin_template_uri: Annotated[
         str,
         typer.Option(
@@ -195,13 +216,24 @@ def migrate_from_legacy(
     ] = "https://github.com/navapbc/template-infra",
     commit: Annotated[bool, opt_commit] = False,
 ) -> None:
-    """Migrate an older version of the template to platform-cli setup."""
+    """Migrate an older version of the template to platform-cli setup.
+
+    With multiple projects, a project that fails to migrate doesn't stop the
+    rest, the command exits with a non-zero status at the end.
+    """
+    from . import migrate_from_legacy_command
+
     ctx = typer_context.ensure_object(CliContext)
 
     with ctx.handle_exceptions():
-        migrate_from_legacy_command.migrate_from_legacy(
-            ctx, project_dir, origin_template_uri, commit=commit
-        )
+        if len(project_dirs) == 1:
+            migrate_from_legacy_command.migrate_from_legacy(
+                ctx, project_dirs[0], origin_template_uri, commit=commit
+            )
+        else:
+            migrate_from_legacy_command.migrate_many_from_legacy(
+                ctx, project_dirs, origin_template_uri, commit=commit
+            )
 
 
 @app.command()
@@ -217,7 +249,36 @@ def info(
     template_uri: Annotated[str | None, opt_template_uri] = None,
 ) -> None:
     """Display some information about the state of template-infra in the project."""
+    from . import info_command
+
     ctx = typer_context.ensure_object(CliContext)
 
     with ctx.handle_exceptions():
         info_command.info(ctx, project_dir, template_uri)
+
+
+@app.command()
+def outdated(
+    typer_context: typer.Context,
+    project_dir: Annotated[
+        Path,
+        typer.Argument(
+            exists=True,
+            file_okay=False,
+        ),
+    ],
+    template_uri: Annotated[str | None, opt_template_uri] = None,
+    version: Annotated[str | None, opt_version] = DEFAULT_VERSION,
+) -> None:
+    """Check if the base and apps are on the latest (or given) template version.
+
+    Exits with a non-zero status if anything is out of date. Where possible
+    this only lists the template's tags, rather than checking it out, so it's
+    cheap enough to run in CI.
+    """
+    from . import outdated_command
+
+    ctx = typer_context.ensure_object(CliContext)
+
+    with ctx.handle_exceptions():
+        outdated_command.outdated(ctx, project_dir, template_uri, version=version)
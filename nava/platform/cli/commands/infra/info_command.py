@@ -2,7 +2,6 @@ import re
 from contextlib import AbstractContextManager, nullcontext
 from pathlib import Path
 
-import yaml
 from packaging.version import Version
 from rich.console import Group
 from rich.panel import Panel
@@ -12,6 +11,7 @@ from nava.platform.cli.context import CliContext
 from nava.platform.projects.infra_project import InfraProject
 from nava.platform.projects.migrate_from_legacy_template import MIGRATION_TAG_PREFIX
 from nava.platform.util.git import GitProject
+from nava.platform.util.git_tags import tag_index
 
 
 def info(ctx: CliContext, project_dir: Path, template_uri: str | None = None) -> None:
@@ -19,7 +19,7 @@ def info(ctx: CliContext, project_dir: Path, template_uri: str | None = None) ->
     is_template = project.base_answers_file().exists()
 
     if not template_uri and is_template:
-        base_answers = yaml.safe_load(project.base_answers_file().read_text())
+        base_answers = project.state.answers(project.base_answers_file_rel()) or {}
         template_uri = base_answers.get("_src_path", None)
 
     if template_uri:
@@ -96,14 +96,11 @@ def get_newer_versions(
     if not template_git:
         return None
 
-    template_tagged_versions = template_git.get_tags("--list", "v*")
-    template_versions = sorted(map(Version, template_tagged_versions))
-
     project_v = get_version(project_version.removeprefix(MIGRATION_TAG_PREFIX))
     if not project_v:
         return None
 
-    return list(filter(project_v.__le__, template_versions))
+    return tag_index(template_git).newer_versions(project_v, prefix="v")
 
 
 # derived from https://github.com/copier-org/copier/blob/63fec9a500d9319f332b489b6d918ecb2e0598e3/copier/template.py#L575
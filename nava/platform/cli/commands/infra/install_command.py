@@ -14,8 +14,9 @@ def install(
     version: str | None = None,
     data: dict[str, str] | None = None,
     commit: bool = False,
+    jobs: int = 1,
 ) -> None:
-    template = InfraTemplate(ctx, template_uri)
+    template = InfraTemplate(ctx, template_uri, jobs=jobs)
     project = InfraProject(Path(project_dir))
     app_names = project.app_names_possible
 
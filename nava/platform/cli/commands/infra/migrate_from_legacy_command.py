@@ -1,8 +1,12 @@
 from pathlib import Path
+from typing import Any
 
 from nava.platform.cli.context import CliContext
 from nava.platform.projects.infra_project import InfraProject
-from nava.platform.projects.migrate_from_legacy_template import MigrateFromLegacyTemplate
+from nava.platform.projects.migrate_from_legacy_template import (
+    LegacyTemplateSource,
+    MigrateFromLegacyTemplate,
+)
 
 
 def migrate_from_legacy(
@@ -11,16 +15,56 @@ def migrate_from_legacy(
     project = InfraProject(Path(project_dir))
 
     if not project.has_legacy_version_file:
-        ctx.console.error.print(
-            f"No legacy version file found (looking for {project.legacy_version_file_path()}). Are you sure this is a legacy template?"
-        )
+        _print_no_legacy_version_file(ctx, project)
+        ctx.exit(1)
+
+    with LegacyTemplateSource(origin_template_uri) as source:
+        _migrate_from_legacy(ctx, project, source, commit)
+
+
+def migrate_many_from_legacy(
+    ctx: CliContext, project_dirs: list[str], origin_template_uri: str, commit: bool = False
+) -> None:
+    """Migrate each of ``project_dirs``, all from one `LegacyTemplateSource`.
+
+    The projects are migrated one after another, continuing past any that
+    fail, exiting with 1 at the end if any did.
+    """
+    failed = []
+
+    with LegacyTemplateSource(origin_template_uri) as source:
+        for project_dir in project_dirs:
+            ctx.console.rule(project_dir)
+            project = InfraProject(Path(project_dir))
+
+            if not project.has_legacy_version_file:
+                _print_no_legacy_version_file(ctx, project)
+                failed.append(project_dir)
+                continue
+
+            try:
+                _migrate_from_legacy(ctx, project, source, commit)
+            except Exception as e:
+                ctx.log.exception("Error migrating project", project_dir=project_dir)
+                ctx.console.error.print(f"Error migrating {project_dir}: {e}")
+                failed.append(project_dir)
+
+    migrated = len(project_dirs) - len(failed)
+    ctx.console.print(f"Migrated {migrated} of {len(project_dirs)} projects.")
+
+    if failed:
+        ctx.console.error.print("Failed to migrate:\n" + "\n".join(failed))
         ctx.exit(1)
 
-    _migrate_from_legacy(ctx, project, origin_template_uri, commit)
+
+def _print_no_legacy_version_file(ctx: CliContext, project: InfraProject) -> None:
+    ctx.console.error.print(
+        f"No legacy version file found (looking for {project.legacy_version_file_path()}). Are you sure this is a legacy template?"
+    )
 
 
 def _migrate_from_legacy(
-    ctx: CliContext, infra_project: InfraProject, origin_template_uri: str, commit: bool
+    ctx: CliContext, infra_project: InfraProject, source: LegacyTemplateSource, commit: bool
 ) -> None:
     base_project_config_answers = _answers_from_project_config(ctx, infra_project.dir)
 
@@ -29,11 +73,12 @@ def _migrate_from_legacy(
     base_migrate = MigrateFromLegacyTemplate(
         ctx=ctx,
         project=project,
-        origin_template_uri=origin_template_uri,
+        origin_template_uri=source.template_uri,
         template_name="template-infra",
         legacy_version_file_name=".template-version",
         new_version_answers_file_name="base.yml",
         extra_answers=lambda _: base_project_config_answers | {"template": "base"},
+        source=source,
     )
     base_migrate.migrate_from_legacy(
         preserve_legacy_file=True, commit=commit, use_migration_tags=True
@@ -44,11 +89,12 @@ def _migrate_from_legacy(
         app_migrate = MigrateFromLegacyTemplate(
             ctx=ctx,
             project=project,
-            origin_template_uri=origin_template_uri,
+            origin_template_uri=source.template_uri,
             template_name="template-infra",
             legacy_version_file_name=".template-version",
             new_version_answers_file_name=f"app-{app_name}.yml",
             extra_answers=lambda _: app_answers,  # noqa: B023
+            source=source,
         )
         app_migrate.migrate_from_legacy(
             preserve_legacy_file=True, commit=commit, use_migration_tags=True
@@ -59,19 +105,74 @@ def _migrate_from_legacy(
     base_migrate.legacy_version_file_path().unlink()
 
     if commit and project.git.is_git():
-        project.git.commit_all("Remove legacy version file")
+        project.git.commit_paths(
+            "Remove legacy version file",
+            [base_migrate.legacy_version_file_path().relative_to(project.dir)],
+        )
+
+
+PROJECT_CONFIG_ANSWERS = {
+    "base_project_name": "project_name",
+    "base_owner": "owner",
+    "base_code_repository_url": "code_repository_url",
+    "base_default_region": "default_region",
+}
+"""Base answers to the project-config outputs they're taken from."""
 
 
 def _answers_from_project_config(ctx: CliContext, project_dir: Path) -> dict[str, str]:
-    import json
-    import shutil
-    import subprocess
+    """Base answers from the project's ``infra/project-config`` module.
 
-    is_terraform_available = shutil.which("terraform") is not None
+    The outputs are read from the module's files statically first, which
+    covers the usual project-config of plain values in ``locals``, only
+    running Terraform for them if some can't be read that way.
+    """
     project_config_dir = project_dir / "infra/project-config"
     project_config_file = project_config_dir / "main.tf"
 
-    if not (project_config_file.exists() and is_terraform_available):
+    if not project_config_file.exists():
+        return {}
+
+    answers = _answers_from_outputs(_static_project_config(ctx, project_config_dir))
+    if answers.keys() == PROJECT_CONFIG_ANSWERS.keys():
+        return answers
+
+    ctx.log.debug(
+        "Missing project config from static read, trying terraform",
+        missing=sorted(PROJECT_CONFIG_ANSWERS.keys() - answers.keys()),
+    )
+    return answers | _answers_from_outputs(_terraform_project_config(ctx, project_config_dir))
+
+
+def _answers_from_outputs(project_config: dict[str, Any]) -> dict[str, str]:
+    answers = {}
+    for answer_key, project_config_key in PROJECT_CONFIG_ANSWERS.items():
+        project_config_value = project_config.get(project_config_key)
+        if project_config_value is None:
+            continue
+
+        if clean_answer := str(project_config_value).strip():
+            answers[answer_key] = clean_answer
+
+    return answers
+
+
+def _static_project_config(ctx: CliContext, project_config_dir: Path) -> dict[str, Any]:
+    from nava.platform.util import hcl
+
+    try:
+        return hcl.module_outputs(project_config_dir)
+    except (hcl.HclSyntaxError, OSError, UnicodeDecodeError) as e:
+        ctx.log.debug("Error reading project config statically", error=str(e))
+        return {}
+
+
+def _terraform_project_config(ctx: CliContext, project_config_dir: Path) -> dict[str, Any]:
+    import json
+    import shutil
+    import subprocess
+
+    if shutil.which("terraform") is None:
         return {}
 
     # be sure the local project has the lastest data
@@ -113,21 +214,8 @@ def _answers_from_project_config(ctx: CliContext, project_dir: Path) -> dict[str
         )
         return {}
 
-    mapping = {
-        "base_project_name": "project_name",
-        "base_owner": "owner",
-        "base_code_repository_url": "code_repository_url",
-        "base_default_region": "default_region",
+    return {
+        key: output.get("value", None)
+        for key, output in project_config.items()
+        if isinstance(output, dict)
     }
-
-    answers = {}
-    for answer_key, project_config_key in mapping.items():
-        project_config_output = project_config.get(project_config_key, None)
-        if not project_config_output:
-            continue
-
-        project_config_value = project_config_output.get("value", None)
-        if clean_answer := str(project_config_value).strip():
-            answers[answer_key] = clean_answer
-
-    return answers
@@ -0,0 +1,51 @@
+from pathlib import Path
+
+from rich.table import Table
+
+from nava.platform.cli.context import CliContext
+from nava.platform.projects.infra_project import InfraProject
+from nava.platform.templates.infra_template import InfraTemplate
+from nava.platform.templates.template import VersionCheck
+
+
+def outdated(
+    ctx: CliContext,
+    project_dir: Path,
+    template_uri: str | None = None,
+    version: str | None = None,
+) -> None:
+    """Check if the base and every app are on ``version`` of the template.
+
+    Exits with 1 if anything is out of date, so it can be used as a CI check.
+    """
+    project = InfraProject(project_dir)
+
+    if template_uri:
+        template = InfraTemplate(ctx, template_uri)
+    else:
+        template = InfraTemplate.from_existing(ctx, project)
+
+    checks = {"base": template.template_base.check_version(project, "base", version=version)}
+    for app_name in project.app_names:
+        checks[app_name] = template.template_app.check_version(project, app_name, version=version)
+
+    table = Table(title="Template Versions")
+    table.add_column("Name")
+    table.add_column("Current")
+    table.add_column("Target")
+    table.add_column("Status")
+
+    for name, check in checks.items():
+        table.add_row(name, check.current.display_str, check.target or "", _status(check))
+
+    ctx.console.print(table)
+
+    if not all(check.up_to_date for check in checks.values()):
+        ctx.exit(1)
+
+
+def _status(check: VersionCheck) -> str:
+    if check.up_to_date is None:
+        return "unknown"
+
+    return "up to date" if check.up_to_date else "outdated"
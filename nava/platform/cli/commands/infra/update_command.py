@@ -1,11 +1,23 @@
+import os
+import shutil
+import subprocess
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
+from tempfile import mkdtemp
 from typing import cast
 
 import questionary
+from rich.table import Table
 
 from nava.platform.cli.context import CliContext
 from nava.platform.projects.infra_project import InfraProject
+from nava.platform.templates.checkouts import template_checkouts
+from nava.platform.templates.errors import MergeConflictsDuringUpdateError
 from nava.platform.templates.infra_template import InfraTemplate
+from nava.platform.util.git import GitProject
 
 
 def update(
@@ -16,13 +28,37 @@ def update(
     data: dict[str, str] | None = None,
     answers_only: bool = False,
     force: bool = False,
+    jobs: int = 1,
 ) -> None:
     project = InfraProject(Path(project_dir))
 
     if template_uri:
-        template = InfraTemplate(ctx, template_uri)
+        template = InfraTemplate(ctx, template_uri, jobs=jobs)
     else:
-        template = InfraTemplate.from_existing(ctx, project)
+        template = InfraTemplate.from_existing(ctx, project, jobs=jobs)
+
+    if jobs > 1 and len(project.app_names) > 1:
+        ctx.console.rule("Infra base")
+        template.update_base(
+            project,
+            version=version,
+            data=data,
+            commit=True,
+            answers_only=answers_only,
+            force=force,
+        )
+        update_apps_in_parallel(
+            ctx,
+            project,
+            project.app_names,
+            template_uri=template_uri,
+            version=version,
+            data=data,
+            answers_only=answers_only,
+            force=force,
+            jobs=jobs,
+        )
+        return
 
     template.update(project, version=version, data=data, answers_only=answers_only, force=force)
 
@@ -36,13 +72,14 @@ def update_base(
     commit: bool = False,
     answers_only: bool = False,
     force: bool = False,
+    jobs: int = 1,
 ) -> None:
     project = InfraProject(Path(project_dir))
 
     if template_uri:
-        template = InfraTemplate(ctx, template_uri)
+        template = InfraTemplate(ctx, template_uri, jobs=jobs)
     else:
-        template = InfraTemplate.from_existing(ctx, project)
+        template = InfraTemplate.from_existing(ctx, project, jobs=jobs)
 
     template.update_base(
         project, version=version, data=data, commit=commit, answers_only=answers_only, force=force
@@ -60,13 +97,14 @@ def update_app(
     all: bool = True,
     answers_only: bool = False,
     force: bool = False,
+    jobs: int = 1,
 ) -> None:
     project = InfraProject(Path(project_dir))
 
     if template_uri:
-        template = InfraTemplate(ctx, template_uri)
+        template = InfraTemplate(ctx, template_uri, jobs=jobs)
     else:
-        template = InfraTemplate.from_existing(ctx, project)
+        template = InfraTemplate.from_existing(ctx, project, jobs=jobs)
 
     if all:
         if not commit:
@@ -104,6 +142,27 @@ def update_app(
     if not app_names:
         ctx.fail("No apps found")
 
+    if jobs > 1 and len(app_names) > 1 and not commit:
+        # each app's update is merged back as a commit, so without any, the
+        # apps are updated one at a time (still rendering files in parallel)
+        ctx.console.warning.print(
+            "Apps are only updated in parallel with --commit, updating them one at a time."
+        )
+
+    if jobs > 1 and len(app_names) > 1 and commit:
+        update_apps_in_parallel(
+            ctx,
+            project,
+            app_names,
+            template_uri=template_uri,
+            version=version,
+            data=data,
+            answers_only=answers_only,
+            force=force,
+            jobs=jobs,
+        )
+        return
+
     for app_name in app_names:
         ctx.console.rule(f"Infra app: {app_name}")
         template.update_app(
@@ -115,3 +174,212 @@ def update_app(
             answers_only=answers_only,
             force=force,
         )
+
+
+@dataclass
+class AppUpdateResult:
+    app_name: str
+    worktree: Path
+    returncode: int
+    output: str
+    commit: str | None
+    """The commit with the update, `None` if there were no changes."""
+    conflicts: list[str] = field(default_factory=list)
+    """Files with merge conflicts, from the update itself or applying its commit."""
+    applied: bool = False
+
+    @property
+    def has_conflicts(self) -> bool:
+        return bool(self.conflicts)
+
+    @property
+    def status(self) -> str:
+        if self.has_conflicts:
+            return "merge conflicts"
+        if self.returncode != 0:
+            return "failed"
+        if self.commit is None:
+            return "no changes"
+        return "updated" if self.applied else "not applied"
+
+    def resolve_instructions(self) -> str:
+        if self.commit and self.returncode == 0:
+            return f"run `git cherry-pick {self.commit}` and resolve them"
+
+        return (
+            f"resolve them in {self.worktree}, commit, then `git cherry-pick` the commit, "
+            f"or run `infra update-app` for {self.app_name}"
+        )
+
+
+def update_apps_in_parallel(
+    ctx: CliContext,
+    project: InfraProject,
+    app_names: list[str],
+    *,
+    template_uri: str | None = None,
+    version: str | None = None,
+    data: dict[str, str] | None = None,
+    answers_only: bool = False,
+    force: bool = False,
+    jobs: int = 2,
+) -> None:
+    """Update apps in separate temporary worktrees, ``jobs`` at a time.
+
+    Copier changes the working directory of the process as it goes, so apps
+    can't be updated on threads, each update is a separate run of
+    ``infra update-app`` in its own worktree of the current commit instead,
+    with the same global options and sharing this process's template
+    checkouts. The resulting commits are then cherry-picked onto the project
+    in app order, so the history is the same no matter which update finishes
+    first.
+
+    Apps with merge conflicts, either in their update or when applying it, are
+    left out, with their worktrees kept for the conflicts to be resolved.
+    """
+    git = project.git
+    base = git.get_commit_hash_for_head()
+    if base is None:
+        ctx.fail("Updating apps in parallel needs a project with at least one commit")
+
+    status = git.status()
+    if status.changed or status.unmerged:
+        ctx.fail(
+            "Updating apps in parallel needs a clean working tree, commit or stash your changes first"
+        )
+
+    update_args = _update_app_args(template_uri, version, data, answers_only, force, jobs)
+    # the apps mostly need the same template checkouts as each other, and as
+    # the base update that came before
+    env = os.environ | template_checkouts.child_env()
+    prefix = git.show_prefix()
+    worktree_lock = threading.Lock()
+
+    tmp_dir = Path(mkdtemp(prefix="nava-platform-worktrees."))
+    worktrees = {app_name: tmp_dir / app_name for app_name in app_names}
+    results: list[AppUpdateResult] = []
+
+    def update_in_worktree(app_name: str) -> AppUpdateResult:
+        worktree = worktrees[app_name]
+        # git can trip over itself creating worktrees at the same time
+        with worktree_lock:
+            git.add_worktree(worktree, base).check_returncode()
+
+        return _update_app_in_worktree(
+            worktree, prefix, app_name, base, ctx.global_args, update_args, env
+        )
+
+    try:
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            futures = [executor.submit(update_in_worktree, app_name) for app_name in app_names]
+            results = [future.result() for future in futures]
+
+        for result in results:
+            if result.commit and result.returncode == 0:
+                _apply_app_update(git, result)
+
+            ctx.console.rule(f"Infra app: {result.app_name}")
+            ctx.console.out(result.output, highlight=False)
+    finally:
+        # the conflicts are left to be resolved
+        kept = [result.worktree for result in results if result.has_conflicts]
+        for worktree in worktrees.values():
+            if worktree.exists() and worktree not in kept:
+                git.remove_worktree(worktree)
+        if not kept:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    table = Table("App", "Result", "Conflicts")
+    for result in results:
+        table.add_row(result.app_name, result.status, "\n".join(result.conflicts))
+    ctx.console.print(table)
+
+    if conflicted := [result for result in results if result.has_conflicts]:
+        for result in conflicted:
+            ctx.console.print(f"{result.app_name}: {result.resolve_instructions()}")
+
+        raise MergeConflictsDuringUpdateError(
+            f"Merge conflicts updating {', '.join(result.app_name for result in conflicted)}"
+        )
+
+    if [result for result in results if result.status in ("failed", "not applied")]:
+        ctx.exit(1)
+
+
+def _update_app_args(
+    template_uri: str | None,
+    version: str | None,
+    data: dict[str, str] | None,
+    answers_only: bool,
+    force: bool,
+    jobs: int,
+) -> list[str]:
+    args = ["--commit", "--jobs", str(jobs)]
+    if template_uri:
+        args += ["--template-uri", template_uri]
+    if version:
+        args += ["--version", version]
+    for key, value in (data or {}).items():
+        args += ["--data", f"{key}={value}"]
+    if answers_only:
+        args.append("--answers-only")
+    if force:
+        args.append("--force")
+
+    return args
+
+
+def _update_app_in_worktree(
+    worktree: Path,
+    prefix: str,
+    app_name: str,
+    base: str,
+    global_args: list[str],
+    update_args: list[str],
+    env: dict[str, str],
+) -> AppUpdateResult:
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "nava.platform.cli.main",
+            *global_args,
+            "infra",
+            "update-app",
+            str(worktree / prefix),
+            app_name,
+            *update_args,
+        ],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+        env=env,
+    )
+
+    git = GitProject(worktree)
+    head = git.get_commit_hash_for_head()
+    conflicts = git.merge_conflict_paths() if result.returncode != 0 else []
+    git.close()
+
+    return AppUpdateResult(
+        app_name=app_name,
+        worktree=worktree,
+        returncode=result.returncode,
+        output=result.stdout,
+        commit=head if head != base else None,
+        conflicts=conflicts,
+    )
+
+
+def _apply_app_update(git: GitProject, result: AppUpdateResult) -> None:
+    assert result.commit is not None
+
+    cherry_pick = git.cherry_pick(result.commit)
+    if cherry_pick.returncode == 0:
+        result.applied = True
+        return
+
+    # left out, so the rest of the apps can still be applied
+    result.conflicts = git.status().unmerged
+    git.cherry_pick("--abort")
+    result.output += cherry_pick.stdout + cherry_pick.stderr
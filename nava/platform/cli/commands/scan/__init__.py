@@ -0,0 +1,61 @@
+from enum import StrEnum
+from pathlib import Path
+from typing import Annotated
+
+import typer
+
+from nava.platform.cli.context import CliContext
+
+# The command implementation is imported inside the command, so only running
+# it pays for its imports, see `nava.platform.cli.lazy_group`
+
+app = typer.Typer()
+
+
+class InventoryFormat(StrEnum):
+    json = "json"
+    csv = "csv"
+    manifest = "manifest"
+
+
+@app.command()
+def scan(
+    typer_context: typer.Context,
+    root: Annotated[
+        Path,
+        typer.Argument(exists=True, file_okay=False, help="Directory to search for projects."),
+    ],
+    format: Annotated[
+        InventoryFormat, typer.Option("--format", "-f", help="Format of the inventory.")
+    ] = InventoryFormat.json,
+    output: Annotated[
+        Path | None,
+        typer.Option(
+            "--output",
+            "-o",
+            dir_okay=False,
+            help="Write the inventory to this file, rather than standard output.",
+        ),
+    ] = None,
+    jobs: Annotated[
+        int | None,
+        typer.Option(
+            "--jobs", "-j", min=1, help="Number of directories to read at once.", show_default=False
+        ),
+    ] = None,
+) -> None:
+    """Find the platform projects under a directory, and the templates they use.
+
+    Lists every template installed in each project, the app it's installed
+    for and its version (`_commit`), along with any legacy template version
+    files.
+
+    With `--format manifest`, only lists the projects with templates installed
+    (leaving out those only on legacy templates), as a `fleet update` manifest.
+    """
+    from . import scan_command
+
+    ctx = typer_context.ensure_object(CliContext)
+
+    with ctx.handle_exceptions():
+        scan_command.scan(ctx, root, format=format.value, output=output, jobs=jobs)
@@ -0,0 +1,90 @@
+import csv
+import io
+import json
+import sys
+import time
+from dataclasses import asdict
+from pathlib import Path
+
+from nava.platform.cli.context import CliContext
+from nava.platform.projects import scan as project_scan
+
+CSV_COLUMNS = ["project", "template", "app", "commit", "src_path", "file", "legacy"]
+
+
+def scan(
+    ctx: CliContext,
+    root: Path,
+    *,
+    format: str = "json",
+    output: Path | None = None,
+    jobs: int | None = None,
+) -> None:
+    """Write an inventory of the projects under ``root`` as JSON or CSV."""
+    start = time.monotonic()
+    projects = project_scan.scan(root, jobs=jobs)
+    duration = time.monotonic() - start
+
+    match format:
+        case "csv":
+            inventory = to_csv(projects)
+        case "manifest":
+            inventory = to_manifest(projects)
+        case _:
+            inventory = to_json(root, projects)
+
+    if output:
+        output.write_text(inventory)
+        ctx.console.print(f"Found {len(projects)} projects in {duration:.1f}s, wrote {output}")
+    else:
+        sys.stdout.write(inventory)
+
+    ctx.log.info("Scanned", root=str(root), projects=len(projects), duration=duration)
+
+
+def to_json(root: Path, projects: list[project_scan.ProjectInventory]) -> str:
+    inventory = {
+        "root": str(root.resolve()),
+        "projects": [asdict(project) for project in projects],
+    }
+    return json.dumps(inventory, indent=2) + "\n"
+
+
+def to_manifest(projects: list[project_scan.ProjectInventory]) -> str:
+    """A `fleet update` manifest of the projects, which needs templates installed to update."""
+    manifest = {"projects": [{"path": project.path} for project in projects if project.templates]}
+    return json.dumps(manifest, indent=2) + "\n"
+
+
+def to_csv(projects: list[project_scan.ProjectInventory]) -> str:
+    """One row for each template installed in each project, or legacy version file."""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=CSV_COLUMNS, lineterminator="\n")
+    writer.writeheader()
+
+    for project in projects:
+        for template in project.templates:
+            writer.writerow(
+                {
+                    "project": project.path,
+                    "template": template.template,
+                    "app": template.app,
+                    "commit": template.commit,
+                    "src_path": template.src_path,
+                    "file": template.answers_file,
+                    "legacy": False,
+                }
+            )
+
+        for legacy in project.legacy:
+            writer.writerow(
+                {
+                    "project": project.path,
+                    "template": legacy.template,
+                    "commit": legacy.version,
+                    "file": legacy.file,
+                    "legacy": True,
+                }
+            )
+
+    return buffer.getvalue()
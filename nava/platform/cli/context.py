@@ -1,6 +1,6 @@
 from collections.abc import Callable, Generator
 from contextlib import contextmanager
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import NoReturn
 
 import nava.platform.cli.console
@@ -24,6 +24,8 @@ class CliContext:
     exception_handler: Callable[["CliContext", BaseException], None]
     """Handle exceptions with this context object."""
     app_dirs: AppDirs = app_dirs
+    global_args: list[str] = field(default_factory=list)
+    """The global options (verbosity, profiling) to run the CLI again with in a subprocess."""
 
     def fail(self, message: str) -> NoReturn:
         """Aborts the execution of the program with a specific error message."""
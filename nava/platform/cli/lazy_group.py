@@ -0,0 +1,48 @@
+"""Sub-apps that are only imported when used.
+
+Registering sub-apps with `typer.Typer.add_typer` means importing them, and
+everything they import, before any arguments are parsed. `LazyGroup` instead
+imports a sub-app the first time it's looked up, so running one command doesn't
+pay for the others. The command modules themselves keep their heavy imports
+(Copier, Questionary, etc.) inside the command functions, so listing commands
+for ``--help`` or shell completion stays cheap too.
+"""
+
+import importlib
+from typing import ClassVar
+
+import typer
+
+# typer vendors its own click
+from typer import _click as click
+from typer.core import TyperGroup
+
+
+class LazyGroup(TyperGroup):
+    """A group with sub-apps loaded on demand.
+
+    Subclasses set ``lazy_subcommands``, mapping command names to the
+    ``"module:attribute"`` of a `typer.Typer`.
+    """
+
+    lazy_subcommands: ClassVar[dict[str, str]] = {}
+
+    def list_commands(self, ctx: click.Context) -> list[str]:
+        commands = super().list_commands(ctx)
+        return commands + [name for name in self.lazy_subcommands if name not in commands]
+
+    def get_command(self, ctx: click.Context, cmd_name: str) -> click.Command | None:
+        if cmd_name in self.lazy_subcommands and cmd_name not in self.commands:
+            self.add_command(self._load(cmd_name), cmd_name)
+
+        return super().get_command(ctx, cmd_name)
+
+    def _load(self, cmd_name: str) -> click.Command:
+        module_name, attribute = self.lazy_subcommands[cmd_name].split(":")
+        sub_app = getattr(importlib.import_module(module_name), attribute)
+        if not isinstance(sub_app, typer.Typer):
+            raise TypeError(f"{self.lazy_subcommands[cmd_name]} is not a Typer app")
+
+        command = typer.main.get_command(sub_app)
+        command.name = cmd_name
+        return command
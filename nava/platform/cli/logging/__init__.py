@@ -4,6 +4,7 @@ import resource
 import sys
 import time
 from pathlib import Path
+from typing import Any
 
 import structlog
 
@@ -51,6 +52,13 @@ def initialize(
 
 _start_time = time.monotonic()
 
+_exit_fields: dict[str, Any] = {}
+
+
+def add_exit_fields(**fields: Any) -> None:
+    """Include ``fields`` in the log message at program exit."""
+    _exit_fields.update(fields)
+
 
 def exit_handler(logger: Logger) -> None:
     """Log a message at program exit."""
@@ -62,4 +70,5 @@ def exit_handler(logger: Logger) -> None:
         user_s=ru.ru_utime,
         system_s=ru.ru_stime,
         peak_rss_kb=ru.ru_maxrss,
+        **_exit_fields,
     )
@@ -1,16 +1,22 @@
-from typing import Annotated
+from pathlib import Path
+from typing import Annotated, ClassVar
 
 import typer
 
-import nava.platform.cli.commands.app as app_command
-import nava.platform.cli.commands.infra as infra
-import nava.platform.cli.console
-import nava.platform.cli.logging
 from nava.platform.cli.config import OutputLevel
-from nava.platform.cli.context import CliContext
-from nava.platform.cli.exceptions import exception_handler
+from nava.platform.cli.lazy_group import LazyGroup
 
-app = typer.Typer()
+
+class MainGroup(LazyGroup):
+    lazy_subcommands: ClassVar[dict[str, str]] = {
+        "infra": "nava.platform.cli.commands.infra:app",
+        "app": "nava.platform.cli.commands.app:app",
+        "fleet": "nava.platform.cli.commands.fleet:app",
+        "scan": "nava.platform.cli.commands.scan:app",
+    }
+
+
+app = typer.Typer(cls=MainGroup)
 
 
 @app.callback()
@@ -28,8 +34,38 @@ def main(
     quiet: Annotated[
         bool, typer.Option("-q", "--quiet", help="Disable all console output")
     ] = False,
+    profile: Annotated[
+        bool,
+        typer.Option(
+            "--profile",
+            help="Profile the command, writing the profile to a new file next to the logs.",
+        ),
+    ] = False,
+    profile_output: Annotated[
+        Path | None,
+        typer.Option(
+            "--profile-output",
+            metavar="PATH",
+            dir_okay=False,
+            help="Write the profile to PATH instead. Implies --profile.",
+            show_default=False,
+        ),
+    ] = None,
+    profile_stacks: Annotated[
+        bool,
+        typer.Option(
+            "--profile-stacks",
+            help="Also sample stacks to a collapsed stack file, for a flame graph. Implies --profile.",
+        ),
+    ] = False,
 ) -> None:
     """Tool to help manage using Nava PBC's platform work."""
+    # only needed once a command actually runs, not for `--help`/completion
+    import nava.platform.cli.console
+    import nava.platform.cli.logging
+    from nava.platform.cli.context import CliContext
+    from nava.platform.cli.exceptions import exception_handler
+
     output_level = resolve_verbosity(verbose, quiet)
     log = nava.platform.cli.logging.initialize(output_level)
     console = nava.platform.cli.console.initialize(output_level)
@@ -41,8 +77,55 @@ def main(
         fail_with_usage=ctx.fail,
         exit=ctx.exit,
         exception_handler=exception_handler,
+        global_args=global_args(
+            verbose,
+            quiet,
+            profile=profile or profile_output is not None,
+            profile_stacks=profile_stacks,
+        ),
     )
 
+    if profile or profile_output or profile_stacks:
+        # commands can change the working directory as they go
+        start_profiling(
+            ctx, profile_output.resolve() if profile_output else None, stacks=profile_stacks
+        )
+
+
+def start_profiling(ctx: typer.Context, path: Path | None, *, stacks: bool) -> None:
+    """Profile the rest of the run, writing it out when ``ctx`` closes."""
+    import nava.platform.cli.logging
+    from nava.platform.cli.profiling import CommandProfiler, default_path
+
+    profiler = CommandProfiler(path or default_path(ctx.invoked_subcommand), stacks=stacks)
+
+    def write_profile() -> None:
+        files = profiler.stop()
+        nava.platform.cli.logging.add_exit_fields(
+            profile=str(files.prof),
+            profile_summary=str(files.summary),
+            profile_stacks=str(files.stacks) if files.stacks else None,
+        )
+        ctx.obj.console.warning.print(f"Profile written to {files.prof}")
+
+    ctx.call_on_close(write_profile)
+    profiler.start()
+
+
+def global_args(verbose: int, quiet: bool, *, profile: bool, profile_stacks: bool) -> list[str]:
+    """The global options to run the CLI again with in a subprocess.
+
+    Subprocesses are profiled to their own default path, rather than all
+    writing to the same one.
+    """
+    args = ["--quiet"] if quiet else ["--verbose"] * verbose
+    if profile_stacks:
+        args.append("--profile-stacks")
+    elif profile:
+        args.append("--profile")
+
+    return args
+
 
 def resolve_verbosity(verbose: int, quiet: bool) -> OutputLevel:
     # In the context of logging:
@@ -69,8 +152,5 @@ def resolve_verbosity(verbose: int, quiet: bool) -> OutputLevel:
     return OutputLevel.TRACE
 
 
-app.add_typer(infra.app, name="infra")
-app.add_typer(app_command.app, name="app")
-
 if __name__ == "__main__":
     app()
@@ -0,0 +1,158 @@
+"""CPU profiles of a run of the CLI, for working out where the time goes.
+
+With ``--profile``, the command runs under `cProfile` and at the end the
+profile is written out as:
+
+    <name>.prof       the raw profile, for ``python -m pstats``, snakeviz, etc.
+    <name>.txt        the top functions by cumulative and by own time
+
+and with ``--profile-stacks`` also:
+
+    <name>.collapsed  stacks of every thread, sampled every few milliseconds, in
+                      the "collapsed" format of ``flamegraph.pl``/speedscope
+
+`cProfile` only knows callers and callees one level apart, which isn't enough
+to draw a flame graph from, and only sees the thread it was started on, hence
+sampling the stacks (of all threads) separately. Work done in other processes,
+like the workers of ``fleet update``, isn't in either.
+
+By default the files go in a ``profiles`` directory next to the logs, or next
+to the path given with ``--profile-output``, and their location is included in
+the ``exit`` log record.
+"""
+
+import cProfile
+import io
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from types import FrameType
+
+from nava.platform.cli.config import app_dirs
+
+SUMMARY_LIMIT = 50
+"""Number of functions listed in each section of the text summary."""
+
+SAMPLE_INTERVAL_S = 0.005
+
+
+@dataclass(frozen=True)
+class ProfileFiles:
+    prof: Path
+    summary: Path
+    stacks: Path | None = None
+
+
+def default_path(command_name: str | None) -> Path:
+    """Where to write the profile of a run of ``command_name`` by default."""
+    timestamp = datetime.now().strftime("%Y%m%dT%H%M%S")
+    name = "-".join(filter(None, [timestamp, str(os.getpid()), command_name]))
+    return app_dirs.user_log_path / "profiles" / f"{name}.prof"
+
+
+class CommandProfiler:
+    """Profile everything between `start()` and `stop()`.
+
+    Args:
+        path: Where to write the ``.prof`` file, the others are written next
+            to it, with the same name and their own suffix.
+        stacks: Whether to sample stacks for a flame graph too.
+        sample_interval: Seconds between stack samples.
+    """
+
+    def __init__(
+        self, path: Path, *, stacks: bool = False, sample_interval: float = SAMPLE_INTERVAL_S
+    ):
+        self.path = path
+        self._profile = cProfile.Profile()
+        self._sampler = _StackSampler(sample_interval) if stacks else None
+        self._start_time = 0.0
+
+    def start(self) -> None:
+        self._start_time = time.monotonic()
+        if self._sampler:
+            self._sampler.start()
+        self._profile.enable()
+
+    def stop(self) -> ProfileFiles:
+        """Stop profiling and write out the results."""
+        self._profile.disable()
+        duration = time.monotonic() - self._start_time
+        if self._sampler:
+            self._sampler.stop()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        files = ProfileFiles(
+            prof=self.path,
+            summary=self.path.with_suffix(".txt"),
+            stacks=self.path.with_suffix(".collapsed") if self._sampler else None,
+        )
+
+        self._profile.dump_stats(files.prof)
+        files.summary.write_text(self._summary(duration))
+        if self._sampler and files.stacks:
+            files.stacks.write_text(self._sampler.collapsed())
+
+        return files
+
+    def _summary(self, duration: float) -> str:
+        out = io.StringIO()
+        out.write(f"Command: {' '.join(sys.argv)}\n")
+        out.write(f"Wall time: {duration:.3f}s\n")
+
+        stats = pstats.Stats(self._profile, stream=out)
+        stats.strip_dirs()
+        for sort_key, title in (
+            (pstats.SortKey.CUMULATIVE, "cumulative time"),
+            (pstats.SortKey.TIME, "own time"),
+        ):
+            out.write(f"\n=== Top {SUMMARY_LIMIT} functions by {title} ===\n")
+            stats.sort_stats(sort_key).print_stats(SUMMARY_LIMIT)
+
+        return out.getvalue()
+
+
+class _StackSampler:
+    """Counts the stacks of every other thread, every ``interval`` seconds."""
+
+    def __init__(self, interval: float):
+        self._interval = interval
+        self._counts: Counter[tuple[str, ...]] = Counter()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profile-sampler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        self._thread.join()
+
+    def collapsed(self) -> str:
+        """The samples, one ``frame;frame;... count`` line per distinct stack."""
+        return "".join(
+            f"{';'.join(stack)} {count}\n" for stack, count in sorted(self._counts.items())
+        )
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self._interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id != self._thread.ident:
+                    self._counts[(names.get(thread_id, str(thread_id)), *_stack(frame))] += 1
+
+
+def _stack(frame: FrameType | None) -> list[str]:
+    """The functions of the stack ending at ``frame``, outermost first."""
+    stack = []
+    while frame is not None:
+        code = frame.f_code
+        stack.append(f"{frame.f_globals.get('__name__', code.co_filename)}:{code.co_qualname}")
+        frame = frame.f_back
+    return stack[::-1]
@@ -4,18 +4,203 @@ See the upstream:
 https://github.com/copier-org/copier/blob/259f351fc3c017c82b235888c119b9010d80494a/copier/main.py
 """
 
-from collections.abc import Callable, Sequence
-from dataclasses import dataclass
+import json
+import os
+import shutil
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar
+from dataclasses import dataclass, field
 from functools import cached_property
 from pathlib import Path
+from tempfile import TemporaryDirectory
 from typing import Any, Self
 
 from copier.main import Worker
+from copier.subproject import Subproject
+from copier.template import Task, Template
+from copier.tools import escape_git_path, normalize_git_path
 from copier.types import (
     AnyByStrDict,
     StrOrPath,
 )
 from copier.user_data import AnswersMap
+from jinja2.sandbox import SandboxedEnvironment
+from packaging.version import Version
+from pydantic.dataclasses import dataclass as pydantic_dataclass
+
+from nava.platform.templates import rendered_snapshots
+from nava.platform.templates.bytecode_cache import jinja_bytecode_cache
+from nava.platform.templates.checkouts import template_checkouts
+from nava.platform.templates.src_exclude import SrcExcludeMatcher, src_exclude_matcher
+from nava.platform.util.git import run_text
+
+
+@pydantic_dataclass
+class NavaTemplate(Template):
+    """Template whose checkouts are shared across the process.
+
+    Upstream does a fresh clone of git templates every time one is needed
+    (including for the old version during an update), this instead gets them
+    from `TemplateCheckouts`, so there is only one checkout per version of the
+    template, cloned from a locally cached mirror if the template is remote.
+
+    If ``src_exclude`` is given, the checkout only has the files that could be
+    rendered with those exclusions (plus any set by the template itself).
+
+    If ``known_commit``, ``known_version`` and ``known_config`` are given
+    (e.g., from a `rendered_snapshots.RenderedSnapshot`), they are used as is,
+    rather than checking out the template to work them out.
+    """
+
+    src_exclude: tuple[str, ...] = ()
+    known_commit: str | None = None
+    known_version: str | None = None
+    known_config: dict[str, Any] | None = None
+
+    @cached_property
+    def commit(self) -> str | None:
+        """If the template is VCS-tracked, get its commit description."""
+        if self.known_commit is not None:
+            return self.known_commit
+
+        return super().commit
+
+    @cached_property
+    def version(self) -> Version | None:
+        """PEP440-compliant version object."""
+        if self.known_version is not None:
+            return Version(self.known_version)
+
+        return super().version
+
+    @cached_property
+    def _raw_config(self) -> AnyByStrDict:
+        if self.known_config is not None:
+            return self.known_config
+
+        return super()._raw_config
+
+    @cached_property
+    def local_abspath(self) -> Path:
+        """Get the absolute path to the template on disk."""
+        if self.vcs != "git":
+            return super().local_abspath
+
+        result = template_checkouts.checkout(
+            self.url_expanded, self.ref, self.use_prereleases, src_exclude=self.src_exclude
+        )
+
+        # local template with dirty changes to include, let upstream handle it
+        if result is None:
+            return super().local_abspath
+
+        return result
+
+    def _cleanup(self) -> None:
+        # shared checkouts are cleaned up on exit
+        if "local_abspath" in self.__dict__ and template_checkouts.owns(self.local_abspath):
+            return
+
+        super()._cleanup()
+
+
+@pydantic_dataclass
+class NavaSubproject(Subproject):
+    """Subproject whose last used template is a `NavaTemplate`."""
+
+    src_exclude: tuple[str, ...] = ()
+    last_rendered: rendered_snapshots.RenderedSnapshot | None = None
+    """What the last used template rendered, if there's a snapshot of it."""
+
+    @cached_property
+    def template(self) -> NavaTemplate | None:
+        """Template, as it was used the last time."""
+        last_url = self.last_answers.get("_src_path")
+        last_ref = self.last_answers.get("_commit")
+        if last_url:
+            result = NavaTemplate(
+                url=last_url,
+                ref=last_ref,
+                src_exclude=self.src_exclude,
+                known_commit=self.last_rendered.commit if self.last_rendered else None,
+                known_version=self.last_rendered.version if self.last_rendered else None,
+                known_config=self.last_rendered.config if self.last_rendered else None,
+            )
+            self._cleanup_hooks.append(result._cleanup)
+            return result
+        return None
+
+
+@dataclass
+class RenderStats:
+    """Files a render wrote and left alone, as absolute paths.
+
+    Shared between a worker and any copies made of it (e.g., the temporary
+    renders during an update), so everything ends up in one place.
+    """
+
+    created: list[Path] = field(default_factory=list)
+    modified: list[Path] = field(default_factory=list)
+    skipped: list[Path] = field(default_factory=list)
+    declined: list[Path] = field(default_factory=list)
+    """Skipped files that differ from what was rendered."""
+    rendered: set[Path] = field(default_factory=set)
+    """Every file rendered by any of the workers, relative to its destination."""
+    updated: bool = False
+    """If the changes between template versions were applied, see `Worker.run_update`."""
+    ran_tasks: bool = False
+
+    @property
+    def written(self) -> list[Path]:
+        return self.created + self.modified
+
+
+@dataclass
+class UpdateRenders:
+    """The renders of the template into temporary directories during an update.
+
+    See `Worker._apply_update`, the old version is rendered first, then the
+    new one, both in copies of the worker updating the project.
+    """
+
+    dst_path: Path
+    """Of the worker updating the project."""
+    exclude: Sequence[str]
+    """Of the worker updating the project, the renders exclude more."""
+    snapshot: rendered_snapshots.RenderedSnapshot | None
+    """What to restore in place of rendering the old version."""
+    renders: int = 0
+    old_dst_path: Path | None = None
+
+
+@dataclass
+class ChangeManifest:
+    """Paths a render created, modified or deleted, relative to its destination."""
+
+    created: list[Path] = field(default_factory=list)
+    modified: list[Path] = field(default_factory=list)
+    """For updates, this may include paths that ended up unchanged."""
+    deleted: list[Path] = field(default_factory=list)
+    complete: bool = True
+    """`False` if something beyond rendering (e.g., template tasks) could have
+    changed other paths too."""
+
+    @property
+    def paths(self) -> list[Path]:
+        return sorted(set(self.created + self.modified + self.deleted))
+
+    def __or__(self, other: "ChangeManifest") -> "ChangeManifest":
+        return ChangeManifest(
+            created=self.created + other.created,
+            modified=self.modified + other.modified,
+            deleted=self.deleted + other.deleted,
+            complete=self.complete and other.complete,
+        )
+
+
+# the worker updating, its copies (see `Worker._apply_update`) share its state
+_updating_worker: ContextVar["NavaWorker | None"] = ContextVar("_updating_worker", default=None)
 
 
 @dataclass
@@ -26,24 +211,414 @@ class NavaWorker(Worker):
     been rendered. This class supports exclusions based on the paths in the
     template itself, _before_ they have rendered, via `src_exclude` which can be
     specified in the `copier.yml` file or as arguments in the API call.
+
+    File contents can also be rendered in parallel, with `jobs`.
+
+    What each render did with the files is counted, see `files_written` and
+    `files_skipped`.
+
+    With ``rendered_ref``, what is rendered is recorded in the destination's
+    git repo and an update restores that rather than rendering the old version
+    of the template again, see `rendered_snapshots`.
     """
 
     src_exclude: Sequence[str] = ()
+    jobs: int = 1
+    """Number of files to render at once."""
+    rendered_ref: str | None = None
+
+    def __post_init__(self) -> None:
+        # plain attributes rather than fields, as upstream puts every field
+        # (deep copied) in the render context, for every file rendered
+        updating = _updating_worker.get()
+        self.render_stats: RenderStats = updating.render_stats if updating else RenderStats()
+        self.update_renders: UpdateRenders | None = updating.update_renders if updating else None
 
     # just redefining to fix the return type
     def __enter__(self) -> Self:
         """Allow using worker as a context manager."""
         return self
 
+    @cached_property
+    def subproject(self) -> NavaSubproject:
+        """Get related subproject."""
+        result = NavaSubproject(
+            local_abspath=self.dst_path.absolute(),
+            answers_relpath=self.answers_file or Path(".copier-answers.yml"),
+            src_exclude=tuple(self.src_exclude),
+            last_rendered=self.update_renders.snapshot if self.update_renders else None,
+        )
+        self._cleanup_hooks.append(result._cleanup)
+        return result
+
+    @cached_property
+    def template(self) -> NavaTemplate:
+        """Get related template."""
+        url = self.src_path
+        if not url:
+            if self.subproject.template is None:
+                raise TypeError("Template not found")
+            url = str(self.subproject.template.url)
+        result = NavaTemplate(
+            url=url,
+            ref=self.vcs_ref,
+            use_prereleases=self.use_prereleases,
+            src_exclude=tuple(self.src_exclude),
+        )
+        self._cleanup_hooks.append(result._cleanup)
+        return result
+
     @cached_property
     def all_src_exclusions(self) -> Sequence[str]:
         """Combine template and user-chosen exclusions."""
         return tuple(self.template.config_data.get("src_exclude", [])) + tuple(self.src_exclude)
 
     @cached_property
-    def match_src_exclude(self) -> Callable[[Path], bool]:
+    def match_src_exclude(self) -> SrcExcludeMatcher:
         """Get a callable to match paths against src file exclusions."""
-        return self._path_matcher(self.all_src_exclusions)
+        return src_exclude_matcher(self.all_src_exclusions)
+
+    @property
+    def files_written(self) -> list[Path]:
+        """Files written to the destination, relative to it."""
+        return self._relative_to_dst(self.render_stats.written)
+
+    @property
+    def files_skipped(self) -> list[Path]:
+        """Files left as they were in the destination, relative to it."""
+        return self._relative_to_dst(self.render_stats.skipped)
+
+    @property
+    def manifest(self) -> ChangeManifest:
+        """What the render changed in the destination."""
+        manifest = ChangeManifest(
+            created=self._relative_to_dst(self.render_stats.created),
+            modified=self._relative_to_dst(self.render_stats.modified),
+            complete=not self.render_stats.ran_tasks,
+        )
+
+        if self.render_stats.updated:
+            # the old version is rendered elsewhere, and the differences
+            # applied, so any file in either version could have been touched
+            dst_abspath = self.subproject.local_abspath
+            written = set(manifest.created)
+            for relpath in sorted(self.render_stats.rendered - written):
+                for candidate in (relpath, relpath.with_name(relpath.name + ".rej")):
+                    if (dst_abspath / candidate).exists():
+                        manifest.modified.append(candidate)
+                    elif candidate == relpath:
+                        manifest.deleted.append(candidate)
+
+        return manifest
+
+    def _relative_to_dst(self, paths: list[Path]) -> list[Path]:
+        dst_abspath = self.subproject.local_abspath
+        return [path.relative_to(dst_abspath) for path in paths if path.is_relative_to(dst_abspath)]
+
+    def _render_allowed(
+        self,
+        dst_relpath: Path,
+        is_dir: bool = False,
+        is_symlink: bool = False,
+        expected_contents: bytes | Path = b"",
+    ) -> bool:
+        if is_dir:
+            return super()._render_allowed(dst_relpath, is_dir, is_symlink, expected_contents)
+
+        dst_abspath = self.subproject.local_abspath / dst_relpath
+        self.render_stats.rendered.add(dst_relpath)
+
+        # upstream leaves files with identical contents alone, this only keeps
+        # count of what it did
+        existed = dst_abspath.exists() or dst_abspath.is_symlink()
+        allowed = super()._render_allowed(dst_relpath, is_dir, is_symlink, expected_contents)
+        if allowed:
+            (self.render_stats.modified if existed else self.render_stats.created).append(
+                dst_abspath
+            )
+        else:
+            self.render_stats.skipped.append(dst_abspath)
+
+        return allowed
+
+    def _solve_render_conflict(self, dst_relpath: Path) -> bool:
+        allowed = super()._solve_render_conflict(dst_relpath)
+        if not allowed:
+            self.render_stats.declined.append(self.subproject.local_abspath / dst_relpath)
+        return allowed
+
+    def run_copy(self) -> None:
+        """Render the template, recording a snapshot of it if it's all still as rendered."""
+        renders = self.update_renders
+        if renders is not None and self.dst_path.absolute() != renders.dst_path:
+            self._run_update_render(renders)
+            return
+
+        super().run_copy()
+
+        if renders is None and self.rendered_ref:
+            self._record_copy_snapshot()
+
+    def run_update(self) -> None:
+        """Update, restoring the old version from a snapshot if there's a usable one."""
+        if self.rendered_ref and self.update_renders is None:
+            # before anything else looks at the subproject, so it can take the
+            # last template version from the snapshot too
+            self.update_renders = UpdateRenders(
+                dst_path=self.dst_path.absolute(),
+                exclude=self.exclude,
+                snapshot=rendered_snapshots.find(
+                    self.dst_path,
+                    self.rendered_ref,
+                    self.answers_file or Path(".copier-answers.yml"),
+                    self._render_key(),
+                ),
+            )
+
+        token = _updating_worker.set(self)
+        try:
+            super().run_update()
+        finally:
+            _updating_worker.reset(token)
+
+    def _run_update_render(self, renders: UpdateRenders) -> None:
+        renders.renders += 1
+
+        if renders.renders == 1:
+            renders.old_dst_path = self.dst_path.absolute()
+            if renders.snapshot is not None:
+                rendered_snapshots.restore(renders.snapshot, self.dst_path)
+                # as rendering would, so files only in the old version (that
+                # the update deletes) are known to have been touched too
+                self.render_stats.rendered.update(rendered_snapshots.files(renders.snapshot))
+                return
+
+            super().run_copy()
+            return
+
+        super().run_copy()
+
+        if renders.renders == 2 and self.rendered_ref:
+            self._record_update_snapshot(renders)
+
+    def _can_record_snapshot(self) -> bool:
+        # a local template with uncommitted changes can't be rendered the same
+        # again from just the version in the answers file
+        return (
+            not self.pretend
+            and self.template.vcs == "git"
+            and template_checkouts.owns(self.template.local_abspath)
+        )
+
+    def _record_copy_snapshot(self) -> None:
+        assert self.rendered_ref
+        dst_abspath = self.subproject.local_abspath
+
+        # the destination can have more than was rendered, or different
+        if (
+            not self._can_record_snapshot()
+            or self.render_stats.ran_tasks
+            or self.render_stats.declined
+        ):
+            rendered_snapshots.delete(dst_abspath, self.rendered_ref)
+            return
+
+        with TemporaryDirectory(prefix="nava-platform-rendered.") as tmp:
+            for relpath in self.render_stats.rendered:
+                src, dst = dst_abspath / relpath, Path(tmp) / relpath
+                if not (src.is_file() or src.is_symlink()):
+                    continue
+
+                dst.parent.mkdir(parents=True, exist_ok=True)
+                shutil.copy2(src, dst, follow_symlinks=False)
+
+            self._record_snapshot(Path(tmp))
+
+    def _record_update_snapshot(self, renders: UpdateRenders) -> None:
+        assert self.rendered_ref
+        if not self._can_record_snapshot():
+            rendered_snapshots.delete(renders.dst_path, self.rendered_ref)
+            return
+
+        # files deleted from the project aren't in the new render, to not be
+        # recreated, but they need to be in the snapshot, as in the old
+        # render, to stay deleted next time, see `Worker._apply_update`
+        extra_files = None
+        removed = set(self.exclude) - set(renders.exclude)
+        if removed and renders.old_dst_path:
+            old_files = run_text(["git", "ls-files", "-z"], cwd=renders.old_dst_path).stdout
+            extra_files = (
+                renders.old_dst_path,
+                [
+                    path
+                    for path in old_files.split("\0")
+                    if path
+                    and escape_git_path(normalize_git_path(path)) in removed
+                    and not (self.dst_path / path).exists()
+                ],
+            )
+
+        self._record_snapshot(self.dst_path.absolute(), extra_files=extra_files)
+
+    def _record_snapshot(
+        self, rendered_dir: Path, *, extra_files: tuple[Path, list[str]] | None = None
+    ) -> None:
+        assert self.rendered_ref
+        project_dir = (
+            self.update_renders.dst_path if self.update_renders else self.subproject.local_abspath
+        )
+
+        if not self.template.commit or not self.template.version:
+            rendered_snapshots.delete(project_dir, self.rendered_ref)
+            return
+
+        try:
+            rendered_snapshots.record(
+                project_dir,
+                self.rendered_ref,
+                rendered_dir,
+                key=self._render_key(),
+                commit=self.template.commit,
+                version=str(self.template.version),
+                config=self.template._raw_config,
+                extra_files=extra_files,
+            )
+        except TypeError:
+            # configuration that doesn't round trip through JSON, the next
+            # update will need to check out this version after all
+            rendered_snapshots.delete(project_dir, self.rendered_ref)
+
+    def _render_key(self) -> str:
+        # the update renders exclude more than the worker they're copied from
+        exclude = self.update_renders.exclude if self.update_renders else self.exclude
+        return rendered_snapshots.render_key(
+            src_exclude=list(self.src_exclude),
+            exclude=list(exclude),
+            skip_tasks=self.skip_tasks,
+        )
+
+    def _apply_update(self) -> None:
+        self.render_stats.updated = True
+        super()._apply_update()
+
+    def _execute_tasks(self, tasks: Sequence[Task]) -> None:
+        if tasks:
+            self.render_stats.ran_tasks = True
+        super()._execute_tasks(tasks)
+
+    @cached_property
+    def jinja_env(self) -> SandboxedEnvironment:
+        """Upstream environment, with compiled templates cached across runs."""
+        env = super().jinja_env
+        namespace = json.dumps(
+            [
+                self.template.commit_hash or "",
+                self.template.envops,
+                self.template.jinja_extensions,
+            ],
+            sort_keys=True,
+            default=str,
+        )
+        env.bytecode_cache = jinja_bytecode_cache(namespace)
+        return env
+
+    def _render_template(self) -> None:
+        # same as upstream, except for not walking directories where
+        # everything is excluded and optionally rendering file contents in
+        # parallel
+        #
+        # https://github.com/copier-org/copier/blob/259f351fc3c017c82b235888c119b9010d80494a/copier/main.py#L603-L619
+        follow_symlinks = not self.template.preserve_symlinks
+
+        to_render: list[tuple[os.DirEntry[str], Path, Path]] = []
+        for src in self._scan_template(self.template_copy_root, follow_symlinks):
+            src_abspath = Path(src.path)
+            src_relpath = Path(src_abspath).relative_to(self.template.local_abspath)
+            dst_relpath = self._render_path(Path(src_abspath).relative_to(self.template_copy_root))
+            if dst_relpath is None or self.match_exclude(dst_relpath):
+                continue
+            to_render.append((src, src_relpath, dst_relpath))
+
+        if self.jobs <= 1:
+            for src, src_relpath, dst_relpath in to_render:
+                if src.is_symlink() and self.template.preserve_symlinks:
+                    self._render_symlink(src_relpath, dst_relpath)
+                elif src.is_dir(follow_symlinks=follow_symlinks):
+                    self._render_folder(dst_relpath)
+                else:
+                    self._render_file(src_relpath, dst_relpath)
+            return
+
+        # only the contents are rendered in parallel, anything that could
+        # prompt or write is still done one at a time in the same order as
+        # serially, so the results (and output) are the same
+        context = self._render_context()
+        # make sure the environment exists before threads race to create it
+        self.jinja_env  # noqa: B018
+
+        with ThreadPoolExecutor(max_workers=self.jobs) as executor:
+            try:
+                contents = {
+                    src_relpath: executor.submit(self._render_file_contents, src_relpath, context)
+                    for src, src_relpath, _ in to_render
+                    if not (src.is_symlink() and self.template.preserve_symlinks)
+                    and not src.is_dir(follow_symlinks=follow_symlinks)
+                }
+
+                for src, src_relpath, dst_relpath in to_render:
+                    if src_relpath in contents:
+                        self._write_file(src_relpath, dst_relpath, contents[src_relpath].result())
+                    elif src.is_dir(follow_symlinks=follow_symlinks):
+                        self._render_folder(dst_relpath)
+                    else:
+                        self._render_symlink(src_relpath, dst_relpath)
+            except BaseException:
+                executor.shutdown(wait=False, cancel_futures=True)
+                raise
+
+    def _render_file_contents(self, src_relpath: Path, context: Mapping[str, Any]) -> bytes:
+        """Render the new contents of a file, the first half of upstream `_render_file`."""
+        src_abspath = self.template.local_abspath / src_relpath
+        if src_relpath.name.endswith(self.template.templates_suffix):
+            try:
+                tpl = self.jinja_env.get_template(src_relpath.as_posix())
+            except UnicodeDecodeError:
+                if self.template.templates_suffix:
+                    # suffix is not empty, re-raise
+                    raise
+                # suffix is empty, fallback to copy
+                return src_abspath.read_bytes()
+            else:
+                return tpl.render(**context).encode()
+
+        return src_abspath.read_bytes()
+
+    def _write_file(self, src_relpath: Path, dst_relpath: Path, new_content: bytes) -> None:
+        """Write rendered contents of a file, the second half of upstream `_render_file`."""
+        src_abspath = self.template.local_abspath / src_relpath
+        dst_abspath = self.subproject.local_abspath / dst_relpath
+        src_mode = src_abspath.stat().st_mode
+        if not self._render_allowed(dst_relpath, expected_contents=new_content):
+            return
+        if not self.pretend:
+            dst_abspath.parent.mkdir(parents=True, exist_ok=True)
+            if dst_abspath.is_symlink():
+                # Writing to a symlink just writes to its target, so if we want to
+                # replace a symlink with a file we have to unlink it first
+                dst_abspath.unlink()
+            dst_abspath.write_bytes(new_content)
+            dst_abspath.chmod(src_mode)
+
+    def _scan_template(self, path: Path, follow_symlinks: bool) -> Iterator[os.DirEntry[str]]:
+        """Like `copier.tools.scantree`, but skipping fully excluded directories."""
+        for entry in os.scandir(path):
+            yield entry
+            if entry.is_dir(follow_symlinks=follow_symlinks) and not (
+                self.match_src_exclude.is_dir_excluded(
+                    Path(entry.path).relative_to(self.template_copy_root)
+                )
+            ):
+                yield from self._scan_template(Path(entry.path), follow_symlinks)
 
     def _render_path(self, relpath: Path) -> Path | None:
         # if `_render_path()` returns `None`, `_render_template()` skips the
@@ -61,24 +636,35 @@ class NavaWorker(Worker):
         self, src_file_path: Path, data: AnyByStrDict | None = None, render_path: Path | None = None
     ) -> None:
         """Render an individual file with the template settings."""
-        src_relpath = src_file_path
+        self.render_template_files([(src_file_path, render_path)], data)
 
-        # TODO: upstream is more like:
-        #
-        #   src_abspath = self.template.local_abspath / src_relpath
-        #   self._render_path(Path(src_abspath).relative_to(self.template_copy_root))
-        #
-        # but that that means the template needs configured correctly/we need to
-        # run _ask() first
-        dst_relpath = render_path or self._render_path(src_relpath)
+    def render_template_files(
+        self, files: Iterable[tuple[Path, Path | None]], data: AnyByStrDict | None = None
+    ) -> None:
+        """Render individual files with the template settings.
 
+        Args:
+            files: Pairs of template file path and where to render it in the
+                destination, `None` to render it where it normally would be.
+            data: Passed as is to Jinja, the template questions are not asked.
+        """
         # hack to just pass the data down to Jinja
         self.answers = AnswersMap(user=data or dict())
 
-        if dst_relpath is None or self.match_exclude(dst_relpath):
-            return
+        for src_relpath, render_path in files:
+            # TODO: upstream is more like:
+            #
+            #   src_abspath = self.template.local_abspath / src_relpath
+            #   self._render_path(Path(src_abspath).relative_to(self.template_copy_root))
+            #
+            # but that that means the template needs configured correctly/we need to
+            # run _ask() first
+            dst_relpath = render_path or self._render_path(src_relpath)
+
+            if dst_relpath is None or self.match_exclude(dst_relpath):
+                continue
 
-        self._render_file(src_relpath, dst_relpath)
+            self._render_file(src_relpath, dst_relpath)
 
 
 def run_copy(
@@ -86,7 +672,7 @@ def run_copy(
     dst_path: StrOrPath = ".",
     data: AnyByStrDict | None = None,
     **kwargs: Any,
-) -> Worker:
+) -> NavaWorker:
     """Copy a template to a destination, from zero."""
     if data is not None:
         kwargs["data"] = data
@@ -99,7 +685,7 @@ def run_update(
     dst_path: StrOrPath = ".",
     data: AnyByStrDict | None = None,
     **kwargs: Any,
-) -> Worker:
+) -> NavaWorker:
     """Update a subproject, from its template."""
     if data is not None:
         kwargs["data"] = data
@@ -115,12 +701,33 @@ def render_template_file(
     render_path: StrOrPath | None = None,
     data: AnyByStrDict | None = None,
     **kwargs: Any,
-) -> Worker:
+) -> NavaWorker:
     """Hackily render an individual file with the template settings."""
+    return render_template_files(
+        src_path, [(src_file_path, render_path)], dst_path=dst_path, data=data, **kwargs
+    )
+
+
+def render_template_files(
+    src_path: str,
+    files: Iterable[tuple[StrOrPath, StrOrPath | None]],
+    dst_path: StrOrPath = ".",
+    data: AnyByStrDict | None = None,
+    **kwargs: Any,
+) -> NavaWorker:
+    """Hackily render individual files with the template settings.
+
+    The template is loaded once for all of ``files``, which are pairs of the
+    template file path and where to render it (`None` for the default).
+    """
     if data is not None:
         kwargs["data"] = data
-    if render_path is not None:
-        render_path = Path(render_path)
     with NavaWorker(src_path=src_path, dst_path=Path(dst_path), **kwargs) as worker:
-        worker.render_template_file(Path(src_file_path), data, render_path=render_path)
+        worker.render_template_files(
+            [
+                (Path(src_file_path), Path(render_path) if render_path is not None else None)
+                for src_file_path, render_path in files
+            ],
+            data,
+        )
     return worker
@@ -1,7 +1,5 @@
 from pathlib import Path
 
-import yaml
-
 from nava.platform.projects.get_app_names_from_infra_dir import get_app_names_from_infra_dir
 from nava.platform.projects.project import Project
 from nava.platform.types import RelativePath
@@ -29,7 +27,9 @@ class InfraProject(Project):
 
     @property
     def app_names(self) -> list[str]:
-        app_answer_files = self.dir.glob(".template-infra/app-*.yml")
+        app_answer_files = filter(
+            lambda f: f.name.startswith("app-"), self.state.answers_files(".template-infra")
+        )
         return list(
             sorted(
                 map(lambda f: f.name.removeprefix("app-").removesuffix(".yml"), app_answer_files)
@@ -49,8 +49,10 @@ class InfraProject(Project):
         return self.dir / f".template-infra/app-{app_name}.yml"
 
     def _get_template_version_from_answers_file(self, answers_file: Path) -> str:
-        answers_file_text = answers_file.read_text()
-        answers = yaml.safe_load(answers_file_text)
+        answers = self.state.answers(answers_file.relative_to(self.dir))
+        if answers is None:
+            raise FileNotFoundError(f"Answers file does not exist: {answers_file}")
+
         return str(answers["_commit"])
 
     #
@@ -1,6 +1,8 @@
 from collections.abc import Callable
+from contextlib import ExitStack
 from dataclasses import dataclass
 from pathlib import Path
+from types import TracebackType
 from typing import Self
 
 import yaml
@@ -10,6 +12,58 @@ from nava.platform.get_template_name_from_uri import get_template_name_from_uri
 from nava.platform.projects.project import Project
 from nava.platform.types import RelativePath
 from nava.platform.util.git import GitProject
+from nava.platform.util.git_tags import tag_index
+
+
+class LegacyTemplateSource:
+    """The template legacy projects are migrated from, shared between migrations.
+
+    Migrating a project means a migration for the base and each app, and maybe
+    many projects at once, all from the same template and likely the same few
+    legacy versions. This clones the template (if it's remote) once, on first
+    use, and works out the migration point for each legacy version once.
+
+    Use as a context manager, the clone is removed on exit.
+    """
+
+    def __init__(self, template_uri: str):
+        self.template_uri = template_uri
+        self._exit_stack = ExitStack()
+        self._git: GitProject | None = None
+        self._migration_points: dict[str, tuple[str, bool]] = {}
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self._exit_stack.close()
+        self._git = None
+
+    @property
+    def git(self) -> GitProject:
+        if self._git is None:
+            self._git = self._exit_stack.enter_context(
+                GitProject.clone_if_necessary(self.template_uri)
+            )
+
+        return self._git
+
+    def migration_point(self, legacy_version: str) -> tuple[str, bool]:
+        """The migration tag for ``legacy_version``, and if it's an exact match.
+
+        See `get_closest_migration_tag()`.
+        """
+        if legacy_version not in self._migration_points:
+            self._migration_points[legacy_version] = get_closest_migration_tag(
+                self.git, legacy_version
+            )
+
+        return self._migration_points[legacy_version]
 
 
 @dataclass
@@ -21,6 +75,10 @@ class MigrateFromLegacyTemplate:
 
     extra_answers: Callable[[Self], dict[str, str]] | None = None
 
+    source: LegacyTemplateSource | None = None
+    """Shared with other migrations from ``origin_template_uri``, otherwise one
+    is created for each migration that needs it."""
+
     # these will be derived from above data if not provided
     template_name: str | None = None
     legacy_version_file_name: str | None = None
@@ -84,8 +142,11 @@ class MigrateFromLegacyTemplate:
 
         ref = template_version
         if use_migration_tags:
-            with GitProject.clone_if_necessary(self.origin_template_uri) as template_git:
-                ref, perfect_match = get_closest_migration_tag(template_git, template_version)
+            if self.source:
+                ref, perfect_match = self.source.migration_point(template_version)
+            else:
+                with LegacyTemplateSource(self.origin_template_uri) as source:
+                    ref, perfect_match = source.migration_point(template_version)
 
             if not ref:
                 raise ValueError("Issue finding suitable migration point")
@@ -118,8 +179,12 @@ class MigrateFromLegacyTemplate:
             self.legacy_version_file_path().unlink()
 
         if commit and self.project.git.is_git():
-            result = self.project.git.commit_all(
-                f"Migrate {self.legacy_version_file_path()} to {self.answers_file_rel()}"
+            result = self.project.git.commit_paths(
+                f"Migrate {self.legacy_version_file_path()} to {self.answers_file_rel()}",
+                [
+                    self.answers_file_rel(),
+                    self.legacy_version_file_path().relative_to(self.project.dir),
+                ],
             )
 
             if result.stdout:
@@ -155,7 +220,7 @@ def get_closest_migration_tag(git: GitProject, commit: str) -> tuple[str, bool]:
     from nava.platform.cli.commands.infra.info_command import get_version
 
     closest_tag = get_closest_tag_before_commit(git, commit)
-    migration_tags = git.get_tags("--list", f"{MIGRATION_TAG_PREFIX}*")
+    migration_tags = tag_index(git).tags(MIGRATION_TAG_PREFIX)
     if not migration_tags:
         raise Exception("Can't find migration tags")
 
@@ -163,24 +228,26 @@ def get_closest_migration_tag(git: GitProject, commit: str) -> tuple[str, bool]:
     if not closest_version:
         raise Exception(f"Can't determine version from {closest_tag}")
 
-    candidates = []
-
+    # checked up front, rather than only once reached, as unversioned tags are
+    # sorted last
+    migration_versions = []
     for migration_tag in migration_tags:
-        migration_version = get_version(
-            migration_tag.removeprefix(MIGRATION_TAG_PREFIX).removeprefix("v")
-        )
+        if not migration_tag.version:
+            raise Exception(f"Can't determine migration version from {migration_tag.name}")
+
+        migration_versions.append((migration_tag.name, migration_tag.version))
 
-        if not migration_version:
-            raise Exception(f"Can't determine migration version from {migration_tag}")
+    # sorted by version, so the last older one is the closest
+    closest_older_version = None
 
+    for migration_tag_name, migration_version in migration_versions:
         if closest_version == migration_version:
-            return migration_tag, True
+            return migration_tag_name, True
 
         if migration_version < closest_version:
-            candidates.append(migration_version)
+            closest_older_version = migration_version
 
-    if candidates:
-        closest_migration_version = max(candidates)
-        return MIGRATION_TAG_PREFIX + "v" + str(closest_migration_version), False
+    if closest_older_version:
+        return MIGRATION_TAG_PREFIX + "v" + str(closest_older_version), False
 
     raise Exception(f"Can't find matching migration version for {closest_tag}")
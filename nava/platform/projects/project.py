@@ -3,6 +3,7 @@ from dataclasses import dataclass
 from functools import cached_property
 from pathlib import Path
 
+from nava.platform.projects.project_state import ProjectState, project_state
 from nava.platform.util import git
 
 
@@ -14,10 +15,13 @@ class Project:
     def git(self) -> git.GitProject:
         return git.GitProject(self.dir)
 
-    def installed_template_names(self) -> Iterable[str]:
-        state_dirs = filter(lambda f: f.is_dir(), self.dir.glob(".template-*"))
+    @cached_property
+    def state(self) -> ProjectState:
+        """The answers files of the templates in the project, cached."""
+        return project_state(self.dir)
 
-        return map(lambda d: d.name.removeprefix("."), state_dirs)
+    def installed_template_names(self) -> Iterable[str]:
+        return map(lambda name: name.removeprefix("."), self.state.state_dir_names())
 
     def installed_template_names_for_app(self, app_name: str) -> Iterable[str]:
         answer_files = self._installed_template_answer_files_for_app(app_name)
@@ -25,6 +29,6 @@ class Project:
         return map(lambda f: f.parent.name.removeprefix("."), answer_files)
 
     def _installed_template_answer_files_for_app(self, app_name: str) -> Iterable[Path]:
-        answer_files = filter(lambda f: f.is_file(), self.dir.glob(f".template-*/*{app_name}*"))
+        answer_files = filter(lambda f: app_name in f.name, self.state.state_files())
 
-        return answer_files
+        return map(lambda f: self.dir / f, answer_files)
@@ -0,0 +1,141 @@
+"""In-memory view of the template state (answers files) of a project.
+
+The answers files under ``.template-*/`` are consulted all over a single run,
+for which templates and apps are installed, their versions, where they came
+from, etc. Rather than each of those globbing and parsing YAML again, they go
+through the `ProjectState` for the project, which parses each file once (with
+the C YAML loader if available) and only again when the file changes on disk,
+going by its stat info.
+"""
+
+import os
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import yaml
+
+from nava.platform.types import RelativePath
+
+STATE_DIR_PREFIX = ".template-"
+ANSWERS_FILE_SUFFIX = ".yml"
+
+_Loader: type[yaml.SafeLoader] = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# what changes if a file changes, short of the content itself
+_Stamp = tuple[int, int, int, int]
+
+
+def _stamp(stat: os.stat_result) -> _Stamp:
+    return (stat.st_ino, stat.st_size, stat.st_mtime_ns, stat.st_ctime_ns)
+
+
+@dataclass
+class _Listing:
+    stamp: _Stamp
+    names: list[str]
+
+
+@dataclass
+class _Answers:
+    stamp: _Stamp
+    answers: Any
+
+
+class ProjectState:
+    """The answers files of the project at ``dir``.
+
+    Use `project_state()` to get the one shared for a project.
+    """
+
+    def __init__(self, dir: Path):
+        self.dir = dir
+        self._listings: dict[Path, _Listing] = {}
+        self._answers: dict[RelativePath, _Answers] = {}
+        self._lock = threading.Lock()
+
+    def state_dir_names(self) -> list[str]:
+        """Names of the ``.template-*`` directories, sorted."""
+        return [
+            name
+            for name in self._list(self.dir)
+            if name.startswith(STATE_DIR_PREFIX) and (self.dir / name).is_dir()
+        ]
+
+    def state_files(self, state_dir_name: str | None = None) -> list[RelativePath]:
+        """Files in the ``.template-*`` directories (or just ``state_dir_name``)."""
+        dir_names = self.state_dir_names() if state_dir_name is None else [state_dir_name]
+
+        return [
+            Path(dir_name, name)
+            for dir_name in dir_names
+            for name in self._list(self.dir / dir_name)
+            if (self.dir / dir_name / name).is_file()
+        ]
+
+    def answers_files(self, state_dir_name: str | None = None) -> list[RelativePath]:
+        return [f for f in self.state_files(state_dir_name) if f.suffix == ANSWERS_FILE_SUFFIX]
+
+    def has_answers(self, answers_file_rel: RelativePath) -> bool:
+        return (self.dir / answers_file_rel).is_file()
+
+    def answers(self, answers_file_rel: RelativePath) -> dict[str, Any] | None:
+        """The parsed answers in ``answers_file_rel``, `None` if there's no such file.
+
+        Anything but a mapping in the file counts as empty.
+        """
+        path = self.dir / answers_file_rel
+        try:
+            stamp = _stamp(path.stat())
+        except FileNotFoundError:
+            return None
+
+        with self._lock:
+            cached = self._answers.get(answers_file_rel)
+
+        if cached is None or cached.stamp != stamp:
+            cached = _Answers(stamp, yaml.load(path.read_bytes(), Loader=_Loader))
+            with self._lock:
+                self._answers[answers_file_rel] = cached
+
+        if not isinstance(cached.answers, dict):
+            return {}
+
+        # a copy, so callers can do as they wish with it
+        return dict(cached.answers)
+
+    def _list(self, dir: Path) -> list[str]:
+        try:
+            stamp = _stamp(dir.stat())
+        except FileNotFoundError:
+            return []
+
+        with self._lock:
+            listing = self._listings.get(dir)
+
+        if listing is None or listing.stamp != stamp:
+            try:
+                listing = _Listing(stamp, sorted(os.listdir(dir)))
+            except NotADirectoryError:
+                return []
+
+            with self._lock:
+                self._listings[dir] = listing
+
+        return listing.names
+
+
+_states: dict[Path, ProjectState] = {}
+_states_lock = threading.Lock()
+
+
+def project_state(dir: Path) -> ProjectState:
+    """Get the (process-wide) state for the project at ``dir``."""
+    key = dir.resolve()
+
+    with _states_lock:
+        if key not in _states:
+            _states[key] = ProjectState(key)
+
+        return _states[key]
@@ -0,0 +1,184 @@
+"""Find the platform projects under a directory tree, and what they have installed.
+
+A project is a directory with template state, ``.template-*/`` directories of
+answers files, or the version files of the legacy templates
+(``.template-version``, ``.template-application-*-version``, etc.).
+
+The tree is walked with `os.scandir` across a pool of threads, each listing one
+directory at a time, which is mostly waiting on the filesystem, so many
+repositories can be scanned in a few seconds. Directories that can't hold a
+project (``.git``, ``node_modules``, vendored dependencies, etc.) aren't
+descended into, and neither are projects themselves.
+"""
+
+import os
+from collections.abc import Iterable
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from nava.platform.projects.project import Project
+from nava.platform.projects.project_state import STATE_DIR_PREFIX
+
+INFRA_TEMPLATE = "template-infra"
+INFRA_LEGACY_VERSION_FILE_NAME = ".template-version"
+LEGACY_VERSION_FILE_SUFFIX = "-version"
+
+PRUNED_DIR_NAMES = frozenset(
+    {
+        ".git",
+        ".hg",
+        ".svn",
+        ".terraform",
+        ".tox",
+        ".venv",
+        "__pycache__",
+        "bower_components",
+        "node_modules",
+        "site-packages",
+        "vendor",
+        "venv",
+    }
+)
+
+
+@dataclass
+class InstalledTemplate:
+    template: str
+    """The template (repo) name, e.g., ``template-infra``."""
+    answers_file: str
+    """Relative to the project."""
+    app: str | None
+    """The app the template is installed for, `None` for the infra base."""
+    commit: str | None
+    """The template version, the ``_commit`` answer."""
+    src_path: str | None
+
+
+@dataclass
+class LegacyVersionFile:
+    template: str
+    file: str
+    """Relative to the project."""
+    version: str
+
+
+@dataclass
+class ProjectInventory:
+    path: str
+    templates: list[InstalledTemplate] = field(default_factory=list)
+    legacy: list[LegacyVersionFile] = field(default_factory=list)
+
+
+def scan(
+    root: Path,
+    *,
+    jobs: int | None = None,
+    pruned_dir_names: Iterable[str] = PRUNED_DIR_NAMES,
+) -> list[ProjectInventory]:
+    """Find the projects under (and including) ``root``, sorted by path.
+
+    Args:
+        root: Directory to scan.
+        jobs: Number of directories to list at once, defaults to a few more
+            than the number of CPUs.
+        pruned_dir_names: Names of directories to not descend into.
+    """
+    pruned = frozenset(pruned_dir_names)
+    projects = []
+
+    with ThreadPoolExecutor(max_workers=jobs or min(32, (os.cpu_count() or 1) + 4)) as executor:
+        pending = {executor.submit(_visit, str(root.resolve()), pruned)}
+
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                sub_dirs, project = future.result()
+                if project:
+                    projects.append(project)
+
+                pending.update(executor.submit(_visit, sub_dir, pruned) for sub_dir in sub_dirs)
+
+    return sorted(projects, key=lambda p: p.path)
+
+
+def _visit(path: str, pruned: frozenset[str]) -> tuple[list[str], ProjectInventory | None]:
+    """The directories to visit next under ``path``, or its inventory if it's a project."""
+    sub_dirs = []
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                try:
+                    is_dir = entry.is_dir(follow_symlinks=False)
+                except OSError:
+                    continue
+
+                if (is_dir and entry.name.startswith(STATE_DIR_PREFIX)) or (
+                    not is_dir and _legacy_template_name(entry.name)
+                ):
+                    return [], inventory(Path(path))
+
+                if is_dir and entry.name not in pruned:
+                    sub_dirs.append(entry.path)
+    except (PermissionError, FileNotFoundError, NotADirectoryError):
+        return [], None
+
+    return sub_dirs, None
+
+
+def inventory(project_dir: Path) -> ProjectInventory:
+    """What templates, legacy or not, are installed in the project at ``project_dir``."""
+    project = Project(project_dir)
+    result = ProjectInventory(path=str(project_dir))
+
+    for template_name in project.installed_template_names():
+        for answers_file in project.state.answers_files(f".{template_name}"):
+            answers = project.state.answers(answers_file) or {}
+            result.templates.append(
+                InstalledTemplate(
+                    template=template_name,
+                    answers_file=str(answers_file),
+                    app=_app_name(template_name, answers_file.stem),
+                    commit=_str_or_none(answers.get("_commit")),
+                    src_path=_str_or_none(answers.get("_src_path")),
+                )
+            )
+
+    for file_name in sorted(os.listdir(project_dir)):
+        legacy_template_name = _legacy_template_name(file_name)
+        legacy_file = project_dir / file_name
+        if legacy_template_name and legacy_file.is_file():
+            result.legacy.append(
+                LegacyVersionFile(
+                    template=legacy_template_name,
+                    file=file_name,
+                    version=legacy_file.read_text().strip(),
+                )
+            )
+
+    return result
+
+
+def _legacy_template_name(file_name: str) -> str | None:
+    """The name of the template ``file_name`` is the legacy version file of, if it is one."""
+    if file_name == INFRA_LEGACY_VERSION_FILE_NAME:
+        return INFRA_TEMPLATE
+
+    if file_name.startswith(STATE_DIR_PREFIX) and file_name.endswith(LEGACY_VERSION_FILE_SUFFIX):
+        return file_name.removeprefix(".").removesuffix(LEGACY_VERSION_FILE_SUFFIX)
+
+    return None
+
+
+def _app_name(template_name: str, answers_file_stem: str) -> str | None:
+    if template_name != INFRA_TEMPLATE:
+        return answers_file_stem
+
+    if answers_file_stem.startswith("app-"):
+        return answers_file_stem.removeprefix("app-")
+
+    return None
+
+
+def _str_or_none(value: object) -> str | None:
+    return None if value is None else str(value)
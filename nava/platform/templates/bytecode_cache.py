@@ -0,0 +1,128 @@
+"""A persistent cache of compiled Jinja templates.
+
+Every render (`nava.platform.copier_worker.run_copy`, ``run_update``,
+``render_template_files``) creates a new Jinja environment, which compiles every
+template file it touches from source again. Installing or updating the same
+template version over and over, e.g., for every app in a project, means
+compiling the exact same sources over and over. Hooking a `JinjaBytecodeCache`
+up to the environment skips that.
+
+Entries are content-addressed, keyed by the template commit, the environment
+settings and a hash of the template source, so an entry never goes stale, only
+unused, and the least recently used are removed once the cache grows too large.
+"""
+
+import contextlib
+import hashlib
+import os
+import sys
+import threading
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+
+import jinja2
+from jinja2.bccache import Bucket, BytecodeCache
+
+from nava.platform.cli.config import app_dirs
+from nava.platform.util.files.cache import mark_used, prune_lru
+
+DEFAULT_MAX_SIZE_BYTES = 64 * 1024 * 1024
+
+CACHE_FILE_SUFFIX = ".jbc"
+
+
+class JinjaBytecodeCache(BytecodeCache):
+    """Jinja bytecode stored in files under ``root``.
+
+    Args:
+        root: Directory to keep the entries in.
+        namespace: Anything that affects how the sources compile beyond their
+            contents, e.g., the template commit and environment options.
+        max_size_bytes: How big the cache can get before old entries get
+            removed.
+    """
+
+    def __init__(self, root: Path, namespace: str = "", max_size_bytes: int | None = None):
+        self.root = root
+        self.namespace = namespace
+        self.max_size_bytes = max_size_bytes or DEFAULT_MAX_SIZE_BYTES
+
+    def get_bucket(
+        self,
+        environment: jinja2.Environment,
+        name: str,
+        filename: str | None,
+        source: str,
+    ) -> Bucket:
+        checksum = self.get_source_checksum(source)
+        key = hashlib.sha256(
+            "\0".join(
+                [
+                    jinja2.__version__,
+                    sys.implementation.cache_tag or "",
+                    self.namespace,
+                    name,
+                    checksum,
+                ]
+            ).encode()
+        ).hexdigest()
+
+        bucket = Bucket(environment, key, checksum)
+        self.load_bytecode(bucket)
+        return bucket
+
+    def entry_path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}{CACHE_FILE_SUFFIX}"
+
+    def load_bytecode(self, bucket: Bucket) -> None:
+        path = self.entry_path(bucket.key)
+        try:
+            with open(path, "rb") as f:
+                bucket.load_bytecode(f)
+        except OSError:
+            return
+
+        with contextlib.suppress(OSError):
+            mark_used(path)
+
+    def dump_bytecode(self, bucket: Bucket) -> None:
+        path = self.entry_path(bucket.key)
+        # entries are content-addressed, if it's there it's the same
+        if path.exists():
+            return
+
+        # it's only a cache, not being able to write it is fine
+        with contextlib.suppress(OSError):
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with NamedTemporaryFile(dir=path.parent, suffix=".tmp", delete=False) as f:
+                bucket.write_bytecode(f)
+            os.replace(f.name, path)
+
+            self._prune(keep=path)
+
+    def clear(self) -> None:
+        for path in self.root.glob(f"*/*{CACHE_FILE_SUFFIX}"):
+            path.unlink(missing_ok=True)
+
+    def _prune(self, keep: Path) -> None:
+        # walking the whole cache for every new entry would cost more than
+        # compiling, once per process is plenty to keep it bounded
+        with _pruned_roots_lock:
+            if self.root in _pruned_roots:
+                return
+            _pruned_roots.add(self.root)
+
+        prune_lru(self.root.glob(f"*/*{CACHE_FILE_SUFFIX}"), self.max_size_bytes, keep=[keep])
+
+
+_pruned_roots: set[Path] = set()
+_pruned_roots_lock = threading.Lock()
+
+
+def default_bytecode_cache_dir() -> Path:
+    return app_dirs.user_cache_path / "jinja-bytecode"
+
+
+def jinja_bytecode_cache(namespace: str) -> JinjaBytecodeCache:
+    """Get a bytecode cache in the user's cache directory for ``namespace``."""
+    return JinjaBytecodeCache(default_bytecode_cache_dir(), namespace)
@@ -0,0 +1,333 @@
+"""Process-wide registry of template checkouts.
+
+A single command can end up needing the same template at the same version many
+times over, e.g., ``infra update`` has the base and app templates which live in
+the same repo, the network config regeneration, and Copier's own rendering of
+the old and new versions during an update for every app. Rather than each of
+those making their own clone, they all draw from here, where there is at most
+one checkout per (template URI, resolved commit).
+
+Remote templates are usually checked out from a local mirror (see
+`nava.platform.util.git_mirror`), but if there isn't one yet and a specific tag
+is asked for, just that tag is cloned, which is a lot less to transfer than the
+full history.
+
+Checkouts are treated as read-only and are removed when the process exits,
+unless they live under a root shared with other processes (see `share_root`),
+in which case whoever set up the root cleans it up. Child processes running
+the CLI can be pointed at the checkouts of their parent with the environment
+from `TemplateCheckouts.child_env`.
+"""
+
+import atexit
+import hashlib
+import os
+import shutil
+import threading
+from collections.abc import Sequence
+from pathlib import Path
+from tempfile import mkdtemp
+from typing import Any
+
+import yaml
+
+from nava.platform.templates.src_exclude import sparse_checkout_patterns
+from nava.platform.util import git_mirror
+from nava.platform.util.files.cache import file_lock
+from nava.platform.util.git import (
+    CloneStrategy,
+    GitProject,
+    run_text,
+    select_clone_strategy,
+)
+from nava.platform.util.git_tags import tag_index
+
+SHARED_ROOT_ENV_VAR = "NAVA_PLATFORM_TEMPLATE_CHECKOUTS"
+"""Root shared with a parent process, see `TemplateCheckouts.child_env`."""
+
+
+class TemplateCheckouts:
+    def __init__(self, root: Path | None = None):
+        self._root = root
+        self._checkouts: dict[tuple[str, str, tuple[str, ...]], Path] = {}
+        self._repos: dict[Path, GitProject] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def root(self) -> Path:
+        if self._root is None:
+            self._root = Path(mkdtemp(prefix=f"{__name__}."))
+            atexit.register(shutil.rmtree, self._root, ignore_errors=True)
+
+        return self._root
+
+    def share_root(self, root: Path) -> None:
+        """Keep checkouts under ``root``, along with other processes doing the same.
+
+        A checkout made by any of the processes is used by all of them, rather
+        than each making their own. The caller is responsible for removing
+        ``root`` once done.
+        """
+        self._root = root
+
+    def child_env(self) -> dict[str, str]:
+        """Environment for child processes to share the checkouts of this one.
+
+        Along with the mirrors this process has already fetched, so the
+        children don't fetch them again either.
+        """
+        return {SHARED_ROOT_ENV_VAR: str(self.root)} | git_mirror.fetched_mirrors_env()
+
+    def checkout(
+        self,
+        url: str,
+        ref: str | None,
+        use_prereleases: bool = False,
+        src_exclude: Sequence[str] = (),
+    ) -> Path | None:
+        """Get a checkout of ``url`` at ``ref``, creating it if necessary.
+
+        Args:
+            url: A git-parseable URL (or path) for the template repo.
+            ref: What to checkout, `None` for the latest (PEP 440) tag.
+            use_prereleases: Consider pre-release tags when ``ref`` is `None`.
+            src_exclude: Template paths that will not be rendered, which along
+                with the ``_src_exclude`` of the template itself, are left out
+                of the checkout (see `sparse_checkout_patterns`).
+
+        Returns:
+            The path to the checkout, or `None` if ``url`` is a local repo with
+            uncommitted changes that are expected to be included (see
+            `copier.vcs.clone`), which can't be shared.
+        """
+        src_exclude = tuple(src_exclude)
+        is_local = Path(url).expanduser().exists()
+
+        if not is_local and not self._has_mirror(url):
+            shallow_checkout = self._shallow_checkout(url, ref, src_exclude)
+            if shallow_checkout:
+                return shallow_checkout
+
+        source = self.source_repo(url)
+
+        if is_local and ref in (None, "HEAD") and _is_dirty(source):
+            return None
+
+        with self._lock:
+            repo = self._repos.setdefault(source, GitProject(source))
+
+        commit = resolve_commit(repo, ref, use_prereleases=use_prereleases)
+
+        with self._lock:
+            key = (url, commit, src_exclude)
+            if key not in self._checkouts:
+                self._checkouts[key] = self._create_checkout(source, *key)
+
+            return self._checkouts[key]
+
+    def owns(self, path: Path) -> bool:
+        return path in self._checkouts.values()
+
+    def source_repo(self, url: str) -> Path:
+        """Where to clone ``url`` from, either itself if local or a cached mirror."""
+        local_path = Path(url).expanduser()
+        if local_path.exists():
+            return local_path
+
+        return git_mirror.default_mirror_cache().mirror(url)
+
+    def _has_mirror(self, url: str) -> bool:
+        return git_mirror.default_mirror_cache().mirror_path(url).exists()
+
+    def _shallow_checkout(
+        self, url: str, ref: str | None, src_exclude: tuple[str, ...]
+    ) -> Path | None:
+        """Check out just the commit of ``ref`` straight from ``url``.
+
+        Only done for tags, as Copier records ``git describe`` of the checkout
+        as the template version, which for anything else needs history.
+        Returns `None` if not possible.
+        """
+        if ref is None or select_clone_strategy(ref) is not CloneStrategy.SHALLOW_REF:
+            return None
+
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp_dest = Path(mkdtemp(prefix="shallow-", dir=self.root))
+        clone_args = ["--quiet", "--no-checkout", "--depth", "1", "--branch", ref]
+        result = run_text(["git", "clone", *clone_args, url, tmp_dest])
+        commit = None
+        if result.returncode == 0:
+            tmp_git = GitProject(tmp_dest)
+            commit = tmp_git.resolve_commit(f"refs/tags/{ref}")
+            tmp_git.close()
+
+        with self._lock:
+            key = (url, commit or "", src_exclude)
+            if commit is None or key in self._checkouts:
+                shutil.rmtree(tmp_dest, ignore_errors=True)
+                return self._checkouts.get(key)
+
+            dest = self._checkout_path(*key)
+            with file_lock(_lock_path(dest)):
+                # made by another process sharing the root
+                if dest.exists():
+                    shutil.rmtree(tmp_dest, ignore_errors=True)
+                else:
+                    _populate_checkout(tmp_dest, commit, src_exclude)
+                    tmp_dest.rename(dest)
+
+            self._checkouts[key] = dest.resolve()
+            return self._checkouts[key]
+
+    def _checkout_path(self, url: str, commit: str, src_exclude: tuple[str, ...]) -> Path:
+        url_key = hashlib.sha256(url.encode()).hexdigest()[:16]
+        if not src_exclude:
+            return self.root / f"{url_key}-{commit}"
+
+        exclude_key = hashlib.sha256("\0".join(src_exclude).encode()).hexdigest()[:8]
+        return self.root / f"{url_key}-{commit}-{exclude_key}"
+
+    def _create_checkout(
+        self, source: Path, url: str, commit: str, src_exclude: tuple[str, ...]
+    ) -> Path:
+        dest = self._checkout_path(url, commit, src_exclude)
+
+        with file_lock(_lock_path(dest)):
+            # made by another process sharing the root
+            if not dest.exists():
+                self.root.mkdir(parents=True, exist_ok=True)
+                tmp_dest = Path(mkdtemp(prefix="clone-", dir=self.root))
+                run_text(
+                    ["git", "clone", "--quiet", "--no-checkout", source, tmp_dest]
+                ).check_returncode()
+                _populate_checkout(tmp_dest, commit, src_exclude)
+                tmp_dest.rename(dest)
+
+        return dest.resolve()
+
+
+def _lock_path(checkout_path: Path) -> Path:
+    return checkout_path.with_name(checkout_path.name + ".lock")
+
+
+def _populate_checkout(repo: Path, commit: str, src_exclude: tuple[str, ...]) -> None:
+    """Check out ``commit`` in a ``--no-checkout`` clone, sparsely if possible."""
+    if src_exclude and (patterns := _sparse_patterns(repo, commit, src_exclude)):
+        run_text(
+            ["git", "sparse-checkout", "set", "--no-cone", "--stdin"],
+            cwd=repo,
+            input="\n".join(patterns) + "\n",
+        ).check_returncode()
+
+    run_text(["git", "checkout", "--quiet", "--force", commit], cwd=repo).check_returncode()
+    run_text(
+        ["git", "submodule", "update", "--checkout", "--init", "--recursive", "--force"],
+        cwd=repo,
+    ).check_returncode()
+
+
+def _sparse_patterns(repo: Path, commit: str, src_exclude: tuple[str, ...]) -> list[str] | None:
+    """Sparse-checkout patterns for the files of ``commit`` that could be rendered.
+
+    Returns `None` if the template could need files that aren't rendered
+    themselves, in which case everything should be checked out. That is, if
+    its config can't be understood without a full checkout (it uses includes
+    or a templated subdirectory), it has tasks, migrations or external data
+    (which run or read arbitrary files), or any of the kept templates includes
+    or imports another file.
+    """
+    config = _read_copier_config(repo, commit)
+    if config is None:
+        return None
+
+    subdirectory = str(config.get("_subdirectory", ""))
+    if "{" in subdirectory:
+        return None
+
+    if any(config.get(key) for key in FULL_CHECKOUT_CONFIG_KEYS):
+        return None
+
+    all_src_exclude = list(config.get("_src_exclude", [])) + list(src_exclude)
+
+    result = run_text(["git", "ls-tree", "-r", "-z", "--name-only", commit], cwd=repo)
+    result.check_returncode()
+    paths = [path for path in result.stdout.split("\0") if path]
+
+    # there are only patterns for them if some of them are kept
+    includers = _jinja_includers(repo, commit)
+    if includers and sparse_checkout_patterns(includers, all_src_exclude, subdirectory):
+        return None
+
+    patterns = sparse_checkout_patterns(paths, all_src_exclude, subdirectory)
+    if patterns == ["/*"]:
+        return None
+
+    # keep the config available, whatever its exclusions
+    return [*patterns, *(f"/{name}" for name in COPIER_CONFIG_FILE_NAMES)]
+
+
+COPIER_CONFIG_FILE_NAMES = ("copier.yml", "copier.yaml")
+
+FULL_CHECKOUT_CONFIG_KEYS = ("_tasks", "_migrations", "_external_data")
+"""Template settings that can use files outside of what is rendered."""
+
+JINJA_INCLUDE_REGEX = r"\{%[-+]?[[:space:]]*(include|import|from|extends)[[:space:]]"
+
+
+def _jinja_includers(repo: Path, commit: str) -> list[str]:
+    """Files of ``commit`` that include, import or extend other templates."""
+    result = run_text(
+        ["git", "grep", "-l", "-z", "-I", "-E", JINJA_INCLUDE_REGEX, commit], cwd=repo
+    )
+    # "<commit>:<path>" for each match
+    return [path.removeprefix(f"{commit}:") for path in result.stdout.split("\0") if path]
+
+
+def _read_copier_config(repo: Path, commit: str) -> dict[str, Any] | None:
+    for name in COPIER_CONFIG_FILE_NAMES:
+        result = run_text(["git", "show", f"{commit}:{name}"], cwd=repo)
+        if result.returncode != 0:
+            continue
+
+        try:
+            config = yaml.safe_load(result.stdout)
+        except yaml.YAMLError:
+            # e.g., uses `!include`
+            return None
+
+        return config if isinstance(config, dict) else {}
+
+    return {}
+
+
+def resolve_commit(
+    repo: Path | GitProject, ref: str | None, *, use_prereleases: bool = False
+) -> str:
+    """Get the full commit hash ``ref`` points to in ``repo``.
+
+    If ``ref`` is `None`, use the latest tag, sorted by PEP 440 (matching
+    `copier.vcs.checkout_latest_tag`), falling back to ``HEAD`` if there are
+    none.
+    """
+    git = repo if isinstance(repo, GitProject) else GitProject(repo)
+
+    if ref is None:
+        ref = tag_index(git).latest(use_prereleases=use_prereleases) or "HEAD"
+
+    commit = git.resolve_commit(ref)
+    if commit is None:
+        raise ValueError(f"Can not find {ref} in template repo")
+
+    return commit
+
+
+def _is_dirty(repo: Path) -> bool:
+    return bool(run_text(["git", "status", "--porcelain"], cwd=repo).stdout.strip())
+
+
+def _shared_root_from_env() -> Path | None:
+    root = os.environ.get(SHARED_ROOT_ENV_VAR)
+    return Path(root) if root else None
+
+
+template_checkouts = TemplateCheckouts(_shared_root_from_env())
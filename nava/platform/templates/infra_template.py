@@ -1,10 +1,10 @@
 from pathlib import Path
-from typing import Self
+from typing import Any, Self
 
 from packaging.version import Version
 
 from nava.platform.cli.context import CliContext
-from nava.platform.copier_worker import render_template_file
+from nava.platform.copier_worker import ChangeManifest, render_template_files
 from nava.platform.projects.infra_project import InfraProject
 from nava.platform.templates.state import get_template_uri_for_existing_app
 from nava.platform.templates.template import Template
@@ -15,7 +15,9 @@ class InfraTemplate:
     ctx: CliContext
     template_uri: Path | str
 
-    def __init__(self, ctx: CliContext, template_uri: Path | str, *, ref: str | None = None):
+    def __init__(
+        self, ctx: CliContext, template_uri: Path | str, *, ref: str | None = None, jobs: int = 1
+    ):
         self.ctx = ctx
         self.template_uri = template_uri
 
@@ -25,6 +27,7 @@ class InfraTemplate:
             src_excludes=["*{{app_name}}*"],
             template_name="template-infra:base",
             ref=ref,
+            jobs=jobs,
         )
 
         self.template_app = Template(
@@ -37,6 +40,7 @@ class InfraTemplate:
             ],
             template_name="template-infra:app",
             ref=ref,
+            jobs=jobs,
         )
 
     @classmethod
@@ -44,6 +48,8 @@ class InfraTemplate:
         cls,
         ctx: CliContext,
         project: InfraProject,
+        *,
+        jobs: int = 1,
     ) -> Self:
         template_uri = get_template_uri_for_existing_app(
             project, app_name="base", template_name=TemplateName.parse("template-infra:base")
@@ -52,7 +58,7 @@ class InfraTemplate:
         if not template_uri:
             raise ValueError("Can not determine existing `template-infra` source")
 
-        return cls(ctx, template_uri=template_uri)
+        return cls(ctx, template_uri=template_uri, jobs=jobs)
 
     def install(
         self,
@@ -107,26 +113,42 @@ class InfraTemplate:
         commit: bool = False,
         answers_only: bool = False,
         force: bool = False,
-    ) -> None:
-        self.template_base.update(
-            project,
-            app_name="base",
-            version=version,
-            data=data,
-            commit=False,
-            answers_only=answers_only,
-            force=force,
-        )
+    ) -> ChangeManifest:
+        check = None
+        if not (force or answers_only or data):
+            check = self.template_base.check_version(
+                project, "base", version=version, checkout=False
+            )
+
+        if check and check.up_to_date:
+            # no need for the full update, but the network config depends on
+            # the apps as well, so it's still regenerated below
+            self.ctx.console.print(f"Already up to date ({check.current.display_str})")
+            manifest = ChangeManifest()
+            network_config_version: str | None = check.current.answer_value
+        else:
+            manifest = self.template_base.update(
+                project,
+                app_name="base",
+                version=version,
+                data=data,
+                commit=False,
+                answers_only=answers_only,
+                force=force,
+            )
+            network_config_version = self.template_base.commit
 
         # the network file needs re-rendered with the app_names
-        self._update_network_config(
+        manifest |= self._update_network_config(
             project,
             app_names=project.app_names,
-            version=self.template_base.commit,
+            version=network_config_version,
         )
 
         if commit:
-            self.template_base._commit_action(project, "update", app_name="base")
+            self.template_base._commit_action(project, "update", app_name="base", manifest=manifest)
+
+        return manifest
 
     def update_app(
         self,
@@ -138,8 +160,8 @@ class InfraTemplate:
         commit: bool = False,
         answers_only: bool = False,
         force: bool = False,
-    ) -> None:
-        self.template_app.update(
+    ) -> ChangeManifest:
+        return self.template_app.update(
             project,
             app_name=app_name,
             version=version,
@@ -158,18 +180,18 @@ class InfraTemplate:
         data: dict[str, str] | None = None,
         existing_apps: list[str] | None = None,
         commit: bool = False,
-    ) -> None:
+    ) -> ChangeManifest:
         # Use the template version that the project is currently on, unless
         # an override is provided (mainly during initial install)
         vcs_ref = version if version is not None else project.template_version
 
-        self.template_app.install(
+        manifest = self.template_app.install(
             project, app_name=app_name, version=vcs_ref, data=data, commit=False
         )
 
         # the network config is added/maintained in the base template, but it is
         # supposed to import every app config module, so update it for the added app
-        self._update_network_config(
+        manifest |= self._update_network_config(
             project,
             # `project.app_names` should already include the just added app,
             # but in case caching is ever added there, be sure to included the
@@ -179,12 +201,13 @@ class InfraTemplate:
         )
 
         if commit:
-            self.template_app._commit_action(project, "install", app_name)
+            self.template_app._commit_action(project, "install", app_name, manifest=manifest)
+
+        return manifest
 
     def _update_network_config(
         self, project: InfraProject, app_names: list[str], *, version: str | None = None
-    ) -> None:
-        data = {"app_names": list(app_names)}
+    ) -> ChangeManifest:
         possible_network_file_paths_rel = [
             "templates/base/infra/networks/main.tf.jinja",
             "infra/networks/main.tf.jinja",
@@ -200,19 +223,48 @@ class InfraTemplate:
 
         if not found_path:
             # TODO: actually an error to not find one?
-            return
+            return ChangeManifest()
 
         render_path = found_path.removeprefix("templates/base/").removesuffix(".jinja")
 
         self.ctx.console.print(f"Regenerating {render_path} with apps {app_names}")
 
+        manifest = self._regenerate_base_files(
+            project,
+            [(found_path, render_path)],
+            data={"app_names": list(app_names)},
+            version=version,
+        )
+
+        # TODO: run `terraform fmt` after? Currently left for folks to do
+        # manually.
+
+        return manifest
+
+    def _regenerate_base_files(
+        self,
+        project: InfraProject,
+        files: list[tuple[str, str | None]],
+        data: dict[str, Any],
+        *,
+        version: str | None = None,
+    ) -> ChangeManifest:
+        """Re-render specific base template files, in one go.
+
+        Args:
+            project: Where to render the files.
+            files: Pairs of template file path and where to render it in the
+                project.
+            data: What the files need to render.
+            version: Template version to render from, defaults to the one the
+                project is on.
+        """
         # TODO: this might conceivably need to include the base template
         # data/answers at some point
-        render_template_file(
+        worker = render_template_files(
             src_path=str(self.template_uri),
-            src_file_path=found_path,
+            files=files,
             dst_path=project.dir,
-            render_path=render_path,
             data=data,
             # Use the template version that the project is currently on, unless
             # an override is provided (mainly during initial install)
@@ -223,8 +275,7 @@ class InfraTemplate:
             quiet=True,
         )
 
-        # TODO: run `terraform fmt` after? Currently left for folks to do
-        # manually.
+        return worker.manifest
 
     @property
     def version(self) -> Version | None:
@@ -0,0 +1,51 @@
+"""Find out what tags a template has, without checking it out.
+
+Deciding whether a project is up to date with a template only needs the
+template's tags, which for a remote template are a single ``git ls-remote``
+away, rather than a clone (or fetch of a mirror) and checkout. Local templates
+go through their (cached) `TagIndex`.
+"""
+
+import threading
+from pathlib import Path
+
+from copier.vcs import get_repo
+
+from nava.platform.util.git import GitProject, run_text
+from nava.platform.util.git_tags import TagEntry, latest_tag, parse_ls_remote_tags, tag_index
+
+_remote_tags: dict[str, list[TagEntry] | None] = {}
+_remote_tags_lock = threading.Lock()
+
+
+def template_tags(url: str) -> list[TagEntry] | None:
+    """The tags of the template at ``url``, `None` if they can't be listed.
+
+    Remote listings are remembered for the rest of the process, so checking
+    many projects against the same template only asks once.
+    """
+    repo = get_repo(url)
+    if repo is None:
+        return None
+
+    local_path = Path(repo).expanduser()
+    if local_path.exists():
+        return tag_index(GitProject(local_path)).entries
+
+    with _remote_tags_lock:
+        if repo not in _remote_tags:
+            result = run_text(["git", "ls-remote", "--tags", repo])
+            _remote_tags[repo] = (
+                parse_ls_remote_tags(result.stdout) if result.returncode == 0 else None
+            )
+
+        return _remote_tags[repo]
+
+
+def latest_template_tag(url: str, *, use_prereleases: bool = False) -> str | None:
+    """The tag Copier would use for the template at ``url`` if not given a version."""
+    tags = template_tags(url)
+    if tags is None:
+        return None
+
+    return latest_tag(tags, use_prereleases=use_prereleases)
@@ -0,0 +1,227 @@
+"""Snapshots of what a template last rendered, kept in the project's git repo.
+
+To update a project, Copier renders the version of the template the project is
+on into a temporary directory, the diff from which to the project is the
+project's own changes to reapply on top of the new version. That's a second
+checkout and render of the template for every update, of something that was
+already rendered (as the new version) by the last install or update.
+
+So installs and updates record what was rendered, as git objects in the
+project's repo, under a private ref per answers file, like
+``refs/nava/rendered/template-infra/app-foo``. Not under ``refs/heads`` or
+``refs/tags``, so they aren't pushed or fetched by default, and they point to
+a tree rather than a commit, so they stay out of ``git log --all``. The tree
+has:
+
+    files/         what was rendered, as ``git add --all`` in a fresh repo would
+    render.json    the template version, its configuration and the options it
+                   was rendered with
+
+The next update restores ``files/`` in place of rendering the old version, and
+takes what it needs to know about the old version from ``render.json``, so the
+old version isn't checked out at all.
+A snapshot is only used if its copy of the answers file is the same as the
+project's, so it's the render of the same template version with the same
+answers, and it was rendered with the same options, otherwise the update
+renders the old version as usual.
+"""
+
+import json
+import os
+import subprocess
+from dataclasses import dataclass
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import Any
+
+from nava.platform.types import RelativePath
+from nava.platform.util.git import run_text
+
+REF_PREFIX = "refs/nava/rendered"
+FILES_TREE_NAME = "files"
+META_FILE_NAME = "render.json"
+
+
+@dataclass(frozen=True)
+class RenderedSnapshot:
+    git_dir: Path
+    """Of the project the snapshot is in."""
+    tree: str
+    """The rendered files."""
+    commit: str
+    """The template version rendered, as saved in the answers file."""
+    version: str
+    """The PEP 440 version of ``commit``, as Copier works it out."""
+    config: dict[str, Any]
+    """The raw configuration of the template version (its ``copier.yml``)."""
+
+
+def ref_name(answers_file_rel: RelativePath) -> str:
+    """The ref for the snapshot of the render ``answers_file_rel`` is from."""
+    return f"{REF_PREFIX}/{answers_file_rel.parent.name.removeprefix('.')}/{answers_file_rel.stem}"
+
+
+def render_key(**options: Any) -> str:
+    """A representation of the options that change what is rendered, to compare."""
+    return json.dumps(options, sort_keys=True, default=str)
+
+
+def find(
+    project_dir: Path, ref: str, answers_file_rel: RelativePath, key: str
+) -> RenderedSnapshot | None:
+    """The snapshot at ``ref``, if it's of what the project currently has installed.
+
+    Args:
+        project_dir: Where the template is rendered.
+        ref: Where the snapshot would be, see `ref_name()`.
+        answers_file_rel: The answers file of the template, relative to
+            ``project_dir``.
+        key: The `render_key()` of the options to render with.
+    """
+    answers_file = project_dir / answers_file_rel
+    if not answers_file.is_file():
+        return None
+
+    git_dir_result = _git(["rev-parse", "--absolute-git-dir"], cwd=project_dir)
+    if git_dir_result.returncode != 0:
+        return None
+    git_dir = Path(git_dir_result.stdout.strip())
+
+    meta_result = _git(["cat-file", "blob", f"{ref}:{META_FILE_NAME}"], git_dir=git_dir)
+    if meta_result.returncode != 0:
+        return None
+
+    meta = json.loads(meta_result.stdout)
+    if meta.get("key") != key:
+        return None
+
+    objects_result = _git(
+        [
+            "rev-parse",
+            f"{ref}:{FILES_TREE_NAME}",
+            f"{ref}:{FILES_TREE_NAME}/{answers_file_rel.as_posix()}",
+        ],
+        git_dir=git_dir,
+    )
+    if objects_result.returncode != 0:
+        return None
+    tree, answers_blob = objects_result.stdout.split()
+
+    hash_result = _git(["hash-object", "--", str(answers_file_rel)], cwd=project_dir)
+    if hash_result.returncode != 0 or hash_result.stdout.strip() != answers_blob:
+        return None
+
+    return RenderedSnapshot(
+        git_dir=git_dir,
+        tree=tree,
+        commit=meta["commit"],
+        version=meta["version"],
+        config=meta["config"],
+    )
+
+
+def restore(snapshot: RenderedSnapshot, dest: Path) -> None:
+    """Write the files of ``snapshot`` into ``dest``."""
+    dest.mkdir(parents=True, exist_ok=True)
+
+    with TemporaryDirectory(prefix="nava-platform-snapshot.") as tmp:
+        env = os.environ | {"GIT_INDEX_FILE": str(Path(tmp) / "index")}
+        for args in (["read-tree", snapshot.tree], ["checkout-index", "--all", "--force"]):
+            _git(args, git_dir=snapshot.git_dir, cwd=dest, env=env).check_returncode()
+
+
+def files(snapshot: RenderedSnapshot) -> list[RelativePath]:
+    """The paths of the files in ``snapshot``, relative to where it was rendered."""
+    result = _git(["ls-tree", "-r", "-z", "--name-only", snapshot.tree], git_dir=snapshot.git_dir)
+    result.check_returncode()
+    return [Path(path) for path in result.stdout.split("\0") if path]
+
+
+def record(
+    project_dir: Path,
+    ref: str,
+    rendered_dir: Path,
+    *,
+    key: str,
+    commit: str,
+    version: str,
+    config: dict[str, Any],
+    extra_files: tuple[Path, list[str]] | None = None,
+) -> None:
+    """Save the files in ``rendered_dir`` as the snapshot at ``ref``.
+
+    Args:
+        project_dir: The project the render is for.
+        ref: Where to save the snapshot, see `ref_name()`.
+        rendered_dir: What was rendered, with nothing else in it.
+        key: The `render_key()` of the options it was rendered with.
+        commit: The template version rendered, as saved in the answers file.
+        version: The PEP 440 version of ``commit``.
+        config: The raw configuration of the template, must be JSON
+            serializable.
+        extra_files: A directory and files in it, relative to it, to include
+            as if they were in ``rendered_dir``.
+    """
+    meta = json.dumps(
+        {"key": key, "commit": commit, "version": version, "config": config}, indent=2
+    )
+    git_dir = Path(
+        _git(["rev-parse", "--absolute-git-dir"], cwd=project_dir, check=True).stdout.strip()
+    )
+
+    with TemporaryDirectory(prefix="nava-platform-snapshot.") as tmp:
+        env = os.environ | {"GIT_INDEX_FILE": str(Path(tmp) / "index")}
+        _git(["add", "--all", "."], git_dir=git_dir, cwd=rendered_dir, env=env, check=True)
+
+        if extra_files and extra_files[1]:
+            extra_dir, paths = extra_files
+            _git(
+                ["update-index", "--add", "-z", "--stdin"],
+                git_dir=git_dir,
+                cwd=extra_dir,
+                env=env,
+                input="\0".join(paths) + "\0",
+                check=True,
+            )
+
+        files_tree = _git(["write-tree"], git_dir=git_dir, env=env, check=True).stdout.strip()
+
+    meta_blob = _git(
+        ["hash-object", "-w", "--stdin"], git_dir=git_dir, input=meta + "\n", check=True
+    ).stdout.strip()
+
+    tree = _git(
+        ["mktree"],
+        git_dir=git_dir,
+        input=(
+            f"040000 tree {files_tree}\t{FILES_TREE_NAME}\n"
+            f"100644 blob {meta_blob}\t{META_FILE_NAME}\n"
+        ),
+        check=True,
+    ).stdout.strip()
+
+    _git(["update-ref", ref, tree], git_dir=git_dir, check=True)
+
+
+def delete(project_dir: Path, ref: str) -> None:
+    """Remove the snapshot at ``ref``, if there is one."""
+    _git(["update-ref", "-d", ref], cwd=project_dir)
+
+
+def _git(
+    args: list[str],
+    *,
+    git_dir: Path | None = None,
+    cwd: Path | None = None,
+    env: dict[str, str] | None = None,
+    input: str | None = None,
+    check: bool = False,
+) -> subprocess.CompletedProcess[str]:
+    # the work tree is wherever the command runs, not the project's
+    git_args = ["--git-dir", str(git_dir), "--work-tree", "."] if git_dir else []
+    result = run_text(["git", *git_args, *args], cwd=cwd, env=env, input=input)
+
+    if check:
+        result.check_returncode()
+
+    return result
@@ -0,0 +1,208 @@
+"""Matching of template paths against ``src_exclude`` patterns.
+
+See `nava.platform.copier_worker.NavaWorker` for where the exclusions are
+applied during rendering. They are also used to only check out the parts of a
+template repo that could be rendered, see `sparse_checkout_patterns()`.
+"""
+
+import fnmatch
+import functools
+import re
+from collections.abc import Iterable, Sequence
+from pathlib import Path, PurePosixPath
+from unicodedata import normalize
+
+from pathspec.pattern import RegexPattern
+from pathspec.util import lookup_pattern, normalize_file
+
+# a path nobody would write a pattern for, if a pattern matches it under a
+# directory, it matches everything under it
+_ANY_CHILD = "\x00\x01/\x02\x03"
+
+
+class SrcExcludeMatcher:
+    """``src_exclude`` patterns compiled for repeated matching.
+
+    Matches like ``copier.Worker._path_matcher`` (i.e., `pathspec` with
+    gitignore semantics, the last matching pattern wins), but with all the
+    patterns combined into a single regex, so a path is checked in one go
+    rather than against every pattern in turn.
+
+    Use `src_exclude_matcher()` to get one, which caches them by patterns.
+    """
+
+    def __init__(self, patterns: Iterable[str]):
+        self.patterns = tuple(patterns)
+
+        pattern_factory = lookup_pattern("gitwildmatch")
+        self._rules: list[tuple[str, bool, re.Pattern[str]]] = []
+        for raw in self.patterns:
+            pattern = pattern_factory(normalize("NFD", raw))
+            if isinstance(pattern, RegexPattern) and pattern.include is not None:
+                assert pattern.regex is not None
+                self._rules.append((raw.strip(), pattern.include, pattern.regex))
+
+        # alternatives are tried in order, so putting the last rule first
+        # makes the first match the one that wins
+        alternatives = [
+            f"(?P<r{i}>{_strip_group_names(regex.pattern)})"
+            for i, (_, _, regex) in reversed(list(enumerate(self._rules)))
+        ]
+        self._regex = re.compile("|".join(alternatives)) if alternatives else None
+        self._dir_cache: dict[str, bool] = {}
+
+    def __call__(self, path: Path | str) -> bool:
+        """Check if ``path`` is excluded."""
+        if self._regex is None:
+            return False
+
+        match = self._regex.match(normalize_file(path))
+        if match is None or match.lastgroup is None:
+            return False
+
+        return self._rules[int(match.lastgroup[1:])][1]
+
+    def is_dir_excluded(self, path: Path | str) -> bool:
+        """Check if everything under directory ``path`` is excluded.
+
+        This errs on the side of `False`, any rule after the one excluding the
+        directory that could include something under it, counts.
+        """
+        dir_path = normalize_file(path)
+        if dir_path not in self._dir_cache:
+            self._dir_cache[dir_path] = self._is_dir_excluded(dir_path)
+
+        return self._dir_cache[dir_path]
+
+    def _is_dir_excluded(self, dir_path: str) -> bool:
+        probe = f"{dir_path}/{_ANY_CHILD}"
+
+        for i in reversed(range(len(self._rules))):
+            _, excludes, regex = self._rules[i]
+            if excludes and regex.match(probe):
+                return not any(
+                    _could_match_under(rule_raw, dir_path)
+                    for rule_raw, rule_excludes, _ in self._rules[i + 1 :]
+                    if not rule_excludes
+                )
+
+        return False
+
+
+def _strip_group_names(pattern: str) -> str:
+    # `pathspec` names groups the same in every pattern
+    return re.sub(r"\(\?P<\w+>", "(?:", pattern)
+
+
+def _could_match_under(pattern: str, dir_path: str) -> bool:
+    """Could the (negated) gitignore ``pattern`` match any path under ``dir_path``."""
+    pattern = pattern.removeprefix("!")
+
+    # patterns without a slash (other than a trailing one) match at any depth
+    if "/" not in pattern.rstrip("/") or pattern.startswith("**/"):
+        return True
+
+    segments = pattern.strip("/").split("/")
+    for i, dir_segment in enumerate(dir_path.split("/")):
+        if i >= len(segments):
+            # the pattern matches a parent of the directory
+            return True
+
+        segment = segments[i]
+        # assume anything more complicated could match
+        if "**" in segment or "[" in segment or "\\" in segment:
+            return True
+
+        if not fnmatch.fnmatchcase(dir_segment, segment):
+            return False
+
+    return True
+
+
+@functools.cache
+def _compile(patterns: tuple[str, ...]) -> SrcExcludeMatcher:
+    return SrcExcludeMatcher(patterns)
+
+
+def src_exclude_matcher(patterns: Iterable[str]) -> SrcExcludeMatcher:
+    """Get the (shared) compiled matcher for ``patterns``."""
+    return _compile(tuple(patterns))
+
+
+def sparse_checkout_patterns(
+    paths: Iterable[str], src_exclude: Sequence[str], subdirectory: str = ""
+) -> list[str]:
+    """Git (non-cone mode) sparse-checkout patterns for the files to keep.
+
+    Rather than try to translate the exclusion patterns, whose semantics
+    around directories differ between `pathspec` and git, the patterns list
+    the kept files explicitly, collapsed into their directories where every
+    file in a directory is kept.
+
+    Args:
+        paths: All files in the repo, relative to its root.
+        src_exclude: Exclusions, relative to ``subdirectory``.
+        subdirectory: Where the template lives in the repo, files outside of it
+            are always kept.
+    """
+    is_excluded = src_exclude_matcher(src_exclude)
+    subdirectory = PurePosixPath(subdirectory).as_posix().lstrip("/")
+    if subdirectory == ".":
+        subdirectory = ""
+
+    def is_kept(path: str) -> bool:
+        if subdirectory:
+            if not path.startswith(subdirectory + "/"):
+                return True
+            path = path.removeprefix(subdirectory + "/")
+
+        return not is_excluded(Path(path))
+
+    tree: _Tree = {}
+    for path in paths:
+        node = tree
+        *dir_names, file_name = path.split("/")
+        for dir_name in dir_names:
+            node = node.setdefault(dir_name, {})  # type: ignore[assignment]
+        node[file_name] = is_kept(path)
+
+    patterns: list[str] = []
+    if _collect_patterns(tree, "", patterns):
+        return ["/*"]
+
+    return sorted(patterns)
+
+
+_Tree = dict[str, "_Tree | bool"]
+
+
+def _collect_patterns(tree: _Tree, prefix: str, patterns: list[str]) -> bool:
+    """Add patterns for the kept files of ``tree``, returning if everything is kept.
+
+    Patterns for a fully kept tree are left to the caller, so they can be
+    collapsed into one for the whole directory.
+    """
+    results: list[tuple[str, bool, bool]] = []
+    for name, node in sorted(tree.items()):
+        path = f"{prefix}/{name}"
+        if isinstance(node, dict):
+            sub_patterns: list[str] = []
+            all_kept = _collect_patterns(node, path, sub_patterns)
+            results.append((path + "/", all_kept, True))
+            if not all_kept:
+                patterns.extend(sub_patterns)
+        else:
+            results.append((path, node, False))
+
+    if all(kept for _, kept, _ in results):
+        return True
+
+    patterns.extend(_escape(path) for path, kept, _ in results if kept)
+    return False
+
+
+def _escape(path: str) -> str:
+    for char in ("\\", "*", "?", "[", "!", "#"):
+        path = path.replace(char, "\\" + char)
+
+    return path
@@ -2,10 +2,8 @@ import contextlib
 import re
 from dataclasses import dataclass
 from pathlib import Path
-from typing import cast
 
 import dunamai
-import yaml
 from packaging.version import Version
 
 from nava.platform.projects.project import Project
@@ -93,18 +91,7 @@ def get_template_version_from_answers(
 def get_answers(
     project: Project, app_name: str, template_name: TemplateName
 ) -> dict[str, str] | None:
-    answers_file = project.dir / answers_file_rel(template_name, app_name)
-
-    if not answers_file.exists():
-        return None
-
-    return read_answers_file(answers_file)
-
-
-def read_answers_file(answers_file: Path) -> dict[str, str]:
-    answers = yaml.safe_load(answers_file.read_text())
-
-    return cast(dict[str, str], answers)
+    return project.state.answers(answers_file_rel(template_name, app_name))
 
 
 def get_version_from_git_describe(v: str) -> Version:
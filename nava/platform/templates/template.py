@@ -1,16 +1,23 @@
 import dataclasses
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Literal, Self
 
-import copier.vcs
-from copier.template import Template as CopierTemplate
 from packaging.version import Version
 
 from nava.platform.cli.context import CliContext
-from nava.platform.copier_worker import run_copy, run_update
+from nava.platform.copier_worker import (
+    ChangeManifest,
+    NavaTemplate,
+    NavaWorker,
+    run_copy,
+    run_update,
+)
 from nava.platform.get_template_name_from_uri import get_template_name_from_uri
 from nava.platform.projects.project import Project
+from nava.platform.templates import rendered_snapshots
 from nava.platform.templates.errors import MergeConflictsDuringUpdateError
+from nava.platform.templates.remote_tags import template_tags
 from nava.platform.templates.state import (
     TemplateVersionAnswer,
     answers_file_rel,
@@ -20,11 +27,22 @@ from nava.platform.templates.state import (
 )
 from nava.platform.templates.template_name import TemplateName
 from nava.platform.types import RelativePath
-from nava.platform.util import git, wrappers
+from nava.platform.util import wrappers
+from nava.platform.util.git import GitProject
+from nava.platform.util.git_tags import latest_tag
 
 BASE_SRC_EXCLUDE = ["*template-only*"]
 
 
+@dataclass
+class VersionCheck:
+    current: TemplateVersionAnswer
+    target: str | None
+    """What would be installed, `None` if not known."""
+    up_to_date: bool | None
+    """`None` if it couldn't be worked out."""
+
+
 class Template:
     """A collection of templated files and things to do with them.
 
@@ -37,8 +55,9 @@ class Template:
     template_uri: Path | str
     template_name: TemplateName
     src_excludes: list[str]
-    copier_template: CopierTemplate
+    copier_template: NavaTemplate
     ref: str | None
+    jobs: int
 
     def __init__(
         self,
@@ -48,9 +67,12 @@ class Template:
         *,
         template_name: TemplateName | str | None = None,
         ref: str | None = None,
+        jobs: int = 1,
     ):
         self.ctx = ctx
         self.template_uri = template_uri
+        # number of files to render in parallel
+        self.jobs = jobs
 
         if template_name is None:
             self.template_name = TemplateName.parse(get_template_name_from_uri(template_uri))
@@ -62,7 +84,9 @@ class Template:
         else:
             self.src_excludes = BASE_SRC_EXCLUDE + (src_excludes or [])
 
-        self.copier_template = CopierTemplate(url=str(template_uri), ref=ref)
+        self.copier_template = NavaTemplate(
+            url=str(template_uri), ref=ref, src_exclude=tuple(self.src_excludes)
+        )
 
         self._run_copy = wrappers.log_call(run_copy, logger=ctx.log.info)
         self._run_update = wrappers.log_call(run_update, logger=ctx.log.info)
@@ -75,6 +99,8 @@ class Template:
         app_name: str,
         template_name: TemplateName | str,
         src_excludes: list[str] | None = None,
+        *,
+        jobs: int = 1,
     ) -> Self:
         template_uri = get_template_uri_for_existing_app(
             project, app_name=app_name, template_name=TemplateName.parse(template_name)
@@ -86,7 +112,11 @@ class Template:
             )
 
         return cls(
-            ctx, template_uri=template_uri, template_name=template_name, src_excludes=src_excludes
+            ctx,
+            template_uri=template_uri,
+            template_name=template_name,
+            src_excludes=src_excludes,
+            jobs=jobs,
         )
 
     def install(
@@ -97,7 +127,7 @@ class Template:
         version: str | None = None,
         data: dict[str, str] | None = None,
         commit: bool = False,
-    ) -> None:
+    ) -> ChangeManifest:
         data = (data or {}) | {
             "app_name": app_name,
             "template": self.template_name.template_name,
@@ -106,17 +136,22 @@ class Template:
 
         self._checkout_copier_ref(version)
 
-        self._run_copy(
+        worker = self._run_copy(
             src_path=str(self.template_uri),
             dst_path=project.dir,
             answers_file=self.answers_file_rel(app_name),
             data=data,
             src_exclude=self.src_excludes,
             vcs_ref=version,
+            jobs=self.jobs,
+            rendered_ref=self._rendered_ref(project, app_name),
         )
+        self._log_render_stats(worker)
 
         if commit:
-            self._commit_action(project, "install", app_name)
+            self._commit_action(project, "install", app_name, manifest=worker.manifest)
+
+        return worker.manifest
 
     def update(
         self,
@@ -128,7 +163,7 @@ class Template:
         commit: bool = False,
         answers_only: bool = False,
         force: bool = False,
-    ) -> None:
+    ) -> ChangeManifest:
         # save the data as provided for later usage
         passed_data = data
 
@@ -163,20 +198,28 @@ class Template:
 
             version = existing_version.answer_value
 
-        self._checkout_copier_ref(version)
-
         # if we are already running the version that would be installed, then
-        # skip, unless overridden
+        # skip, unless overridden, ideally before having to check out the
+        # template at all
         bypass_same_version_check = force or (answers_only and passed_data)
+        if (
+            not bypass_same_version_check
+            and self._check_version_from_tags(existing_version, version).up_to_date
+        ):
+            self.ctx.console.print(f"Already up to date ({existing_version.display_str})")
+            return ChangeManifest()
+
+        self._checkout_copier_ref(version)
+
         if not bypass_same_version_check and self._is_same_version(existing_version):
             self.ctx.console.print(f"Already up to date ({existing_version.display_str})")
-            return
+            return ChangeManifest()
 
         self.ctx.console.print(f"Current template version: {existing_version.display_str}")
 
         update_func = self._run_update if not force else self._run_copy
 
-        update_func(
+        worker = update_func(
             dst_path=project.dir,
             # note `src_path` currently has no effect on updates, the path from
             # answers file is used
@@ -189,10 +232,29 @@ class Template:
             overwrite=True,
             skip_answered=True,
             vcs_ref=version,
+            jobs=self.jobs,
+            rendered_ref=self._rendered_ref(project, app_name),
         )
+        self._log_render_stats(worker)
 
         if commit:
-            self._commit_action(project, "update", app_name)
+            self._commit_action(project, "update", app_name, manifest=worker.manifest)
+
+        return worker.manifest
+
+    def _log_render_stats(self, worker: NavaWorker) -> None:
+        self.ctx.log.info(
+            "Rendered template files",
+            written=len(worker.files_written),
+            skipped=len(worker.files_skipped),
+        )
+
+    def _rendered_ref(self, project: Project, app_name: str) -> str | None:
+        """Where to keep what's rendered for ``app_name``, see `rendered_snapshots`."""
+        if not project.git.is_git():
+            return None
+
+        return rendered_snapshots.ref_name(self.answers_file_rel(app_name))
 
     def project_state_dir_rel(self) -> RelativePath:
         return project_state_dir_rel(self.template_name)
@@ -201,19 +263,24 @@ class Template:
         return answers_file_rel(template_name=self.template_name, app_name=app_name)
 
     def _check_answers_file(self, project: Project, app_name: str) -> bool:
-        answers_file = project.dir / self.answers_file_rel(app_name)
-        if not answers_file.exists():
+        if not project.state.has_answers(self.answers_file_rel(app_name)):
+            answers_file = project.dir / self.answers_file_rel(app_name)
             raise ValueError(f"Answers file does not exist: {answers_file}")
 
         return True
 
     def _commit_action(
-        self, project: Project, action: Literal["install", "update"], app_name: str
+        self,
+        project: Project,
+        action: Literal["install", "update"],
+        app_name: str,
+        *,
+        manifest: ChangeManifest | None = None,
     ) -> None:
         msg = self._commit_action_msg(action, app_name)
 
         if project.git.is_git():
-            self._commit_project(project, msg)
+            self._commit_project(project, msg, manifest=manifest)
         else:
             from rich.markdown import Markdown
 
@@ -241,15 +308,31 @@ class Template:
         return msg
 
     # TODO: move to Project?
-    def _commit_project(self, project: Project, msg: str) -> None:
-        if project.git.has_merge_conflicts():
+    def _commit_project(
+        self, project: Project, msg: str, *, manifest: ChangeManifest | None = None
+    ) -> None:
+        """Commit the changes to the project.
+
+        Args:
+            project: What to commit in.
+            msg: The commit message.
+            manifest: What was changed, to limit things to, rather than the
+                whole repo. Ignored if it's not complete.
+        """
+        paths = manifest.paths if manifest and manifest.complete else None
+        status = project.git.status(paths)
+
+        if project.git.has_merge_conflicts(status):
             raise MergeConflictsDuringUpdateError(commit_msg=msg)
 
-        if project.git.is_clean():
+        if status.is_clean:
             self.ctx.console.print("Nothing to commit.")
             return
 
-        result = project.git.commit_all(msg)
+        if paths is None:
+            result = project.git.commit_all(msg)
+        else:
+            result = project.git.commit_paths(msg, paths)
 
         if result.returncode != 0:
             self.ctx.console.error.print(result.stderr or result.stdout)
@@ -268,56 +351,12 @@ class Template:
         if self.copier_template.vcs != "git":
             return None
 
-        prev_template = self.copier_template
-
         # CopierTemplate caches a lot of info on first access, most of which is
         # dependant on what version is requested, so create a new copy that will
-        # pickup any changes
+        # pickup any changes, the actual checkout for the version is shared
+        # through `TemplateCheckouts` so this doesn't re-fetch remote repos
         self.copier_template = dataclasses.replace(self.copier_template, ref=ref)
 
-        # but if there was an existing checkout, point the updated copy at the
-        # existing temp checkout so it doesn't have to re-fetch remote repos
-        if prev_template._temp_clone is not None:
-            self.copier_template.__dict__["local_abspath"] = prev_template.local_abspath
-
-            copier_git = git.GitProject(self.copier_template.local_abspath)
-
-            # TODO: do a fetch origin first?
-
-            # might want to more closely mirror upstream behavior and support submodules:
-            # https://github.com/copier-org/copier/blob/2dc1687af389505a708f25b0bc4e37af56179e99/copier/vcs.py#L216
-            if ref is None:
-                copier.vcs.checkout_latest_tag(copier_git.dir, use_prereleases=False)
-            elif ref == "HEAD":
-                copier_git.checkout("origin/HEAD")
-            else:
-                copier_git.checkout(ref)
-
-            # remove any dirty changes copier might have previously committed as
-            # draft if not using HEAD
-            if ref not in (None, "HEAD"):
-                # we could just
-                #
-                #   copier_git.reset("--hard", f"origin/{ref}")
-                #
-                # but that's only if `ref` is a tag/branch name and not
-                # something else and maybe safer to be a bit more targeted, so
-                # we'll look for if the latest commit is the expected "dirty
-                # commit" and remove it
-
-                # x09 is the hex code for tab
-                last_commit_parts = copier_git.log("-1", "--pretty=%an%x09%ae%x09%s").stdout
-                [author_name, author_email, commit_subject] = map(
-                    lambda s: s.strip(), last_commit_parts.split("\t")
-                )
-
-                if (
-                    author_name == copier.vcs.GIT_USER_NAME
-                    and author_email == copier.vcs.GIT_USER_EMAIL
-                    and commit_subject == "Copier automated commit for draft changes"
-                ):
-                    copier_git.reset("--hard", "HEAD~1")
-
         return None
 
     @property
@@ -333,6 +372,87 @@ class Template:
     def commit_hash(self) -> str | None:
         return self.copier_template.commit_hash
 
+    def check_version(
+        self, project: Project, app_name: str, *, version: str | None = None, checkout: bool = True
+    ) -> VersionCheck:
+        """Check if ``app_name`` is on ``version`` (the latest by default) of the template.
+
+        This is worked out from the tags of the template if possible, without
+        checking it out.
+
+        Args:
+            project: Where the app is.
+            app_name: Which app to check.
+            version: What to compare against, like in `update()`.
+            checkout: If the tags aren't enough to tell, check out the
+                template to find out for sure. Otherwise, the result could be
+                unknown.
+        """
+        existing_version = get_template_version_for_existing_app(
+            project, app_name, self.template_name
+        )
+
+        if not existing_version:
+            raise ValueError(
+                "Can not find existing version in answers file (or issue reading the file)"
+            )
+
+        check = self._check_version_from_tags(existing_version, version)
+        if check.up_to_date is None and checkout:
+            self._checkout_copier_ref(version)
+            check = VersionCheck(
+                current=existing_version,
+                target=self.commit,
+                up_to_date=self._is_same_version(existing_version),
+            )
+
+        return check
+
+    def _check_version_from_tags(
+        self, existing_version: TemplateVersionAnswer, version: str | None
+    ) -> VersionCheck:
+        unknown = VersionCheck(current=existing_version, target=None, up_to_date=None)
+
+        if self.copier_template.vcs != "git":
+            return unknown
+
+        # uncommitted changes in a local template get included in what is
+        # rendered, the tags say nothing about that
+        local_path = Path(self.template_uri).expanduser()
+        if (
+            version in (None, "HEAD")
+            and local_path.exists()
+            and not GitProject(local_path).is_clean()
+        ):
+            return unknown
+
+        tags = template_tags(str(self.template_uri))
+        if tags is None:
+            return unknown
+
+        target = version
+        if version is None:
+            target = latest_tag(tags, use_prereleases=self.copier_template.use_prereleases)
+
+        target_tag = next((tag for tag in tags if tag.name == target), None)
+        if target is None or target_tag is None:
+            return unknown
+
+        # Copier saves the `git describe` of the checkout, which for a tagged
+        # commit is the tag, though not necessarily this one, if there are
+        # several on the commit
+        if existing_version.answer_value == target:
+            return VersionCheck(current=existing_version, target=target, up_to_date=True)
+
+        if (
+            existing_version.version is not None
+            and target_tag.version is not None
+            and existing_version.version < target_tag.version
+        ):
+            return VersionCheck(current=existing_version, target=target, up_to_date=False)
+
+        return VersionCheck(current=existing_version, target=target, up_to_date=None)
+
     def _is_same_version(self, version_obj: TemplateVersionAnswer) -> bool:
         commit = self.commit
         if commit is None:
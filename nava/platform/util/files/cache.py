@@ -0,0 +1,92 @@
+"""Helpers for size-bounded, least recently used, on-disk caches."""
+
+import fcntl
+import os
+import shutil
+from collections.abc import Generator, Iterable
+from contextlib import contextmanager
+from pathlib import Path
+
+LAST_USED_FILE_NAME = ".nava-last-used"
+
+
+def dir_size(path: Path) -> int:
+    """Total size in bytes of the files under ``path``."""
+    total = 0
+    for dir_path, _, file_names in os.walk(path):
+        for file_name in file_names:
+            try:
+                total += os.lstat(os.path.join(dir_path, file_name)).st_size
+            except FileNotFoundError:
+                continue
+
+    return total
+
+
+def mark_used(entry: Path) -> None:
+    """Record that a cache entry was just used."""
+    if entry.is_dir():
+        (entry / LAST_USED_FILE_NAME).touch()
+    else:
+        entry.touch()
+
+
+def last_used(entry: Path) -> float:
+    """When a cache entry was last used (as a timestamp), 0 if unknown."""
+    marker = entry / LAST_USED_FILE_NAME if entry.is_dir() else entry
+
+    try:
+        return marker.stat().st_mtime
+    except FileNotFoundError:
+        return 0
+
+
+@contextmanager
+def file_lock(lock_file: Path) -> Generator[None, None, None]:
+    """Hold an exclusive (advisory) lock on ``lock_file`` for the duration.
+
+    Used to keep concurrent processes from stepping on each other when
+    populating the same cache entry.
+    """
+    lock_file.parent.mkdir(parents=True, exist_ok=True)
+    with open(lock_file, "a") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def prune_lru(
+    entries: Iterable[Path], max_size_bytes: int, *, keep: Iterable[Path] = ()
+) -> list[Path]:
+    """Remove the least recently used entries until under ``max_size_bytes``.
+
+    Entries in ``keep`` are counted towards the total size, but never removed.
+
+    Returns:
+        The entries that were removed.
+    """
+    keep = {Path(k) for k in keep}
+    sized_entries = [
+        (entry, dir_size(entry) if entry.is_dir() else entry.stat().st_size) for entry in entries
+    ]
+    total = sum(size for _, size in sized_entries)
+
+    removed = []
+    for entry, size in sorted(sized_entries, key=lambda e: last_used(e[0])):
+        if total <= max_size_bytes:
+            break
+
+        if entry in keep:
+            continue
+
+        if entry.is_dir():
+            shutil.rmtree(entry, ignore_errors=True)
+        else:
+            entry.unlink(missing_ok=True)
+
+        total -= size
+        removed.append(entry)
+
+    return removed
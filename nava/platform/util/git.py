@@ -1,18 +1,91 @@
+import os
+import re
+import shutil
 import subprocess
-from collections.abc import Generator
+from collections.abc import Callable, Generator, Iterable
 from contextlib import contextmanager
+from enum import Enum, auto
+from functools import wraps
 from pathlib import Path
 from tempfile import TemporaryDirectory
-from typing import Any, Self
+from typing import Any, Self, TypeVar, cast
 
 # TODO: reimplment get_repo functionality here and also consider additionally
 # supporting slightly clearer `github:` prefix
 from copier.vcs import get_repo
 
+from nava.platform.util.git_plumbing import (
+    STATUS_ARGS,
+    GitCatFile,
+    GitStatus,
+    parse_status,
+    ref_state,
+)
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# hooks `git commit` runs, which plumbing doesn't
+COMMIT_HOOKS = ("pre-commit", "prepare-commit-msg", "commit-msg", "post-commit")
+
+# a pathspec that only excludes, excludes from everything
+MATCH_NOTHING_PATHSPEC = ":(top,exclude)*"
+
+CONFLICT_MARKER_SUFFIX = ": leftover conflict marker"
+
+WHITESPACE_CHECKS_OFF = "core.whitespace=-trailing-space,-space-before-tab,-indent-with-non-tab,-tab-in-indent,-cr-at-eol"
+
+
+def memoized_on_refs(func: F) -> F:
+    """Cache the result of a read-only query until the refs of the repo change."""
+
+    @wraps(func)
+    def wrapper(self: "GitProject", *args: Any, **kwargs: Any) -> Any:
+        state = self.ref_state()
+        if state is None:
+            return func(self, *args, **kwargs)
+
+        key = (func.__name__, args, tuple(sorted(kwargs.items())))
+        if (cached := self._memo.get(key)) is not None and cached[0] == state:
+            return cached[1]
+
+        result = func(self, *args, **kwargs)
+        self._memo[key] = (state, result)
+        return result
+
+    return cast(F, wrapper)
+
+
+def mutates(func: F) -> F:
+    """Drop any cached query results after running the operation."""
+
+    @wraps(func)
+    def wrapper(self: "GitProject", *args: Any, **kwargs: Any) -> Any:
+        try:
+            return func(self, *args, **kwargs)
+        finally:
+            self.invalidate()
+
+    return cast(F, wrapper)
+
 
 class GitProject:
+    """Interface to a git repo.
+
+    Read-only queries that only depend on the refs of the repo (tags, commit
+    descriptions, etc.) are cached until the refs change, either through the
+    mutating methods here or by something else (see `ref_state()`). Object
+    lookups go through long-lived ``git cat-file`` processes (see
+    `GitCatFile`) and the working tree state is collected with a single
+    ``git status`` (see `status()`).
+    """
+
     def __init__(self, dir: Path):
         self.dir = Path(dir)
+        self._memo: dict[Any, tuple[Any, Any]] = {}
+        self._git_dirs: tuple[Path, Path] | None = None
+        self._is_git = False
+        self._cat_file: GitCatFile | None = None
+        self._needs_porcelain: bool | None = None
 
     @classmethod
     def from_existing(cls, dir: Path) -> Self | None:
@@ -27,20 +100,23 @@ class GitProject:
         """Construct an instance, cloning given repo first if necessary.
 
         If ``repo_uri`` is remote, it will be cloned to a temporary directory
-        that this removed on exit of the context.
+        that this removed on exit of the context. The clone is made from a
+        locally cached mirror of the repo, see `GitMirrorCache`.
 
         If ``repo_uri`` is a local path, it is not deleted on exit.
         """
         if Path(repo_uri).exists():
             yield cls(Path(repo_uri))
         else:
+            from nava.platform.util.git_mirror import default_mirror_cache
+
             with TemporaryDirectory() as dir:
                 dir_path = Path(dir)
                 resolved_repo_uri = get_repo(repo_uri)
                 if not resolved_repo_uri:
                     raise ValueError(f"Don't understand {repo_uri}")
 
-                clone_result = clone_to(resolved_repo_uri, dir_path)
+                clone_result = default_mirror_cache().clone_to(resolved_repo_uri, dir_path)
                 clone_result.check_returncode()
 
                 yield cls(dir_path)
@@ -48,35 +124,121 @@ class GitProject:
     def _run_cmd(self, *args: Any, **kwargs: Any) -> subprocess.CompletedProcess[str]:
         return run_text(*args, **kwargs, cwd=self.dir)
 
-    def has_merge_conflicts(self) -> bool:
+    @property
+    def cat_file(self) -> GitCatFile:
+        if self._cat_file is None:
+            self._cat_file = GitCatFile(self.dir)
+
+        return self._cat_file
+
+    def close(self) -> None:
+        """Stop any long-lived git processes for the repo."""
+        if self._cat_file is not None:
+            self._cat_file.close()
+            self._cat_file = None
+
+    def invalidate(self) -> None:
+        """Forget any cached query results."""
+        self._memo.clear()
+
+    def ref_state(self) -> tuple[int, ...] | None:
+        """Fingerprint of the current refs in the repo, `None` if not a repo."""
+        git_dirs = self.git_dirs()
+        if git_dirs is None:
+            return None
+
+        return ref_state(*git_dirs)
+
+    def git_dirs(self) -> tuple[Path, Path] | None:
+        """The git dir and common git dir of the repo, `None` if not a repo."""
+        if self._git_dirs is None:
+            result = self._run_cmd(["git", "rev-parse", "--absolute-git-dir", "--git-common-dir"])
+            if result.returncode != 0:
+                return None
+
+            git_dir, common_dir = result.stdout.splitlines()
+            self._git_dirs = (Path(git_dir), (self.dir / common_dir).resolve())
+
+        return self._git_dirs
+
+    def status(self, paths: Iterable[str | Path] | None = None) -> GitStatus:
+        """Get the state of HEAD, the index and the working tree in one go.
+
+        Args:
+            paths: Only look at these paths (relative to `dir`), rather than
+                the whole repo. An empty list matches nothing.
+        """
+        pathspecs = []
+        if paths is not None:
+            pathspecs = [f":(literal){path}" for path in paths] or [MATCH_NOTHING_PATHSPEC]
+
+        result = self._run_cmd(["git", *STATUS_ARGS, "--", *pathspecs])
+        return parse_status(result.stdout)
+
+    def has_merge_conflicts(self, status: GitStatus | None = None) -> bool:
+        """Check for conflict markers in changed files.
+
+        Args:
+            status: A recent `status()`, to avoid running it again.
+        """
+        return bool(self.merge_conflict_paths(status))
+
+    def merge_conflict_paths(self, status: GitStatus | None = None) -> list[str]:
+        """Changed files with conflict markers in them, relative to the top of the repo.
+
+        Args:
+            status: A recent `status()`, to avoid running it again.
+        """
+        status = status or self.status()
+
+        changed = status.changed + status.unmerged
+        if not changed:
+            return []
+
         result = self._run_cmd(
             [
                 "git",
                 "-c",
-                "core.whitespace=-trailing-space,-space-before-tab,-indent-with-non-tab,-tab-in-indent,-cr-at-eol",
+                WHITESPACE_CHECKS_OFF,
+                "-c",
+                "core.quotePath=false",
                 "diff",
                 "--check",
+                "--",
+                *_top_pathspecs(changed),
             ]
         )
-        return result.returncode != 0
+        # "<path>:<line>: leftover conflict marker", followed by the line itself
+        paths = [
+            line.removesuffix(CONFLICT_MARKER_SUFFIX).rsplit(":", 1)[0]
+            for line in result.stdout.splitlines()
+            if line.endswith(CONFLICT_MARKER_SUFFIX)
+        ]
+        return list(dict.fromkeys(paths))
 
     def is_clean(self) -> bool:
-        result = self._run_cmd(["git", "status", "--porcelain"])
-
-        return result.stdout.strip() == ""
+        return self.status().is_clean
 
     def is_git(self) -> bool:
-        return is_a_git_worktree(self.dir)
+        # once a repo, always a repo (for our purposes at least)
+        if not self._is_git:
+            self._is_git = is_a_git_worktree(self.dir)
 
+        return self._is_git
+
+    @mutates
     def init(self) -> None:
         self._run_cmd(["git", "init", "--initial-branch=main"])
+        self._git_dirs = None
 
+    @mutates
     def checkout(self, *args: str) -> subprocess.CompletedProcess[str]:
         return self._run_cmd(["git", "checkout", *list(args)])
 
     def add(self, *args: str) -> subprocess.CompletedProcess[str]:
         return self._run_cmd(["git", "add", *list(args)])
 
+    @mutates
     def commit(self, msg: str) -> subprocess.CompletedProcess[str]:
         return self._run_cmd(["git", "commit", "-m", msg])
 
@@ -87,34 +249,154 @@ class GitProject:
 
         return self.commit(msg)
 
+    def commit_paths(
+        self, msg: str, paths: Iterable[str | Path], *, run_hooks: bool | None = None
+    ) -> subprocess.CompletedProcess[str]:
+        """Stage the current state of ``paths`` (relative to `dir`) and commit.
+
+        Nothing else in the working tree is looked at, the paths are staged
+        with ``update-index`` (leaving out untracked paths the repo ignores,
+        like ``git add``) and, unless hooks need to run, the commit is
+        built with plumbing (``write-tree``, ``commit-tree``, ``update-ref``)
+        rather than ``git commit``.
+
+        Args:
+            msg: The commit message.
+            paths: What to stage, paths that don't exist are removed from the
+                index (if they were in it).
+            run_hooks: Make a regular ``git commit`` so the commit hooks run.
+                By default, only if the repo has any (or commits are to be
+                signed).
+        """
+        rel_paths = self._drop_ignored([str(path) for path in paths])
+        if rel_paths:
+            result = self._run_cmd(
+                ["git", "update-index", "--add", "--remove", "-z", "--stdin"],
+                input="\0".join(rel_paths) + "\0",
+            )
+            if result.returncode != 0:
+                return result
+
+        if run_hooks is None:
+            run_hooks = self._needs_porcelain_commit()
+
+        if run_hooks:
+            return self.commit(msg)
+
+        return self._commit_tree(msg)
+
+    def _drop_ignored(self, rel_paths: list[str]) -> list[str]:
+        """``rel_paths`` without untracked ones ignored by the repo, as ``git add`` would."""
+        if not rel_paths:
+            return rel_paths
+
+        # tracked paths are never reported, so they're still staged
+        result = self._run_cmd(
+            ["git", "check-ignore", "-z", "--stdin"], input="\0".join(rel_paths) + "\0"
+        )
+        if result.returncode != 0:
+            return rel_paths
+
+        ignored = set(result.stdout.split("\0"))
+        return [path for path in rel_paths if path not in ignored]
+
+    @mutates
+    def _commit_tree(self, msg: str) -> subprocess.CompletedProcess[str]:
+        result = self._run_cmd(["git", "write-tree"])
+        if result.returncode != 0:
+            return result
+        tree = result.stdout.strip()
+
+        parent = self.resolve_commit("HEAD")
+        parent_tree = self.cat_file.info(f"{parent}^{{tree}}") if parent else None
+        if parent_tree and parent_tree.oid == tree:
+            return subprocess.CompletedProcess(result.args, 1, "nothing to commit\n", "")
+
+        parent_args = ["-p", parent] if parent else []
+        result = self._run_cmd(["git", "commit-tree", tree, *parent_args, "-m", msg])
+        if result.returncode != 0:
+            return result
+        commit = result.stdout.strip()
+
+        subject = msg.splitlines()[0] if msg else ""
+        result = self._run_cmd(
+            ["git", "update-ref", "-m", f"commit: {subject}", "HEAD", commit, parent or ""]
+        )
+        if result.returncode != 0:
+            return result
+
+        branch = self._run_cmd(["git", "symbolic-ref", "--quiet", "--short", "HEAD"])
+        return subprocess.CompletedProcess(
+            result.args,
+            0,
+            f"[{branch.stdout.strip() or 'detached HEAD'} {commit[:7]}] {subject}\n",
+            "",
+        )
+
+    def _needs_porcelain_commit(self) -> bool:
+        """Whether commits need to go through ``git commit``, rather than plumbing."""
+        if self._needs_porcelain is None:
+            signing = self._run_cmd(["git", "config", "--type=bool", "--get", "commit.gpgSign"])
+            hooks = self._run_cmd(["git", "rev-parse", "--git-path", "hooks"])
+            hooks_dir = self.dir / hooks.stdout.strip()
+
+            self._needs_porcelain = signing.stdout.strip() == "true" or (
+                hooks.returncode == 0
+                and any(os.access(hooks_dir / hook, os.X_OK) for hook in COMMIT_HOOKS)
+            )
+
+        return self._needs_porcelain
+
+    @mutates
+    def cherry_pick(self, *args: str) -> subprocess.CompletedProcess[str]:
+        return self._run_cmd(["git", "cherry-pick", *list(args)])
+
+    def add_worktree(self, path: Path, commit: str) -> subprocess.CompletedProcess[str]:
+        """Check out ``commit`` (detached) in a new linked worktree at ``path``."""
+        return self._run_cmd(["git", "worktree", "add", "--quiet", "--detach", path, commit])
+
+    def remove_worktree(self, path: Path) -> subprocess.CompletedProcess[str]:
+        return self._run_cmd(["git", "worktree", "remove", "--force", path])
+
+    def show_prefix(self) -> str:
+        """Path of `dir` relative to the top of the worktree, "" if it is the top."""
+        return self._run_cmd(["git", "rev-parse", "--show-prefix"]).stdout.strip()
+
+    @memoized_on_refs
     def log(self, *args: str) -> subprocess.CompletedProcess[str]:
         return self._run_cmd(["git", "log", *list(args)])
 
+    @mutates
     def reset(self, *args: str) -> subprocess.CompletedProcess[str]:
         return self._run_cmd(["git", "reset", *list(args)])
 
+    @mutates
     def stash(self) -> None:
         self._run_cmd(["git", "stash"])
 
+    @mutates
     def pop(self) -> None:
         self._run_cmd(["git", "stash", "pop"])
 
+    @mutates
     def tag(self, tag: str) -> None:
         self._run_cmd(["git", "tag", tag])
 
+    @mutates
     def rename_branch(self, new_branch_name: str) -> None:
         self._run_cmd(["git", "branch", "-m", new_branch_name])
 
     def get_commit_hash_for_head(self) -> str | None:
-        result = self._run_cmd(["git", "rev-parse", "HEAD"])
+        # say you run this against an empty repo, HEAD won't point to anything
+        return self.resolve_commit("HEAD")
 
-        # say you run this against an empty repo, you'll get a return code of
-        # 128 and message "fatal: ambiguous argument 'HEAD': unknown revision or
-        # path not in the working tree."
-        if result.returncode != 0:
+    def resolve_commit(self, rev: str) -> str | None:
+        """Get the full hash of the commit ``rev`` points to, if any."""
+        info = self.cat_file.info(f"{rev}^{{commit}}")
+        if info is None:
             return None
 
-        return result.stdout.strip()
+        return info.oid
 
     def is_path_ignored(self, path: str) -> bool:
         result = self._run_cmd(["git", "check-ignore", "-q", path])
@@ -133,11 +415,23 @@ class GitProject:
         result = self._run_cmd(["git", "ls-files", "--exclude-standard", "--others"])
         return result.stdout.splitlines()
 
+    @memoized_on_refs
     def get_tags(self, *args: str) -> list[str]:
         result = self._run_cmd(["git", "tag", *list(args)])
         return result.stdout.splitlines()
 
     def get_closest_tag(self, commit_hash: str) -> str | None:
+        """Nearest tag containing the commit (i.e., ``git describe --contains``)."""
+        from nava.platform.util.git_describe import describe_index
+
+        index = describe_index(self)
+        if index.has_commit(commit_hash):
+            return index.closest_containing_tag(commit_hash, exclude=commit_hash)
+
+        return self._get_closest_tag_from_git(commit_hash)
+
+    @memoized_on_refs
+    def _get_closest_tag_from_git(self, commit_hash: str) -> str | None:
         result = self._run_cmd(
             ["git", "describe", "--exclude", commit_hash, "--contains", commit_hash]
         )
@@ -149,6 +443,16 @@ class GitProject:
         return first_tag
 
     def get_commit_description(self, commit_ish: str = "HEAD") -> str | None:
+        """Nearest tag preceding the commit (i.e., ``git describe --tags --always``)."""
+        from nava.platform.util.git_describe import describe_index
+
+        if description := describe_index(self).describe(commit_ish):
+            return str(description)
+
+        return self._get_commit_description_from_git(commit_ish)
+
+    @memoized_on_refs
+    def _get_commit_description_from_git(self, commit_ish: str) -> str | None:
         result = self._run_cmd(["git", "describe", "--tags", "--always", commit_ish])
 
         if result.returncode != 0:
@@ -156,6 +460,7 @@ class GitProject:
 
         return result.stdout.strip()
 
+    @memoized_on_refs
     def get_commit_count(self, ref: str = "HEAD") -> int | None:
         result = self._run_cmd(["git", "rev-list", "--count", ref])
 
@@ -165,6 +470,11 @@ class GitProject:
         return int(result.stdout.strip())
 
 
+def _top_pathspecs(paths: Iterable[str]) -> list[str]:
+    """Pathspecs for paths relative to the top of the repo, as `status()` returns."""
+    return [f":(top,literal){path}" for path in paths]
+
+
 def is_a_git_worktree(dir: Path) -> bool:
     result = run_text(
         ["git", "rev-parse", "--is-inside-work-tree"],
@@ -174,7 +484,53 @@ def is_a_git_worktree(dir: Path) -> bool:
     return result.stdout.strip() == "true"
 
 
-def clone_to(url: str, dest: Path, ref: str | None = None) -> subprocess.CompletedProcess[str]:
+class CloneStrategy(Enum):
+    FULL = auto()
+    """Blobless clone of the full history, for anything that needs to look at
+    history (describing commits, listing newer versions, etc.)."""
+    SHALLOW_REF = auto()
+    """Just the commit a tag (or branch) points to."""
+    SHALLOW_COMMIT = auto()
+    """Just the commit with the given (full) hash."""
+
+
+def select_clone_strategy(ref: str | None, needs_history: bool = False) -> CloneStrategy:
+    """Pick the cheapest way to clone a repo for working with ``ref``.
+
+    Args:
+        ref: What will be checked out, `None` for the default branch.
+        needs_history: If the caller will need history beyond ``ref`` itself.
+            Note that describing a tagged commit does not.
+    """
+    if needs_history or ref is None or ref == "HEAD":
+        return CloneStrategy.FULL
+
+    if re.fullmatch(r"[0-9a-f]{40}", ref):
+        return CloneStrategy.SHALLOW_COMMIT
+
+    # abbreviated hashes and `git describe` output can't be fetched directly
+    if re.fullmatch(r"[0-9a-f]{7,39}", ref) or re.match(r"^.+-\d+-g[0-9a-f]+$", ref):
+        return CloneStrategy.FULL
+
+    return CloneStrategy.SHALLOW_REF
+
+
+def clone_to(
+    url: str, dest: Path, ref: str | None = None, strategy: CloneStrategy = CloneStrategy.FULL
+) -> subprocess.CompletedProcess[str]:
+    """Clone ``url`` to ``dest`` with ``ref`` checked out.
+
+    Shallow strategies fall back to a full clone if the shallow one fails
+    (e.g., ``ref`` is not a tag/branch or the server doesn't allow fetching
+    commits by hash).
+    """
+    if strategy is not CloneStrategy.FULL and ref:
+        result = _shallow_clone_to(url, dest, ref, strategy)
+        if result.returncode == 0:
+            return result
+
+        shutil.rmtree(dest, ignore_errors=True)
+
     clone_result = run_text(["git", "clone", "--filter=blob:none", url, dest])
 
     if clone_result.returncode == 0:
@@ -184,5 +540,25 @@ def clone_to(url: str, dest: Path, ref: str | None = None) -> subprocess.Complet
     return clone_result
 
 
+def _shallow_clone_to(
+    url: str, dest: Path, ref: str, strategy: CloneStrategy
+) -> subprocess.CompletedProcess[str]:
+    if strategy is CloneStrategy.SHALLOW_REF:
+        return run_text(["git", "clone", "--depth", "1", "--branch", ref, url, dest])
+
+    dest.mkdir(parents=True, exist_ok=True)
+    for args in (
+        ["init", "--quiet"],
+        ["remote", "add", "origin", url],
+        ["fetch", "--depth", "1", "origin", ref],
+        ["checkout", "--quiet", "FETCH_HEAD"],
+    ):
+        result = run_text(["git", *args], cwd=dest)
+        if result.returncode != 0:
+            return result
+
+    return result
+
+
 def run_text(*args: Any, **kwargs: Any) -> subprocess.CompletedProcess[str]:
     return subprocess.run(*args, **kwargs, capture_output=True, text=True)
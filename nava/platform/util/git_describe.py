@@ -0,0 +1,234 @@
+"""Answer ``git describe`` style questions from a precomputed commit graph.
+
+``git describe`` (and ``git describe --contains``) walk the history of the repo
+on every call, which adds up when the same questions get asked about the same
+commits over and over, e.g., once per app during a migration. A
+`DescribeIndex` loads the commit graph of the repo once with ``git rev-list``
+and from it computes, for every commit, the nearest tag containing it, while
+the nearest preceding tag of a commit is worked out on first request and
+remembered. Everything is thrown away and rebuilt when the refs of the repo
+change.
+
+The results match what git reports in the common cases, but tie breaking
+between equally distant tags is by version rather than tag date.
+"""
+
+import fnmatch
+import heapq
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+
+from nava.platform.util.git import GitProject, run_text
+from nava.platform.util.git_tags import TagEntry, TagIndex, tag_index
+
+# what `git name-rev` (which `describe --contains` uses) charges for going
+# through a merge, so names along first parents are always preferred
+MERGE_TRAVERSAL_WEIGHT = 65535
+
+
+@dataclass(frozen=True)
+class TagDistance:
+    tag: str
+    distance: int
+
+
+@dataclass(frozen=True)
+class Description:
+    tag: str | None
+    """Nearest preceding tag, `None` if there is not one."""
+    distance: int
+    """Number of commits since ``tag``."""
+    commit: str
+    abbrev_commit: str
+
+    def __str__(self) -> str:
+        """Format like ``git describe --tags --always``."""
+        if self.tag is None:
+            return self.abbrev_commit
+
+        if self.distance == 0:
+            return self.tag
+
+        return f"{self.tag}-{self.distance}-g{self.abbrev_commit}"
+
+
+@dataclass
+class _Graph:
+    commits: list[str]
+    index: dict[str, int]
+    parents: list[list[int]]
+    ancestors: list[int]
+    """Bitmask of the commits reachable from each commit (including itself)."""
+    tags: list[tuple[int, TagEntry]]
+    """Tags and the index of their commit, in version order."""
+    abbrev_len: int
+
+
+class DescribeIndex:
+    def __init__(self, git: GitProject, tags: TagIndex | None = None):
+        self.git = git
+        self.tag_index = tags or TagIndex(git)
+        self._state: tuple[int, ...] | None = None
+        self._graph: _Graph | None = None
+        self._containing: dict[str | None, dict[int, TagDistance]] = {}
+        self._descriptions: dict[int, Description] = {}
+        self._lock = threading.Lock()
+
+    def has_commit(self, commit_ish: str) -> bool:
+        with self._lock:
+            return self._lookup(self._load(), commit_ish) is not None
+
+    def closest_containing_tag(self, commit_ish: str, exclude: str | None = None) -> str | None:
+        """Nearest tag that contains the commit, like ``git describe --contains``.
+
+        Args:
+            commit_ish: What to look up.
+            exclude: Glob pattern of tag names not to consider.
+        """
+        result = self.containing_tag(commit_ish, exclude)
+        return result.tag if result else None
+
+    def containing_tag(self, commit_ish: str, exclude: str | None = None) -> TagDistance | None:
+        with self._lock:
+            graph = self._load()
+            i = self._lookup(graph, commit_ish)
+            if i is None:
+                return None
+
+            if exclude not in self._containing:
+                self._containing[exclude] = _nearest_containing_tags(graph, exclude)
+
+            return self._containing[exclude].get(i)
+
+    def describe(self, commit_ish: str = "HEAD") -> Description | None:
+        """Nearest tag preceding the commit, like ``git describe --tags --always``."""
+        with self._lock:
+            graph = self._load()
+            i = self._lookup(graph, commit_ish)
+            if i is None:
+                return None
+
+            if i not in self._descriptions:
+                self._descriptions[i] = _describe(graph, i)
+
+            return self._descriptions[i]
+
+    def _lookup(self, graph: _Graph, commit_ish: str) -> int | None:
+        commit = self.git.resolve_commit(commit_ish)
+        if commit is None:
+            return None
+
+        return graph.index.get(commit)
+
+    def _load(self) -> _Graph:
+        state = self.git.ref_state()
+        if self._graph is None or state is None or state != self._state:
+            self._graph = self._build()
+            self._state = state
+            self._containing = {}
+            self._descriptions = {}
+
+        return self._graph
+
+    def _build(self) -> _Graph:
+        result = run_text(
+            ["git", "rev-list", "--all", "--parents", "--topo-order", "--reverse"],
+            cwd=self.git.dir,
+        )
+
+        commits: list[str] = []
+        index: dict[str, int] = {}
+        parents: list[list[int]] = []
+        ancestors: list[int] = []
+
+        # parents always come before their children
+        for line in result.stdout.splitlines() if result.returncode == 0 else []:
+            commit, *parent_commits = line.split()
+            i = len(commits)
+            commits.append(commit)
+            index[commit] = i
+
+            parent_indexes = [index[p] for p in parent_commits if p in index]
+            parents.append(parent_indexes)
+
+            mask = 1 << i
+            for p in parent_indexes:
+                mask |= ancestors[p]
+            ancestors.append(mask)
+
+        tags = [(index[e.commit], e) for e in self.tag_index.entries if e.commit in index]
+
+        abbrev_len = 7
+        if commits:
+            short = run_text(["git", "rev-parse", "--short", commits[-1]], cwd=self.git.dir)
+            abbrev_len = len(short.stdout.strip()) or abbrev_len
+
+        return _Graph(commits, index, parents, ancestors, tags, abbrev_len)
+
+
+def _nearest_containing_tags(graph: _Graph, exclude: str | None) -> dict[int, TagDistance]:
+    """Walk back from every tag at once, keeping the nearest for each commit."""
+    nearest: dict[int, TagDistance] = {}
+
+    # (distance, version order of the tag, commit) so older tags win ties
+    queue: list[tuple[int, int, int]] = []
+    tags = [
+        entry for _, entry in graph.tags if not (exclude and fnmatch.fnmatch(entry.name, exclude))
+    ]
+    for order, entry in enumerate(tags):
+        queue.append((0, order, graph.index[entry.commit]))
+    heapq.heapify(queue)
+
+    while queue:
+        distance, order, i = heapq.heappop(queue)
+        if i in nearest:
+            continue
+
+        nearest[i] = TagDistance(tags[order].name, distance)
+
+        for n, p in enumerate(graph.parents[i]):
+            if p not in nearest:
+                weight = 1 if n == 0 else MERGE_TRAVERSAL_WEIGHT
+                heapq.heappush(queue, (distance + weight, order, p))
+
+    return nearest
+
+
+def _describe(graph: _Graph, i: int) -> Description:
+    ancestors = graph.ancestors[i]
+    commit = graph.commits[i]
+
+    best: tuple[int, TagEntry] | None = None
+    # go newest first, so newer tags win ties
+    for tag_i, entry in reversed(graph.tags):
+        if not (ancestors >> tag_i) & 1:
+            continue
+
+        distance = (ancestors & ~graph.ancestors[tag_i]).bit_count()
+        if best is None or distance < best[0]:
+            best = (distance, entry)
+
+    return Description(
+        tag=best[1].name if best else None,
+        distance=best[0] if best else 0,
+        commit=commit,
+        abbrev_commit=commit[: graph.abbrev_len],
+    )
+
+
+_indexes: dict[Path, DescribeIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def describe_index(git: GitProject) -> DescribeIndex:
+    """Get the (process-wide) describe index for the repo ``git`` is in."""
+    git_dirs = git.git_dirs()
+    if git_dirs is None:
+        return DescribeIndex(git)
+
+    with _indexes_lock:
+        if git_dirs[1] not in _indexes:
+            _indexes[git_dirs[1]] = DescribeIndex(git, tag_index(git))
+
+        return _indexes[git_dirs[1]]
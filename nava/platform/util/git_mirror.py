@@ -0,0 +1,95 @@
+"""An on-disk cache of bare mirrors of remote git repositories.
+
+Rather than doing a full clone of a (remote) template repo every time it is
+needed and then throwing it away, keep a ``git clone --mirror`` of it under the
+user's cache directory, ``fetch`` into it to pick up any changes, and make cheap
+local clones off of it (which hardlink the object files rather than transfer
+them).
+"""
+
+import hashlib
+import os
+import shutil
+import subprocess
+from pathlib import Path
+
+from nava.platform.cli.config import app_dirs
+from nava.platform.util.files.cache import file_lock, mark_used, prune_lru
+from nava.platform.util.git import clone_to, run_text
+
+DEFAULT_MAX_SIZE_BYTES = 2 * 1024 * 1024 * 1024
+
+FETCHED_MIRRORS_ENV_VAR = "NAVA_PLATFORM_FETCHED_MIRRORS"
+"""Mirrors already fetched by a parent process, which its children don't fetch again."""
+
+# mirrors that have already been brought up to date by this process, so
+# repeated uses in a single run don't each hit the network
+_fetched_this_process: set[Path] = {
+    Path(path) for path in os.environ.get(FETCHED_MIRRORS_ENV_VAR, "").split(os.pathsep) if path
+}
+
+
+def fetched_mirrors_env() -> dict[str, str]:
+    """Environment for child processes to use the mirrors fetched by this one as-is."""
+    return {FETCHED_MIRRORS_ENV_VAR: os.pathsep.join(sorted(map(str, _fetched_this_process)))}
+
+
+class GitMirrorCache:
+    root: Path
+    max_size_bytes: int
+
+    def __init__(self, root: Path, max_size_bytes: int = DEFAULT_MAX_SIZE_BYTES):
+        self.root = Path(root)
+        self.max_size_bytes = max_size_bytes
+
+    def mirror_path(self, url: str) -> Path:
+        """Location of the mirror for the (resolved) repo URL."""
+        key = hashlib.sha256(url.encode()).hexdigest()[:16]
+        return self.root / f"{key}.git"
+
+    def mirror(self, url: str, *, fetch: bool = True) -> Path:
+        """Get a mirror of ``url``, cloning or fetching as needed.
+
+        A given mirror is only fetched into once per process, later calls use
+        it as-is.
+        """
+        path = self.mirror_path(url)
+
+        with file_lock(self._lock_path(path)):
+            if not path.exists():
+                tmp_path = path.with_suffix(".tmp")
+                shutil.rmtree(tmp_path, ignore_errors=True)
+                run_text(["git", "clone", "--mirror", "--quiet", url, tmp_path]).check_returncode()
+                tmp_path.rename(path)
+                _fetched_this_process.add(path)
+            elif fetch and path not in _fetched_this_process:
+                run_text(
+                    ["git", "--git-dir", path, "fetch", "--prune", "--quiet", "origin"]
+                ).check_returncode()
+                _fetched_this_process.add(path)
+
+            mark_used(path)
+
+        self.prune(keep=[path])
+
+        return path
+
+    def clone_to(
+        self, url: str, dest: Path, ref: str | None = None
+    ) -> subprocess.CompletedProcess[str]:
+        """Clone ``url`` to ``dest``, by way of the local mirror."""
+        return clone_to(str(self.mirror(url)), dest, ref)
+
+    def prune(self, keep: list[Path] | None = None) -> list[Path]:
+        """Remove least recently used mirrors until the cache is under its size limit."""
+        if not self.root.exists():
+            return []
+
+        return prune_lru(self.root.glob("*.git"), self.max_size_bytes, keep=keep or [])
+
+    def _lock_path(self, mirror_path: Path) -> Path:
+        return mirror_path.with_suffix(".lock")
+
+
+def default_mirror_cache() -> GitMirrorCache:
+    return GitMirrorCache(app_dirs.user_cache_path / "git-mirrors")
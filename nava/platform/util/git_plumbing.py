@@ -0,0 +1,224 @@
+"""Lower level git interfaces, for when spawning a process per query is too much.
+
+`GitProject` is the main consumer of these, most things should go through it
+rather than use these directly.
+"""
+
+import contextlib
+import os
+import subprocess
+import threading
+import weakref
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import IO
+
+
+@dataclass
+class ObjectInfo:
+    oid: str
+    type: str
+    size: int
+
+
+class GitCatFile:
+    """Long-lived ``git cat-file --batch-check``/``--batch`` processes for a repo.
+
+    The processes are started on first use and stay around until `close()` is
+    called (or the object is garbage collected), so any number of object
+    lookups only cost a round trip over a pipe.
+    """
+
+    def __init__(self, dir: Path):
+        self.dir = Path(dir)
+        self._check_proc: subprocess.Popen[bytes] | None = None
+        self._batch_proc: subprocess.Popen[bytes] | None = None
+        self._lock = threading.Lock()
+        # make sure the processes get cleaned up even if `close()` never is
+        self._procs: list[subprocess.Popen[bytes]] = []
+        weakref.finalize(self, _close_procs, self._procs)
+
+    def info(self, rev: str) -> ObjectInfo | None:
+        """Get the object ``rev`` refers to, if it exists."""
+        with self._lock:
+            if self._check_proc is None:
+                self._check_proc = self._start("--batch-check")
+
+            return _read_info(self._check_proc, rev)
+
+    def read(self, rev: str) -> tuple[ObjectInfo, bytes] | None:
+        """Get the object ``rev`` refers to and its contents, if it exists."""
+        with self._lock:
+            if self._batch_proc is None:
+                self._batch_proc = self._start("--batch")
+
+            info = _read_info(self._batch_proc, rev)
+            if info is None:
+                return None
+
+            stdout = _stdout(self._batch_proc)
+            content = stdout.read(info.size)
+            # contents are followed by a newline
+            stdout.read(1)
+
+            return info, content
+
+    def close(self) -> None:
+        with self._lock:
+            self._check_proc = None
+            self._batch_proc = None
+            _close_procs(self._procs)
+
+    def _start(self, mode: str) -> subprocess.Popen[bytes]:
+        proc = subprocess.Popen(
+            ["git", "cat-file", mode],
+            cwd=self.dir,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+        self._procs.append(proc)
+        return proc
+
+
+def _stdout(proc: subprocess.Popen[bytes]) -> IO[bytes]:
+    assert proc.stdout is not None
+    return proc.stdout
+
+
+def _read_info(proc: subprocess.Popen[bytes], rev: str) -> ObjectInfo | None:
+    assert proc.stdin is not None
+    proc.stdin.write(rev.encode() + b"\n")
+    proc.stdin.flush()
+
+    line = _stdout(proc).readline().decode().rstrip("\n")
+    parts = line.split(" ")
+
+    # "<rev> missing" or "<rev> ambiguous"
+    if len(parts) != 3:
+        return None
+
+    oid, type, size = parts
+    return ObjectInfo(oid=oid, type=type, size=int(size))
+
+
+def _close_procs(procs: list[subprocess.Popen[bytes]]) -> None:
+    while procs:
+        proc = procs.pop()
+        if proc.stdin:
+            proc.stdin.close()
+        proc.wait()
+        if proc.stdout:
+            proc.stdout.close()
+
+
+@dataclass
+class GitStatus:
+    """Parsed output of ``git status --porcelain=v2 -z --branch``."""
+
+    head: str | None = None
+    """Commit hash of HEAD, `None` if there are no commits yet."""
+    branch: str | None = None
+    """Checked out branch, `None` if HEAD is detached."""
+    changed: list[str] = field(default_factory=list)
+    """Tracked paths with staged or unstaged changes."""
+    unmerged: list[str] = field(default_factory=list)
+    untracked: list[str] = field(default_factory=list)
+    ignored: list[str] = field(default_factory=list)
+
+    @property
+    def is_clean(self) -> bool:
+        return not (self.changed or self.unmerged or self.untracked)
+
+
+STATUS_ARGS = ("status", "--porcelain=v2", "-z", "--branch")
+
+
+def parse_status(output: str) -> GitStatus:
+    """Parse the output of ``git <STATUS_ARGS>``."""
+    status = GitStatus()
+
+    records = iter(output.split("\0"))
+    for record in records:
+        if not record:
+            continue
+
+        kind, _, rest = record.partition(" ")
+        match kind:
+            case "#":
+                header, _, value = rest.partition(" ")
+                if header == "branch.oid" and value != "(initial)":
+                    status.head = value
+                elif header == "branch.head" and value != "(detached)":
+                    status.branch = value
+            case "1":
+                status.changed.append(rest.split(" ", 7)[-1])
+            case "2":
+                status.changed.append(rest.split(" ", 8)[-1])
+                # the original path of a rename/copy is a separate record
+                next(records, None)
+            case "u":
+                status.unmerged.append(rest.split(" ", 9)[-1])
+            case "?":
+                status.untracked.append(rest)
+            case "!":
+                status.ignored.append(rest)
+            case _:
+                pass
+
+    return status
+
+
+def ref_state(git_dir: Path, common_dir: Path | None = None) -> tuple[int, ...]:
+    """A cheap fingerprint of the refs in a repo, changes whenever any of them do.
+
+    Ref updates are done by writing a new file and renaming it in place, which
+    changes the inode of the ref and the modification time (and for new or
+    deleted refs, the number of entries) of the directory it's in. So rather
+    than stat every loose ref, which adds up in repos with lots of tags, this
+    only looks at ``HEAD``, the branch it points to, ``packed-refs`` and the
+    directories under ``refs/heads`` and ``refs/tags``, without needing to
+    spawn a git process.
+
+    Other refs moving within the timestamp granularity of the filesystem (a
+    few milliseconds) of each other can go unnoticed, it's the refs that
+    `memoized_on_refs` queries usually depend on that are covered reliably.
+    """
+    common_dir = common_dir or git_dir
+    state: list[int] = []
+
+    paths = [git_dir / "HEAD", common_dir / "packed-refs"]
+    with contextlib.suppress(OSError):
+        head = paths[0].read_text()
+        if head.startswith("ref: "):
+            paths.append(common_dir / head.removeprefix("ref: ").strip())
+
+    for path in paths:
+        try:
+            stat = path.stat()
+            state += [stat.st_ino, stat.st_mtime_ns, stat.st_size]
+        except FileNotFoundError:
+            state += [0, 0, 0]
+
+    for refs_dir in ("refs/heads", "refs/tags"):
+        _add_dir_state(common_dir / refs_dir, state)
+
+    return tuple(state)
+
+
+def _add_dir_state(dir_path: Path, state: list[int]) -> None:
+    try:
+        with os.scandir(dir_path) as entries:
+            sub_dirs = []
+            count = 0
+            for entry in entries:
+                count += 1
+                if entry.is_dir(follow_symlinks=False):
+                    sub_dirs.append(entry.path)
+            state += [os.stat(dir_path).st_mtime_ns, count]
+    except FileNotFoundError:
+        state += [0, 0]
+        return
+
+    for sub_dir in sorted(sub_dirs):
+        _add_dir_state(Path(sub_dir), state)
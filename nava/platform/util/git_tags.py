@@ -0,0 +1,238 @@
+"""A cached index of the tags in a git repo and the versions they represent.
+
+Listing the tags of a (template) repo and parsing them as versions happens all
+over, for figuring out the latest version, what versions are newer than what a
+project is on, which migration tag to use, etc. Rather than each of those
+spawning ``git tag`` and parsing everything again, they go through a
+`TagIndex`, which is only rebuilt when the refs of the repo change (see
+`nava.platform.util.git_plumbing.ref_state`) and, for repos that stick around
+(like template mirrors or the user's own clones), is persisted under the user's
+cache directory so it survives between runs.
+"""
+
+import contextlib
+import hashlib
+import json
+import tempfile
+import threading
+from collections.abc import Iterable
+from dataclasses import dataclass
+from pathlib import Path
+
+from packaging.version import InvalidVersion, Version
+
+from nava.platform.cli.config import app_dirs
+from nava.platform.util.files.cache import mark_used, prune_lru
+from nava.platform.util.git import GitProject, run_text
+
+INDEX_FORMAT_VERSION = 1
+
+# an index is a few KB at most, but one is created for every lasting repo seen
+DEFAULT_MAX_SIZE_BYTES = 16 * 1024 * 1024
+
+FOR_EACH_REF_FORMAT = "%(refname:strip=2)%00%(objectname)%00%(*objectname)"
+
+
+@dataclass
+class TagEntry:
+    name: str
+    commit: str
+    """Commit the tag points to (peeled, for annotated tags)."""
+    version: Version | None
+    """PEP 440 version of the tag, ignoring any ``<prefix>/`` on the name."""
+
+    @property
+    def has_prefix(self) -> bool:
+        return "/" in self.name
+
+
+class TagIndex:
+    def __init__(self, git: GitProject, index_file: Path | None = None):
+        self.git = git
+        self.index_file = index_file
+        self._state: tuple[int, ...] | None = None
+        self._entries: list[TagEntry] = []
+        self._lock = threading.Lock()
+
+    @property
+    def entries(self) -> list[TagEntry]:
+        """All tags in the repo, sorted by version (unversioned tags last)."""
+        with self._lock:
+            state = self.git.ref_state()
+            if state is None or state != self._state:
+                self._refresh(state)
+
+            return self._entries
+
+    def tags(self, prefix: str = "") -> list[TagEntry]:
+        return [entry for entry in self.entries if entry.name.startswith(prefix)]
+
+    def latest(self, *, use_prereleases: bool = False) -> str | None:
+        """The tag with the highest version, see `latest_tag()`."""
+        return latest_tag(self.entries, use_prereleases=use_prereleases)
+
+    def newer_versions(self, version: Version, prefix: str = "v") -> list[Version]:
+        """Versions of ``prefix`` tags that are the same as or newer than ``version``."""
+        return [
+            entry.version
+            for entry in self.tags(prefix)
+            if entry.version is not None and entry.version >= version
+        ]
+
+    def _refresh(self, state: tuple[int, ...] | None) -> None:
+        if state is not None and self._state is None and (persisted := self._load(state)):
+            self._entries = persisted
+            self._state = state
+            return
+
+        known = {(entry.name, entry.commit): entry for entry in self._entries}
+        self._entries = _sort_entries(
+            known.get((name, commit)) or TagEntry(name, commit, parse_tag_version(name))
+            for name, commit in self._list_tags()
+        )
+        self._state = state
+
+        if state is not None:
+            self._save(state)
+
+    def _list_tags(self) -> list[tuple[str, str]]:
+        result = run_text(
+            ["git", "for-each-ref", f"--format={FOR_EACH_REF_FORMAT}", "refs/tags"],
+            cwd=self.git.dir,
+        )
+        if result.returncode != 0:
+            return []
+
+        tags = []
+        for line in result.stdout.splitlines():
+            name, object_name, peeled_name = line.split("\0")
+            tags.append((name, peeled_name or object_name))
+
+        return tags
+
+    def _load(self, state: tuple[int, ...]) -> list[TagEntry] | None:
+        if not self.index_file:
+            return None
+
+        try:
+            data = json.loads(self.index_file.read_text())
+        except (OSError, ValueError):
+            return None
+
+        if data.get("format") != INDEX_FORMAT_VERSION or data.get("ref_state") != list(state):
+            return None
+
+        mark_used(self.index_file)
+
+        # persisted already sorted
+        return [
+            TagEntry(name, commit, Version(version) if version else None)
+            for name, commit, version in data["tags"]
+        ]
+
+    def _save(self, state: tuple[int, ...]) -> None:
+        if not self.index_file:
+            return
+
+        data = {
+            "format": INDEX_FORMAT_VERSION,
+            "ref_state": list(state),
+            "tags": [
+                [entry.name, entry.commit, str(entry.version) if entry.version else None]
+                for entry in self._entries
+            ],
+        }
+
+        # it's only a cache, not being able to write it is fine
+        with contextlib.suppress(OSError):
+            self.index_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = self.index_file.with_suffix(".tmp")
+            tmp_file.write_text(json.dumps(data))
+            tmp_file.replace(self.index_file)
+            prune_lru(
+                self.index_file.parent.glob("*.json"),
+                DEFAULT_MAX_SIZE_BYTES,
+                keep=[self.index_file],
+            )
+
+
+def latest_tag(entries: Iterable[TagEntry], *, use_prereleases: bool = False) -> str | None:
+    """The tag with the highest version, like `copier.vcs.checkout_latest_tag`.
+
+    Upstream only considers tags that are PEP 440 versions in their entirety,
+    so prefixed tags are ignored.
+    """
+    latest: tuple[Version, str] | None = None
+    for entry in _sort_entries(entries):
+        if entry.version is None or entry.has_prefix:
+            continue
+
+        if entry.version.is_prerelease and not use_prereleases:
+            continue
+
+        # sorted by version then name, so for equivalent versions, keep the
+        # first like upstream's stable sort
+        if latest is None or latest[0] < entry.version:
+            latest = (entry.version, entry.name)
+
+    return latest[1] if latest else None
+
+
+def parse_ls_remote_tags(output: str) -> list[TagEntry]:
+    """Tags from the output of ``git ls-remote --tags``, sorted like `TagIndex.entries`."""
+    commits: dict[str, str] = {}
+    for line in output.splitlines():
+        object_name, _, ref = line.partition("\t")
+        name = ref.removeprefix("refs/tags/")
+        if name.endswith("^{}"):
+            # peeled annotated tag, which comes after the tag itself
+            commits[name.removesuffix("^{}")] = object_name
+        elif name != ref:
+            commits.setdefault(name, object_name)
+
+    return _sort_entries(
+        TagEntry(name, commit, parse_tag_version(name)) for name, commit in commits.items()
+    )
+
+
+def parse_tag_version(name: str) -> Version | None:
+    try:
+        return Version(name.rpartition("/")[2])
+    except InvalidVersion:
+        return None
+
+
+def _sort_entries(entries: Iterable[TagEntry]) -> list[TagEntry]:
+    return sorted(
+        entries,
+        key=lambda e: (e.version is None, e.version or Version("0"), e.name),
+    )
+
+
+_indexes: dict[Path, TagIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def tag_index(git: GitProject) -> TagIndex:
+    """Get the (process-wide) tag index for the repo ``git`` is in."""
+    git_dirs = git.git_dirs()
+    if git_dirs is None:
+        return TagIndex(git)
+
+    common_dir = git_dirs[1]
+
+    with _indexes_lock:
+        if common_dir not in _indexes:
+            index_file = None
+            # temporary clones and template checkouts won't be seen again
+            if not _is_temporary(common_dir):
+                key = hashlib.sha256(str(common_dir).encode()).hexdigest()[:16]
+                index_file = app_dirs.user_cache_path / "tag-index" / f"{key}.json"
+
+            _indexes[common_dir] = TagIndex(git, index_file)
+
+        return _indexes[common_dir]
+
+
+def _is_temporary(path: Path) -> bool:
+    return path.resolve().is_relative_to(Path(tempfile.gettempdir()).resolve())
@@ -0,0 +1,496 @@
+"""Read literal values out of Terraform (HCL) files, without running Terraform.
+
+Getting the values of a Terraform module the proper way, with ``terraform
+refresh`` and ``terraform output``, needs the module initialized, its
+providers downloaded and (often) credentials, and takes seconds at best. For a
+module like ``infra/project-config``, whose outputs are all plain values
+written in its ``locals``, that's a lot of machinery to read a few strings.
+
+This reads just enough of the HCL native syntax to find the blocks and
+attributes of a file and evaluate the simplest of expressions:
+
+- literal strings (including heredocs), numbers, booleans and ``null``
+- references to ``local.<name>``
+- string templates interpolating any of the above, like
+  ``"${local.project_name}-github-actions"``
+
+Anything else (function calls, operators, variables, resources, template
+directives, etc.) is left unevaluated, and so is anything depending on it,
+rather than guessing.
+"""
+
+import re
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+
+class HclSyntaxError(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class Literal:
+    value: str | int | float | bool | None
+
+
+@dataclass(frozen=True)
+class Reference:
+    traversal: tuple[str, ...]
+    """The names of a reference like ``local.project_name``, split on ``.``."""
+
+
+@dataclass(frozen=True)
+class StringTemplate:
+    parts: tuple["str | Expression", ...]
+
+
+@dataclass(frozen=True)
+class Unsupported:
+    source: str
+
+
+Expression = Literal | Reference | StringTemplate | Unsupported
+
+
+@dataclass
+class Attribute:
+    name: str
+    value: Expression
+
+
+@dataclass
+class Block:
+    type: str
+    labels: list[str] = field(default_factory=list)
+    body: "Body" = field(default_factory=lambda: Body())
+
+
+@dataclass
+class Body:
+    attributes: list[Attribute] = field(default_factory=list)
+    blocks: list[Block] = field(default_factory=list)
+
+    def blocks_of_type(self, type: str) -> list[Block]:
+        return [block for block in self.blocks if block.type == type]
+
+
+class Unknown:
+    """The value of an expression that can't be evaluated statically."""
+
+    def __repr__(self) -> str:
+        return "UNKNOWN"
+
+
+UNKNOWN = Unknown()
+
+
+def parse(text: str) -> Body:
+    """Parse the structure (blocks and attributes) of an HCL file.
+
+    Raises:
+        HclSyntaxError: If the structure isn't valid HCL.
+    """
+    return _Parser(list(_tokenize(text))).parse_file()
+
+
+def module_outputs(module_dir: Path) -> dict[str, Any]:
+    """The values of the outputs of the Terraform module in ``module_dir``.
+
+    Only outputs that can be evaluated statically are included.
+
+    Raises:
+        HclSyntaxError: If any ``.tf`` file in the module isn't valid HCL.
+    """
+    bodies = [parse(path.read_text()) for path in sorted(module_dir.glob("*.tf"))]
+    scope = _LocalsScope(
+        {
+            attribute.name: attribute.value
+            for body in bodies
+            for block in body.blocks_of_type("locals")
+            for attribute in block.body.attributes
+        }
+    )
+
+    outputs = {}
+    for body in bodies:
+        for block in body.blocks_of_type("output"):
+            value_attribute = next((a for a in block.body.attributes if a.name == "value"), None)
+            if len(block.labels) != 1 or value_attribute is None:
+                continue
+
+            value = scope.evaluate(value_attribute.value)
+            if value is not UNKNOWN:
+                outputs[block.labels[0]] = value
+
+    return outputs
+
+
+class _LocalsScope:
+    def __init__(self, locals: dict[str, Expression]):
+        self._locals = locals
+        self._values: dict[str, Any] = {}
+        self._evaluating: set[str] = set()
+
+    def evaluate(self, expression: Expression) -> Any:
+        match expression:
+            case Literal(value):
+                return value
+            case Reference(("local", name)):
+                return self._local(name)
+            case StringTemplate(parts):
+                strings = [part if isinstance(part, str) else self.evaluate(part) for part in parts]
+                if not all(_is_primitive(string) for string in strings):
+                    return UNKNOWN
+                return "".join(_to_string(string) for string in strings)
+            case _:
+                return UNKNOWN
+
+    def _local(self, name: str) -> Any:
+        if name in self._values:
+            return self._values[name]
+
+        if name not in self._locals or name in self._evaluating:
+            return UNKNOWN
+
+        self._evaluating.add(name)
+        try:
+            value = self.evaluate(self._locals[name])
+        finally:
+            self._evaluating.discard(name)
+
+        self._values[name] = value
+        return value
+
+
+def _is_primitive(value: Any) -> bool:
+    return value is not None and isinstance(value, str | int | float | bool)
+
+
+def _to_string(value: str | int | float | bool) -> str:
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value)
+
+
+#
+# Lexing
+#
+
+
+@dataclass(frozen=True)
+class _Token:
+    kind: str
+    """One of "ident", "number", "string", "newline", "punct" or "eof"."""
+    text: str
+    line: int
+    parts: tuple["str | Expression", ...] = ()
+    """For "string", the literal text and interpolated expressions."""
+
+
+_NUMBER = re.compile(r"\d+(\.\d+)?([eE][+-]?\d+)?")
+_IDENT = re.compile(r"[A-Za-z_][A-Za-z0-9_-]*")
+_HEREDOC = re.compile(r"<<(-?)([A-Za-z_][A-Za-z0-9_-]*)[ \t]*\n")
+_MULTI_CHAR_PUNCT = ("...", "==", "!=", "<=", ">=", "=>", "&&", "||")
+_ESCAPES = {"n": "\n", "r": "\r", "t": "\t", '"': '"', "\\": "\\"}
+
+
+def _tokenize(text: str) -> Iterator[_Token]:
+    i = 0
+    line = 1
+    while i < len(text):
+        char = text[i]
+
+        if char in " \t\r":
+            i += 1
+        elif char == "\n":
+            yield _Token("newline", char, line)
+            line += 1
+            i += 1
+        elif char == "#" or text.startswith("//", i):
+            end = text.find("\n", i)
+            i = len(text) if end == -1 else end
+        elif text.startswith("/*", i):
+            end = text.find("*/", i + 2)
+            if end == -1:
+                raise HclSyntaxError(f"Unterminated comment on line {line}")
+            line += text.count("\n", i, end)
+            i = end + 2
+        elif char == '"':
+            end, parts = _scan_quoted_template(text, i + 1, line)
+            yield _Token("string", text[i:end], line, parts)
+            line += text.count("\n", i, end)
+            i = end
+        elif heredoc := _HEREDOC.match(text, i):
+            end, parts = _scan_heredoc(text, heredoc, line)
+            yield _Token("string", text[i:end], line, parts)
+            line += text.count("\n", i, end)
+            i = end
+        elif number := _NUMBER.match(text, i):
+            yield _Token("number", number.group(), line)
+            i = number.end()
+        elif ident := _IDENT.match(text, i):
+            yield _Token("ident", ident.group(), line)
+            i = ident.end()
+        else:
+            punct = next((p for p in _MULTI_CHAR_PUNCT if text.startswith(p, i)), char)
+            yield _Token("punct", punct, line)
+            i += len(punct)
+
+    yield _Token("eof", "", line)
+
+
+def _scan_quoted_template(
+    text: str, start: int, line: int
+) -> tuple[int, tuple[str | Expression, ...]]:
+    """Scan a quoted string from just after its opening quote to just after its closing one."""
+    parts: list[str | Expression] = []
+    literal: list[str] = []
+    i = start
+    while i < len(text):
+        char = text[i]
+        if char == '"':
+            parts.append("".join(literal))
+            return i + 1, _merge_literals(parts)
+        elif char == "\n":
+            break
+        elif char == "\\":
+            escape = text[i + 1 : i + 2]
+            if escape in _ESCAPES:
+                literal.append(_ESCAPES[escape])
+                i += 2
+            elif escape in ("u", "U"):
+                length = 4 if escape == "u" else 8
+                code = text[i + 2 : i + 2 + length]
+                if not re.fullmatch(r"[0-9A-Fa-f]+", code) or len(code) != length:
+                    raise HclSyntaxError(f"Invalid unicode escape on line {line}")
+                literal.append(chr(int(code, 16)))
+                i += 2 + length
+            else:
+                raise HclSyntaxError(f"Invalid escape sequence on line {line}")
+        else:
+            i = _scan_template_char(text, i, line, parts, literal)
+
+    raise HclSyntaxError(f"Unterminated string on line {line}")
+
+
+def _scan_heredoc(
+    text: str, heredoc: re.Match[str], line: int
+) -> tuple[int, tuple[str | Expression, ...]]:
+    """Scan a heredoc from its ``<<`` to just after its closing marker's line."""
+    indented, marker = heredoc.groups()
+    closing = re.compile(rf"^[ \t]*{re.escape(marker)}[ \t]*$", re.MULTILINE)
+    end = closing.search(text, heredoc.end())
+    if end is None:
+        raise HclSyntaxError(f"Unterminated heredoc on line {line}")
+
+    content = text[heredoc.end() : end.start()]
+    if indented:
+        lines = content.splitlines(keepends=True)
+        indent = min(
+            (len(ln) - len(ln.lstrip(" \t")) for ln in lines if ln.strip()),
+            default=0,
+        )
+        content = "".join(ln[indent:] for ln in lines)
+
+    parts: list[str | Expression] = []
+    literal: list[str] = []
+    i = 0
+    while i < len(content):
+        i = _scan_template_char(content, i, line, parts, literal)
+    parts.append("".join(literal))
+
+    return end.end(), _merge_literals(parts)
+
+
+def _scan_template_char(
+    text: str, i: int, line: int, parts: list[str | Expression], literal: list[str]
+) -> int:
+    """Scan the template sequence (or plain character) at ``i``, returning where it ends."""
+    if text.startswith(("$${", "%%{"), i):
+        literal.append(text[i + 1 : i + 3])
+        return i + 3
+
+    if text.startswith(("${", "%{"), i):
+        end = _matching_brace(text, i + 1, line)
+        inner = text[i + 2 : end].strip().removeprefix("~").removesuffix("~").strip()
+        parts.append("".join(literal))
+        literal.clear()
+        # directives (`%{ if }`, `%{ for }`) aren't evaluated
+        parts.append(_expression_from_text(inner) if text[i] == "$" else Unsupported(inner))
+        return end + 1
+
+    literal.append(text[i])
+    return i + 1
+
+
+def _matching_brace(text: str, start: int, line: int) -> int:
+    """The index of the ``}`` closing the ``{`` at ``start``."""
+    depth = 0
+    i = start
+    while i < len(text):
+        char = text[i]
+        if char == "{":
+            depth += 1
+        elif char == "}":
+            depth -= 1
+            if depth == 0:
+                return i
+        elif char == '"':
+            i, _ = _scan_quoted_template(text, i + 1, line)
+            continue
+        i += 1
+
+    raise HclSyntaxError(f"Unterminated template interpolation on line {line}")
+
+
+def _merge_literals(parts: list[str | Expression]) -> tuple[str | Expression, ...]:
+    merged: list[str | Expression] = []
+    for part in parts:
+        if isinstance(part, str) and merged and isinstance(merged[-1], str):
+            merged[-1] += part
+        elif part != "":
+            merged.append(part)
+    return tuple(merged)
+
+
+def _expression_from_text(text: str) -> Expression:
+    tokens = [t for t in _tokenize(text) if t.kind not in ("newline", "eof")]
+    return _classify(tokens, text)
+
+
+#
+# Parsing
+#
+
+_OPENING = {"(": ")", "[": "]", "{": "}"}
+
+
+class _Parser:
+    def __init__(self, tokens: list[_Token]):
+        self._tokens = tokens
+        self._i = 0
+
+    def parse_file(self) -> Body:
+        body = self._body()
+        if self._peek().kind != "eof":
+            raise self._error("Unexpected `}`")
+        return body
+
+    def _body(self) -> Body:
+        body = Body()
+        while True:
+            self._skip_newlines()
+            token = self._peek()
+            if token.kind == "eof" or token.text == "}":
+                return body
+
+            name = self._next()
+            if name.kind != "ident":
+                raise self._error(f"Expected an attribute or block, got `{name.text}`", name)
+
+            if self._peek().text == "=":
+                self._next()
+                body.attributes.append(Attribute(name.text, self._expression()))
+                continue
+
+            labels = []
+            while self._peek().kind in ("string", "ident"):
+                label = self._next()
+                labels.append(label.text if label.kind == "ident" else _label_value(label))
+
+            if self._next().text != "{":
+                raise self._error(f"Expected `=` or `{{` after `{name.text}`", name)
+
+            block = Block(name.text, labels, self._body())
+            if self._next().text != "}":
+                raise self._error(f"Unterminated block `{name.text}`", name)
+            body.blocks.append(block)
+
+    def _expression(self) -> Expression:
+        """The expression up to the end of the line, or of a single line block."""
+        tokens = []
+        closing: list[str] = []
+        while True:
+            token = self._peek()
+            if token.kind == "eof":
+                if closing:
+                    raise self._error("Unterminated expression", token)
+                break
+            if not closing and (token.kind == "newline" or token.text == "}"):
+                break
+
+            self._next()
+            if token.kind == "punct" and token.text in _OPENING:
+                closing.append(_OPENING[token.text])
+            elif closing and token.text == closing[-1]:
+                closing.pop()
+            tokens.append(token)
+
+        if not tokens:
+            raise self._error("Expected an expression")
+
+        return _classify([t for t in tokens if t.kind != "newline"], _source(tokens))
+
+    def _skip_newlines(self) -> None:
+        while self._peek().kind == "newline":
+            self._next()
+
+    def _peek(self) -> _Token:
+        return self._tokens[self._i]
+
+    def _next(self) -> _Token:
+        token = self._tokens[self._i]
+        if token.kind != "eof":
+            self._i += 1
+        return token
+
+    def _error(self, message: str, token: _Token | None = None) -> HclSyntaxError:
+        return HclSyntaxError(f"{message} on line {(token or self._peek()).line}")
+
+
+def _classify(tokens: list[_Token], source: str) -> Expression:
+    """The expression ``tokens`` are, if it's one of the simple kinds."""
+    texts = [t.text for t in tokens]
+
+    if len(tokens) == 1:
+        token = tokens[0]
+        if token.kind == "string":
+            parts = token.parts
+            if all(isinstance(part, str) for part in parts):
+                return Literal("".join(str(part) for part in parts))
+            return StringTemplate(parts)
+        if token.kind == "number":
+            return Literal(_number(token.text))
+        if token.text in ("true", "false"):
+            return Literal(token.text == "true")
+        if token.text == "null":
+            return Literal(None)
+
+    if len(tokens) == 2 and texts[0] == "-" and tokens[1].kind == "number":
+        return Literal(-_number(tokens[1].text))
+
+    if (
+        len(tokens) >= 3
+        and len(tokens) % 2 == 1
+        and all(t.kind == "ident" for t in tokens[::2])
+        and all(text == "." for text in texts[1::2])
+    ):
+        return Reference(tuple(texts[::2]))
+
+    return Unsupported(source)
+
+
+def _number(text: str) -> int | float:
+    return float(text) if any(c in text for c in ".eE") else int(text)
+
+
+def _label_value(token: _Token) -> str:
+    if not all(isinstance(part, str) for part in token.parts):
+        raise HclSyntaxError(f"Block labels can't have interpolations on line {token.line}")
+    return "".join(str(part) for part in token.parts)
+
+
+def _source(tokens: list[_Token]) -> str:
+    return " ".join(t.text for t in tokens if t.kind != "newline")
@@ -0,0 +1,133 @@
+import json
+
+import pytest
+from typer.testing import CliRunner
+
+from nava.platform.cli.commands.fleet.update_command import FleetProject, load_projects
+from nava.platform.cli.main import app as nava_cli
+from nava.platform.projects.infra_project import InfraProject
+from nava.platform.util.git import GitProject
+from tests.lib.changeset import ChangeSet, FileChange
+
+
+@pytest.fixture
+def other_project(tmp_path, cli, infra_template, clean_install) -> InfraProject:
+    project = InfraProject(tmp_path / "other-project")
+    project.dir.mkdir()
+    GitProject(project.dir).init()
+    cli(
+        [
+            "infra",
+            "install",
+            "--commit",
+            "--template-uri",
+            str(infra_template.template_dir),
+            "--data",
+            "app_name=bar",
+            str(project.dir),
+        ],
+    )
+    return project
+
+
+def test_load_projects(tmp_path):
+    (tmp_path / "a").mkdir()
+    manifest = tmp_path / "manifests" / "fleet.yml"
+    manifest.parent.mkdir()
+    manifest.write_text(
+        "versions:\n"
+        "  template-infra: v1.0.0\n"
+        "projects:\n"
+        "  - ../b\n"
+        "  - path: ../c\n"
+        "    versions:\n"
+        "      template-infra: v2.0.0\n"
+    )
+
+    assert load_projects([tmp_path / "a", manifest], {"template-whoa": "v3.0.0"}) == [
+        FleetProject(tmp_path / "a", {"template-whoa": "v3.0.0"}),
+        FleetProject(
+            manifest.parent / "../b", {"template-whoa": "v3.0.0", "template-infra": "v1.0.0"}
+        ),
+        FleetProject(
+            manifest.parent / "../c", {"template-whoa": "v3.0.0", "template-infra": "v2.0.0"}
+        ),
+    ]
+
+
+@pytest.mark.parametrize(
+    ("content", "error"),
+    [
+        ("projects:\n  - versions: {}\n", "Project 1 of manifest .* should be a path"),
+        ("projects:\n  - ../a\n  - [../b]\n", "Project 2 of manifest .* should be a path"),
+        ("versions: v1.0.0\nprojects:\n  - ../a\n", "Manifest .* should have `versions`"),
+        (
+            "projects:\n  - path: ../a\n    versions: [v1.0.0]\n",
+            "Project 1 of manifest .* should have `versions`",
+        ),
+    ],
+)
+def test_load_projects_invalid_manifest(tmp_path, content, error):
+    manifest = tmp_path / "fleet.yml"
+    manifest.write_text(content)
+
+    with pytest.raises(ValueError, match=error):
+        load_projects([manifest])
+
+
+def test_fleet_update_invalid_manifest(tmp_path):
+    manifest = tmp_path / "fleet.yml"
+    manifest.write_text("projects:\n  - versions: {}\n")
+
+    result = CliRunner().invoke(nava_cli, ["fleet", "update", str(manifest)])
+
+    assert result.exit_code == 1
+    assert "Project 1 of manifest" in result.output
+
+
+def test_fleet_update(cli, tmp_path, infra_template, new_project, other_project):
+    ChangeSet([FileChange("infra/{{app_name}}/main.tf", "", "changed\n")]).apply(
+        infra_template.template_dir
+    )
+    infra_template.git_project.commit_all("Change template")
+    infra_template.git_project.tag("v0.1.0")
+    report = tmp_path / "report.json"
+
+    result = cli(
+        [
+            "fleet",
+            "update",
+            str(new_project.dir),
+            str(other_project.dir),
+            "--jobs",
+            "2",
+            "--report",
+            str(report),
+        ]
+    )
+
+    assert "updated" in result.output
+    assert (new_project.dir / "infra/foo/main.tf").read_text() == "changed\n"
+    assert (other_project.dir / "infra/bar/main.tf").read_text() == "changed\n"
+    assert new_project.git.is_clean()
+    assert other_project.git.is_clean()
+
+    results = json.loads(report.read_text())["projects"]
+    assert [r["status"] for r in results] == ["updated", "updated"]
+    assert [r["path"] for r in results] == [str(new_project.dir), str(other_project.dir)]
+    assert all(r["duration"] > 0 for r in results)
+
+
+def test_fleet_update_conflicts(tmp_path, new_project, other_project, merge_conflict):
+    report = tmp_path / "report.json"
+
+    result = CliRunner().invoke(
+        nava_cli,
+        ["fleet", "update", str(new_project.dir), str(other_project.dir), "--report", str(report)],
+    )
+    print(result.output)
+
+    assert result.exit_code == 1
+    results = json.loads(report.read_text())["projects"]
+    assert [r["status"] for r in results] == ["merge conflicts", "updated"]
+    assert "infra/project-config/main.tf" in results[0]["conflicts"]
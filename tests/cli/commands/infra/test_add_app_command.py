@@ -94,3 +94,67 @@ def test_add_app_uses_existing_template_version(cli, infra_template, new_project
     assert new_project.template_version == existing_template_version
     assert (new_project.dir / "infra/modules/service/main.tf").read_text() == ""
     assert (new_project.dir / "infra/foo/main.tf").read_text() == ""
+
+
+def test_add_app_only_commits_template_changes(cli, infra_template, new_project, clean_install):
+    (new_project.dir / "unrelated.txt").write_text("not from the template")
+
+    cli(
+        [
+            "infra",
+            "add-app",
+            str(new_project.dir),
+            "bar",
+            "--template-uri",
+            str(infra_template.template_dir),
+        ]
+    )
+
+    status = new_project.git.status()
+    assert status.untracked == ["unrelated.txt"]
+    assert status.changed == []
+
+    committed = new_project.git._run_cmd(["git", "show", "--name-only", "--format=", "HEAD"])
+    assert "infra/bar/main.tf" in committed.stdout.splitlines()
+    assert "unrelated.txt" not in committed.stdout.splitlines()
+
+
+def test_add_app_renders_include_from_excluded_dir(cli, infra_template, new_project):
+    # only the app's own files are rendered, but the rest of the template is
+    # still there to include from
+    ChangeSet(
+        [
+            FileChange("infra/modules/service/main.tf", "", "shared service config\n"),
+        ]
+    ).apply(infra_template.template_dir)
+    (infra_template.template_dir / "infra/{{app_name}}/main.tf").unlink()
+    (infra_template.template_dir / "infra/{{app_name}}/main.tf.jinja").write_text(
+        '{% include "infra/modules/service/main.tf" %}'
+    )
+    infra_template.git_project.commit_all("Include shared config in apps")
+    infra_template.git_project.tag("v0.1.0")
+
+    cli(
+        [
+            "infra",
+            "install",
+            "--commit",
+            "--template-uri",
+            str(infra_template.template_dir),
+            str(new_project.dir),
+        ],
+        input="foo\n",
+    )
+    cli(
+        [
+            "infra",
+            "add-app",
+            str(new_project.dir),
+            "bar",
+            "--template-uri",
+            str(infra_template.template_dir),
+        ]
+    )
+
+    assert (new_project.dir / "infra/foo/main.tf").read_text() == "shared service config\n"
+    assert (new_project.dir / "infra/bar/main.tf").read_text() == "shared service config\n"
@@ -1,3 +1,5 @@
+import warnings
+
 import pytest
 from copier.errors import DirtyLocalWarning
 
@@ -67,6 +69,27 @@ def test_install_with_data_app_name(cli, infra_template, new_project):
     assert new_project.template_version == infra_template.commit
 
 
+def test_install_parallel_rendering(cli, infra_template, new_project):
+    cli(
+        [
+            "infra",
+            "install",
+            str(new_project.dir),
+            "--template-uri",
+            str(infra_template.template_dir),
+            "--data",
+            "app_name=foo",
+            "--jobs",
+            "4",
+        ],
+    )
+
+    dir_content = DirectoryContent.from_fs(new_project.dir, ignore=[".git"])
+
+    assert dir_content.without(".template-infra") == INFRA_TEMPLATE_EXPECTED_CONTENT_FOR_APP_FOO
+    assert new_project.template_version == infra_template.commit
+
+
 def test_install_with_data_app_name_non_git_project(cli, infra_template, new_project_no_git):
     cli(
         [
@@ -153,7 +176,10 @@ def test_install_infra_template_dirty(cli, infra_template_dirty, new_project):
 
 
 def test_install_infra_template_dirty_version(cli, infra_template_dirty, new_project):
-    with pytest.warns(DirtyLocalWarning):
+    # a specific version is checked out on its own, so the dirty changes never
+    # come in to play
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", DirtyLocalWarning)
         cli(
             [
                 "infra",
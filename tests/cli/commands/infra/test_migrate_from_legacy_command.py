@@ -1,8 +1,12 @@
 import pytest
+from typer.testing import CliRunner
 
 from nava.platform.cli.commands.infra import migrate_from_legacy_command, update_command
 from nava.platform.cli.context import CliContext
+from nava.platform.cli.main import app as nava_cli
+from nava.platform.projects import migrate_from_legacy_template
 from nava.platform.projects.infra_project import InfraProject
+from nava.platform.util.git import GitProject
 from tests.lib import FileChange
 from tests.lib.changeset import ChangeSet
 from tests.lib.infra_template_writable import InfraTemplateWritable
@@ -91,6 +95,141 @@ def test_migrate_from_legacy_with_multi_app_project(
     assert (project.dir / "infra/bar/main.tf").read_text() == "changed\n"
 
 
+def test_migrate_from_legacy_resolves_migration_point_once(
+    infra_template: InfraTemplateWritable,
+    legacy_multi_app_project: InfraProject,
+    cli_context: CliContext,
+    mocker,
+):
+    clone = mocker.spy(GitProject, "clone_if_necessary")
+    resolve = mocker.spy(migrate_from_legacy_template, "get_closest_migration_tag")
+
+    migrate_from_legacy_command.migrate_from_legacy(
+        cli_context, str(legacy_multi_app_project.dir), str(infra_template.template_dir)
+    )
+
+    # for the base and both apps
+    assert clone.call_count == 1
+    assert resolve.call_count == 1
+    assert (legacy_multi_app_project.dir / ".template-infra/app-bar.yml").exists()
+
+
+def test_migrate_many_from_legacy(
+    infra_template: InfraTemplateWritable,
+    legacy_project: InfraProject,
+    tmp_path,
+    mocker,
+):
+    other_project = InfraProject(tmp_path / "other-project")
+    other_project.dir.mkdir()
+    other_project.git.init()
+    infra_template.install(other_project, ["bar"])
+    convert_project_to_legacy(other_project, infra_template.commit_hash)
+    other_project.git.commit_all("Legacy install")
+
+    not_legacy = tmp_path / "not-legacy"
+    not_legacy.mkdir()
+
+    resolve = mocker.spy(migrate_from_legacy_template, "get_closest_migration_tag")
+
+    result = CliRunner().invoke(
+        nava_cli,
+        [
+            "infra",
+            "migrate-from-legacy",
+            "--origin-template-uri",
+            str(infra_template.template_dir),
+            str(legacy_project.dir),
+            str(not_legacy),
+            str(other_project.dir),
+        ],
+    )
+
+    # the same legacy version for both
+    assert resolve.call_count == 1
+    for project in [legacy_project, other_project]:
+        assert not project.has_legacy_version_file
+        assert project.base_answers_file().exists()
+
+    assert result.exit_code == 1
+    assert "Migrated 2 of 3 projects." in result.output
+
+
+PROJECT_CONFIG_MAIN_TF = """
+locals {
+  # Machine readable project name (lower case letters, dashes, and underscores)
+  project_name = "my-project"
+
+  # Project owner (e.g. navapbc). Used for tagging infra resources.
+  owner = "navapbc"
+
+  code_repository_url = "https://github.com/navapbc/my-project"
+
+  default_region = "us-east-1"
+
+  github_actions_role_name = "${local.project_name}-github-actions"
+}
+"""
+
+PROJECT_CONFIG_OUTPUTS_TF = """
+output "project_name" {
+  value = local.project_name
+}
+
+output "owner" {
+  value = local.owner
+}
+
+output "code_repository_url" {
+  value = local.code_repository_url
+}
+
+output "default_region" {
+  value = local.default_region
+}
+"""
+
+
+def test_answers_from_project_config_read_statically(cli_context: CliContext, tmp_path, mocker):
+    project_config_dir = tmp_path / "infra/project-config"
+    project_config_dir.mkdir(parents=True)
+    (project_config_dir / "main.tf").write_text(PROJECT_CONFIG_MAIN_TF)
+    (project_config_dir / "outputs.tf").write_text(PROJECT_CONFIG_OUTPUTS_TF)
+    terraform = mocker.patch.object(migrate_from_legacy_command, "_terraform_project_config")
+
+    answers = migrate_from_legacy_command._answers_from_project_config(cli_context, tmp_path)
+
+    assert answers == {
+        "base_project_name": "my-project",
+        "base_owner": "navapbc",
+        "base_code_repository_url": "https://github.com/navapbc/my-project",
+        "base_default_region": "us-east-1",
+    }
+    terraform.assert_not_called()
+
+
+def test_answers_from_project_config_falls_back_to_terraform(
+    cli_context: CliContext, tmp_path, mocker
+):
+    project_config_dir = tmp_path / "infra/project-config"
+    project_config_dir.mkdir(parents=True)
+    (project_config_dir / "main.tf").write_text(
+        PROJECT_CONFIG_MAIN_TF.replace('"us-east-1"', "var.region")
+    )
+    (project_config_dir / "outputs.tf").write_text(PROJECT_CONFIG_OUTPUTS_TF)
+    terraform = mocker.patch.object(
+        migrate_from_legacy_command,
+        "_terraform_project_config",
+        return_value={"default_region": "us-west-2"},
+    )
+
+    answers = migrate_from_legacy_command._answers_from_project_config(cli_context, tmp_path)
+
+    assert answers["base_project_name"] == "my-project"
+    assert answers["base_default_region"] == "us-west-2"
+    terraform.assert_called_once_with(cli_context, project_config_dir)
+
+
 def convert_project_to_legacy(project: InfraProject, template_version: str) -> None:
     # Delete .infra-template folder
     for path in (project.dir / ".template-infra").iterdir():
@@ -0,0 +1,29 @@
+from typer.testing import CliRunner
+
+from nava.platform.cli.main import app as nava_cli
+from nava.platform.templates import checkouts
+
+
+def test_outdated_up_to_date(cli, infra_template, new_project, clean_install, monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("should not need a checkout of the template")
+
+    monkeypatch.setattr(checkouts.template_checkouts, "checkout", fail)
+
+    result = cli(["infra", "outdated", str(new_project.dir)])
+
+    assert "outdated" not in result.output
+    assert "up to date" in result.output
+
+
+def test_outdated_new_version(infra_template, new_project, clean_install):
+    (infra_template.template_dir / "new-file.txt").write_text("new")
+    infra_template.git_project.commit_all("Change template")
+    infra_template.git_project.tag("v0.1.0")
+
+    result = CliRunner().invoke(nava_cli, ["infra", "outdated", str(new_project.dir)])
+    print(result.output)
+
+    assert result.exit_code == 1
+    assert "v0.1.0" in result.output
+    assert "outdated" in result.output
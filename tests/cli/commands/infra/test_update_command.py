@@ -1,9 +1,18 @@
+import shutil
+import subprocess
+import warnings
+from pathlib import Path
+
 import pytest
 from copier.errors import DirtyLocalWarning
 from typer.testing import CliRunner
 
+from nava.platform.cli.commands.infra import update_command
 from nava.platform.cli.main import app as nava_cli
 from nava.platform.projects.infra_project import InfraProject
+from nava.platform.templates import checkouts
+from nava.platform.templates.infra_template import InfraTemplate
+from nava.platform.templates.template import Template
 from tests.lib import DirectoryContent, FileChange
 from tests.lib.changeset import ChangeSet
 from tests.lib.infra_template_writable import InfraTemplateWritable
@@ -73,6 +82,29 @@ def test_update_with_template_change(cli, infra_template, new_project, clean_ins
     assert (new_project.dir / "infra/foo/main.tf").read_text() == "changed\n"
 
 
+def test_update_with_ignored_template_file(cli, infra_template, new_project, clean_install):
+    (new_project.dir / ".gitignore").write_text("infra/generated.txt\n")
+    new_project.git.commit_all("Ignore generated file")
+    (infra_template.template_dir / "infra/generated.txt").write_text("generated\n")
+    infra_template.git_project.commit_all("Add generated file")
+    infra_template.git_project.tag("v0.1.0")
+
+    cli(
+        [
+            "infra",
+            "update-base",
+            str(new_project.dir),
+            "--template-uri",
+            str(infra_template.template_dir),
+        ]
+    )
+
+    assert (new_project.dir / "infra/generated.txt").exists()
+    tracked = new_project.git._run_cmd(["git", "ls-files", "infra/generated.txt"])
+    assert tracked.stdout == ""
+    assert new_project.git.is_clean()
+
+
 @pytest.mark.skip(reason="is flaky")
 def test_update_with_dirty_template(cli, clean_install, infra_template_dirty, new_project):
     cli(
@@ -105,7 +137,10 @@ def test_update_with_dirty_template_with_version(
     tag_name = "dirty-version"
     infra_template_dirty.git_project.tag(tag_name)
 
-    with pytest.warns(DirtyLocalWarning):
+    # a specific version is checked out on its own, so the dirty changes never
+    # come in to play
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", DirtyLocalWarning)
         cli(
             [
                 "infra",
@@ -193,3 +228,270 @@ def test_update_with_data(
     )
 
     assert (new_project.dir / "bar.txt").read_text() == "new file\n"
+
+
+@pytest.fixture
+def two_app_install(cli, infra_template, new_project, clean_install):
+    cli(
+        [
+            "infra",
+            "add-app",
+            str(new_project.dir),
+            "bar",
+            "--template-uri",
+            str(infra_template.template_dir),
+        ]
+    )
+
+
+def test_update_apps_in_parallel(cli, infra_template, new_project, two_app_install):
+    ChangeSet(
+        [
+            FileChange("infra/modules/service/main.tf", "", "changed\n"),
+            FileChange("infra/{{app_name}}/main.tf", "", "changed\n"),
+        ]
+    ).apply(infra_template.template_dir)
+    infra_template.git_project.commit_all("Change template")
+    infra_template.git_project.tag("v0.1.0")
+
+    result = cli(
+        [
+            "infra",
+            "update",
+            str(new_project.dir),
+            "--template-uri",
+            str(infra_template.template_dir),
+            "--jobs",
+            "2",
+        ]
+    )
+
+    assert new_project.template_version == infra_template.commit
+    assert (new_project.dir / "infra/modules/service/main.tf").read_text() == "changed\n"
+    assert (new_project.dir / "infra/foo/main.tf").read_text() == "changed\n"
+    assert (new_project.dir / "infra/bar/main.tf").read_text() == "changed\n"
+    assert new_project.git.status().is_clean
+
+    # replayed in app order
+    subjects = new_project.git.log("-3", "--format=%s").stdout.splitlines()
+    assert subjects[0].startswith("foo: Update")
+    assert subjects[1].startswith("bar: Update")
+    assert subjects[2].startswith("Update `template-infra:base`")
+    assert "updated" in result.output
+
+    worktrees = new_project.git._run_cmd(["git", "worktree", "list", "--porcelain"])
+    assert worktrees.stdout.count("worktree ") == 1
+
+
+def test_update_apps_in_parallel_passes_options_on(
+    cli, infra_template, new_project, two_app_install, mocker
+):
+    run = mocker.spy(subprocess, "run")
+
+    cli(
+        [
+            "--verbose",
+            "infra",
+            "update-app",
+            str(new_project.dir),
+            "--all",
+            "--commit",
+            "--template-uri",
+            str(infra_template.template_dir),
+            "--jobs",
+            "2",
+        ]
+    )
+
+    children = [call for call in run.call_args_list if "nava.platform.cli.main" in call.args[0]]
+    assert len(children) == 2
+    for call in children:
+        args = call.args[0]
+        assert args[3:6] == ["--verbose", "infra", "update-app"]
+        assert args[args.index("--jobs") + 1] == "2"
+        env = call.kwargs["env"]
+        assert env[checkouts.SHARED_ROOT_ENV_VAR] == str(checkouts.template_checkouts.root)
+
+
+def test_update_apps_with_jobs_without_commit(
+    cli, infra_template, new_project, two_app_install, mocker
+):
+    # each app is updated in turn, without commits in between a real second
+    # update would refuse to run on the dirty project
+    update_app = mocker.patch.object(InfraTemplate, "update_app")
+    in_parallel = mocker.spy(update_command, "update_apps_in_parallel")
+
+    result = cli(
+        [
+            "infra",
+            "update-app",
+            str(new_project.dir),
+            "foo",
+            "bar",
+            "--no-commit",
+            "--template-uri",
+            str(infra_template.template_dir),
+            "--jobs",
+            "2",
+        ]
+    )
+
+    assert "only updated in parallel with --commit" in result.output
+    in_parallel.assert_not_called()
+    assert [c.args[1] for c in update_app.call_args_list] == ["foo", "bar"]
+    assert all(c.kwargs["commit"] is False for c in update_app.call_args_list)
+
+
+def test_update_apps_in_parallel_with_merge_conflict(
+    cli, infra_template, new_project, two_app_install
+):
+    ChangeSet([FileChange("infra/{{app_name}}/main.tf", "", "template change\n")]).apply(
+        infra_template.template_dir
+    )
+    infra_template.git_project.commit_all("Change template")
+    infra_template.git_project.tag("v0.1.0")
+
+    (new_project.dir / "infra/foo/main.tf").write_text("project change\n")
+    new_project.git.commit_all("Change project")
+
+    runner = CliRunner()
+    result = runner.invoke(
+        nava_cli,
+        [
+            "infra",
+            "update-app",
+            str(new_project.dir),
+            "--all",
+            "--template-uri",
+            str(infra_template.template_dir),
+            "--jobs",
+            "2",
+        ],
+    )
+
+    assert result.exit_code == 1
+    assert "Merge conflicts updating foo" in result.output
+    assert (new_project.dir / "infra/bar/main.tf").read_text() == "template change\n"
+    assert (new_project.dir / "infra/foo/main.tf").read_text() == "project change\n"
+    assert new_project.git.status().is_clean
+
+    # the conflicts are kept to be resolved, in a worktree of their own
+    worktrees = new_project.git._run_cmd(["git", "worktree", "list", "--porcelain"]).stdout
+    worktree = Path(worktrees.split("worktree ")[2].splitlines()[0])
+    assert worktree.name == "foo"
+    assert f"resolve them in {worktree}" in result.output.replace("\n", "")
+    assert "infra/foo/main.tf" in result.output
+    assert "<<<<<<<" in (worktree / "infra/foo/main.tf").read_text()
+
+    new_project.git.remove_worktree(worktree)
+    shutil.rmtree(worktree.parent)
+
+
+def test_apply_app_update_with_merge_conflict(new_project, tmp_path):
+    git = new_project.git
+    (new_project.dir / "shared.txt").write_text("before\n")
+    git.commit_all("Add shared file")
+    base = git.get_commit_hash_for_head()
+
+    (new_project.dir / "shared.txt").write_text("app update\n")
+    git.commit_all("App update")
+    app_commit = git.get_commit_hash_for_head()
+    assert app_commit
+
+    git.reset("--hard", base)
+    (new_project.dir / "shared.txt").write_text("another app update\n")
+    git.commit_all("Another app update")
+
+    result = update_command.AppUpdateResult(
+        app_name="foo", worktree=tmp_path / "foo", returncode=0, output="", commit=app_commit
+    )
+    update_command._apply_app_update(git, result)
+
+    assert result.status == "merge conflicts"
+    assert result.conflicts == ["shared.txt"]
+    assert f"git cherry-pick {app_commit}" in result.resolve_instructions()
+    assert git.status().is_clean
+
+
+def test_update_no_change_only_checks_out_installed_version(
+    cli, infra_template, new_project, clean_install, monkeypatch
+):
+    installed_version = new_project.template_version
+    checkout = checkouts.template_checkouts.checkout
+    refs = []
+
+    def record_checkout(url, ref, *args, **kwargs):
+        refs.append(ref)
+        return checkout(url, ref, *args, **kwargs)
+
+    monkeypatch.setattr(checkouts.template_checkouts, "checkout", record_checkout)
+
+    result = cli(["infra", "update", str(new_project.dir)])
+
+    assert "Already up to date" in result.output
+    # only to regenerate the network config, the apps need no checkout at all
+    assert refs == [installed_version]
+    assert new_project.git.status().is_clean
+
+
+@pytest.fixture
+def network_config_template(infra_template: InfraTemplateWritable) -> InfraTemplateWritable:
+    networks_dir = infra_template.template_dir / "infra/networks"
+    (networks_dir / "main.tf").unlink()
+    (networks_dir / "main.tf.jinja").write_text("{{ app_names | default([]) | join(',') }}\n")
+    infra_template.git_project.commit_all("Render network config of apps")
+    infra_template.git_project.tag("v0.1.0")
+    return infra_template
+
+
+def test_update_base_up_to_date_regenerates_network_config(
+    cli, network_config_template, new_project, clean_install
+):
+    # an app added without `add-app`, so the network config doesn't have it yet
+    answers_dir = new_project.dir / ".template-infra"
+    (answers_dir / "app-bar.yml").write_text(
+        (answers_dir / "app-foo.yml").read_text().replace("app_name: foo", "app_name: bar")
+    )
+    new_project.git.commit_all("Add bar app")
+
+    result = cli(
+        [
+            "infra",
+            "update-base",
+            str(new_project.dir),
+            "--template-uri",
+            str(network_config_template.template_dir),
+        ]
+    )
+
+    assert "Already up to date" in result.output
+    assert (new_project.dir / "infra/networks/main.tf").read_text() == "bar,foo\n"
+    assert new_project.git.status().is_clean
+
+
+def test_update_base_with_data_not_skipped_when_up_to_date(
+    cli, infra_template, new_project, clean_install, monkeypatch
+):
+    update = Template.update
+    calls = []
+
+    def record_update(self, project, app_name, **kwargs):
+        calls.append((app_name, kwargs["data"]))
+        return update(self, project, app_name, **kwargs)
+
+    monkeypatch.setattr(Template, "update", record_update)
+
+    cli(
+        [
+            "infra",
+            "update-base",
+            str(new_project.dir),
+            "--template-uri",
+            str(infra_template.template_dir),
+            "--data",
+            "foo=bar",
+        ]
+    )
+
+    # left to the template to decide what to do with the data
+    assert calls == [("base", {"foo": "bar"})]
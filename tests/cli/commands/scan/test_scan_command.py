@@ -0,0 +1,37 @@
+import csv
+import io
+import json
+
+from nava.platform.cli.commands.fleet.update_command import load_projects
+
+
+def test_scan_json(cli, new_project, clean_install):
+    result = cli(["scan", str(new_project.dir)])
+
+    inventory = json.loads(result.stdout)
+    assert [p["path"] for p in inventory["projects"]] == [str(new_project.dir.resolve())]
+    assert {(t["template"], t["app"]) for t in inventory["projects"][0]["templates"]} == {
+        ("template-infra", None),
+        ("template-infra", "foo"),
+    }
+
+
+def test_scan_fleet_manifest(tmp_path, cli, new_project, clean_install):
+    legacy_project = tmp_path / "legacy-project"
+    legacy_project.mkdir()
+    (legacy_project / ".template-version").write_text("abc123\n")
+    output = tmp_path / "fleet.json"
+
+    cli(["scan", "--format", "manifest", "--output", str(output), str(tmp_path)])
+
+    assert [p.path for p in load_projects([output])] == [new_project.dir.resolve()]
+
+
+def test_scan_csv(cli, new_project, clean_install):
+    result = cli(["scan", "--format", "csv", str(new_project.dir)])
+
+    rows = list(csv.DictReader(io.StringIO(result.stdout)))
+    assert [(row["project"], row["file"], row["legacy"]) for row in rows] == [
+        (str(new_project.dir.resolve()), ".template-infra/app-foo.yml", "False"),
+        (str(new_project.dir.resolve()), ".template-infra/base.yml", "False"),
+    ]
@@ -0,0 +1,63 @@
+import subprocess
+import sys
+
+import pytest
+
+# the whole CLI took over half a second to import before commands were loaded
+# lazily, generous enough to not be flaky, tight enough to catch a regression
+IMPORT_TIME_BUDGET_US = 250_000
+
+# only needed once a command actually does something (logging is needed for
+# the context every command gets, so isn't in here)
+HEAVY_MODULES = [
+    "copier",
+    "dunamai",
+    "jinja2",
+    "packaging",
+    "plumbum",
+    "questionary",
+    "yaml",
+]
+
+
+def import_times(*args: str) -> dict[str, int]:
+    """Cumulative import time in microseconds of every module imported running ``args``."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+
+        _, cumulative, module = line.removeprefix("import time:").split("|")
+        times[module.strip()] = int(cumulative)
+
+    return times
+
+
+def test_import_main_within_budget():
+    times = import_times("-c", "import nava.platform.cli.main")
+
+    assert times["nava.platform.cli.main"] < IMPORT_TIME_BUDGET_US
+
+
+@pytest.mark.parametrize(
+    "command",
+    [
+        ["--help"],
+        ["infra", "--help"],
+        ["app", "--help"],
+        ["infra", "update", "--help"],
+        ["fleet", "--help"],
+        ["scan", "--help"],
+    ],
+)
+def test_help_does_not_import_heavy_modules(command):
+    times = import_times("-m", "nava.platform.cli.main", *command)
+
+    assert [module for module in HEAVY_MODULES if module in times] == []
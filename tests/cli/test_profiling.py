@@ -0,0 +1,62 @@
+import pstats
+
+from typer.testing import CliRunner
+
+import nava.platform.cli.logging
+from nava.platform.cli.main import app as nava_cli
+
+
+def test_profile_to_path(tmp_path, mocker):
+    add_exit_fields = mocker.spy(nava.platform.cli.logging, "add_exit_fields")
+    prof = tmp_path / "profiles" / "scan.prof"
+
+    result = CliRunner().invoke(
+        nava_cli, ["--profile-output", str(prof), "--profile-stacks", "scan", str(tmp_path)]
+    )
+
+    assert result.exit_code == 0, result.output
+    assert pstats.Stats(str(prof)).get_stats_profile().total_tt > 0
+    assert "functions by cumulative time" in prof.with_suffix(".txt").read_text()
+    assert prof.with_suffix(".collapsed").exists()
+    add_exit_fields.assert_called_once_with(
+        profile=str(prof),
+        profile_summary=str(prof.with_suffix(".txt")),
+        profile_stacks=str(prof.with_suffix(".collapsed")),
+    )
+
+
+def test_profile_to_default_path(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_STATE_HOME", str(tmp_path / "state"))
+
+    result = CliRunner().invoke(nava_cli, ["--profile", "scan", str(tmp_path)])
+
+    assert result.exit_code == 0, result.output
+    profiles = list((tmp_path / "state").glob("**/profiles/*-scan.*"))
+    assert sorted(p.suffix for p in profiles) == [".prof", ".txt"]
+
+
+def test_profile_output_relative_to_start(tmp_path, monkeypatch, mocker):
+    monkeypatch.chdir(tmp_path)
+    add_exit_fields = mocker.spy(nava.platform.cli.logging, "add_exit_fields")
+
+    def change_dir(*args, **kwargs):
+        monkeypatch.chdir(tmp_path / "elsewhere")
+        return []
+
+    (tmp_path / "elsewhere").mkdir()
+    mocker.patch("nava.platform.projects.scan.scan", side_effect=change_dir)
+
+    result = CliRunner().invoke(nava_cli, ["--profile-output", "out.prof", "scan", str(tmp_path)])
+
+    assert result.exit_code == 0, result.output
+    assert (tmp_path / "out.prof").exists()
+    assert add_exit_fields.call_args.kwargs["profile"] == str(tmp_path / "out.prof")
+
+
+def test_no_profile_by_default(tmp_path, mocker):
+    add_exit_fields = mocker.spy(nava.platform.cli.logging, "add_exit_fields")
+
+    result = CliRunner().invoke(nava_cli, ["scan", str(tmp_path)])
+
+    assert result.exit_code == 0, result.output
+    add_exit_fields.assert_not_called()
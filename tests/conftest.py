@@ -1,4 +1,5 @@
 import logging
+import logging.config
 from collections.abc import Callable
 from pathlib import Path
 from typing import ParamSpec, TypeVar
@@ -48,6 +49,11 @@ def disable_file_logging(monkeypatch: pytest.MonkeyPatch):
     monkeypatch.setenv("LOG_TO_FILE", "false")
 
 
+@pytest.fixture(autouse=True)
+def isolate_cache_dir(monkeypatch: pytest.MonkeyPatch, tmp_path_factory: pytest.TempPathFactory):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path_factory.mktemp("cache")))
+
+
 @pytest.fixture
 def template_directory_content() -> DirectoryContent:
     return DirectoryContent(
@@ -0,0 +1,84 @@
+import os
+from pathlib import Path
+
+import yaml
+
+from nava.platform.projects.infra_project import InfraProject
+from nava.platform.projects.project_state import ProjectState, project_state
+from tests.lib import DirectoryContent
+
+
+def count_loads(monkeypatch) -> list[int]:
+    loads = [0]
+    real_load = yaml.load
+
+    def load(*args, **kwargs):
+        loads[0] += 1
+        return real_load(*args, **kwargs)
+
+    monkeypatch.setattr(yaml, "load", load)
+    return loads
+
+
+def test_answers_parsed_once(tmp_path, monkeypatch):
+    DirectoryContent({".template-infra": {"base.yml": "_commit: v0.1.0\n"}}).to_fs(str(tmp_path))
+    loads = count_loads(monkeypatch)
+    state = ProjectState(tmp_path)
+
+    assert state.answers(Path(".template-infra/base.yml")) == {"_commit": "v0.1.0"}
+    assert state.answers(Path(".template-infra/base.yml")) == {"_commit": "v0.1.0"}
+    assert loads[0] == 1
+
+
+def test_answers_reloaded_on_change(tmp_path):
+    answers_file = tmp_path / ".template-infra/base.yml"
+    answers_file.parent.mkdir()
+    answers_file.write_text("_commit: v0.1.0\n")
+    state = ProjectState(tmp_path)
+
+    assert state.answers(Path(".template-infra/base.yml")) == {"_commit": "v0.1.0"}
+
+    # same size, and even the same modification time
+    stat = answers_file.stat()
+    answers_file.write_text("_commit: v0.2.0\n")
+    os.utime(answers_file, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+    assert state.answers(Path(".template-infra/base.yml")) == {"_commit": "v0.2.0"}
+
+
+def test_answers_copies(tmp_path):
+    DirectoryContent({".template-infra": {"base.yml": "_commit: v0.1.0\n"}}).to_fs(str(tmp_path))
+    state = ProjectState(tmp_path)
+
+    answers = state.answers(Path(".template-infra/base.yml"))
+    assert answers is not None
+    answers["_commit"] = "changed"
+
+    assert state.answers(Path(".template-infra/base.yml")) == {"_commit": "v0.1.0"}
+
+
+def test_answers_missing_or_not_a_mapping(tmp_path):
+    DirectoryContent({".template-infra": {"base.yml": "blah"}}).to_fs(str(tmp_path))
+    state = ProjectState(tmp_path)
+
+    assert state.answers(Path(".template-infra/app-foo.yml")) is None
+    assert state.answers(Path(".template-infra/base.yml")) == {}
+
+
+def test_listing_follows_changes(tmp_path):
+    DirectoryContent({".template-infra": {"base.yml": "", "app-foo.yml": ""}}).to_fs(str(tmp_path))
+    project = InfraProject(tmp_path)
+
+    assert project.app_names == ["foo"]
+
+    (tmp_path / ".template-infra/app-bar.yml").write_text("")
+    (tmp_path / ".template-infra/app-foo.yml").unlink()
+    (tmp_path / ".template-whoa").mkdir()
+
+    assert project.app_names == ["bar"]
+    assert set(project.installed_template_names()) == {"template-infra", "template-whoa"}
+
+
+def test_shared_per_project(tmp_path):
+    assert project_state(tmp_path) is project_state(tmp_path / "foo" / "..")
+    assert InfraProject(tmp_path).state is project_state(tmp_path)
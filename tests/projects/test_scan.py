@@ -0,0 +1,81 @@
+from nava.platform.projects.scan import InstalledTemplate, LegacyVersionFile, scan
+from tests.lib import DirectoryContent
+
+
+def test_scan(tmp_path):
+    DirectoryContent(
+        {
+            "org": {
+                "project-a": {
+                    ".template-infra": {
+                        "base.yml": "_commit: v0.15.0\n_src_path: https://github.com/navapbc/template-infra\n",
+                        "app-foo.yml": "_commit: v0.15.0\n",
+                    },
+                    ".template-application-rails": {"foo.yml": "_commit: v0.5.0\n"},
+                    # projects aren't descended into
+                    "nested": {".template-infra": {"base.yml": "_commit: v0.1.0\n"}},
+                },
+                "legacy-project": {
+                    ".template-version": "abc123\n",
+                    ".template-application-nextjs-version": "def456\n",
+                },
+                "not-a-project": {"README.md": "", "src": {"main.py": ""}},
+            },
+            "node_modules": {"pkg": {".template-infra": {"base.yml": "_commit: v0.1.0\n"}}},
+        }
+    ).to_fs(str(tmp_path))
+
+    projects = scan(tmp_path, jobs=4)
+
+    assert [p.path for p in projects] == [
+        str(tmp_path / "org/legacy-project"),
+        str(tmp_path / "org/project-a"),
+    ]
+
+    legacy_project, project_a = projects
+    assert legacy_project.templates == []
+    assert legacy_project.legacy == [
+        LegacyVersionFile(
+            template="template-application-nextjs",
+            file=".template-application-nextjs-version",
+            version="def456",
+        ),
+        LegacyVersionFile(template="template-infra", file=".template-version", version="abc123"),
+    ]
+
+    assert project_a.legacy == []
+    assert project_a.templates == [
+        InstalledTemplate(
+            template="template-application-rails",
+            answers_file=".template-application-rails/foo.yml",
+            app="foo",
+            commit="v0.5.0",
+            src_path=None,
+        ),
+        InstalledTemplate(
+            template="template-infra",
+            answers_file=".template-infra/app-foo.yml",
+            app="foo",
+            commit="v0.15.0",
+            src_path=None,
+        ),
+        InstalledTemplate(
+            template="template-infra",
+            answers_file=".template-infra/base.yml",
+            app=None,
+            commit="v0.15.0",
+            src_path="https://github.com/navapbc/template-infra",
+        ),
+    ]
+
+
+def test_scan_root_is_project(tmp_path):
+    (tmp_path / ".template-infra").mkdir()
+
+    assert [p.path for p in scan(tmp_path)] == [str(tmp_path)]
+
+
+def test_scan_no_projects(tmp_path):
+    (tmp_path / "empty").mkdir()
+
+    assert scan(tmp_path) == []
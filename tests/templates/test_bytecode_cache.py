@@ -0,0 +1,63 @@
+from pathlib import Path
+
+import jinja2
+
+from nava.platform.copier_worker import run_copy
+from nava.platform.templates.bytecode_cache import (
+    CACHE_FILE_SUFFIX,
+    JinjaBytecodeCache,
+    default_bytecode_cache_dir,
+)
+from tests.lib import DirectoryContent
+from tests.lib.new_directory import new_dir_with_git
+
+
+def make_env(cache: JinjaBytecodeCache, templates: dict[str, str]) -> jinja2.Environment:
+    return jinja2.Environment(loader=jinja2.DictLoader(templates), bytecode_cache=cache)
+
+
+def cache_entries(cache: JinjaBytecodeCache) -> list[Path]:
+    return sorted(cache.root.glob(f"*/*{CACHE_FILE_SUFFIX}"))
+
+
+def test_compiled_templates_reused_across_environments(tmp_path):
+    cache = JinjaBytecodeCache(tmp_path, "commit-a")
+    templates = {"foo.txt": "Hello {{ name }}"}
+
+    assert make_env(cache, templates).get_template("foo.txt").render(name="a") == "Hello a"
+    entries = cache_entries(cache)
+    assert len(entries) == 1
+
+    env = make_env(cache, templates)
+    bucket = cache.get_bucket(env, "foo.txt", None, templates["foo.txt"])
+    assert bucket.code is not None
+    assert env.get_template("foo.txt").render(name="b") == "Hello b"
+    assert cache_entries(cache) == entries
+
+
+def test_keyed_by_source_and_namespace(tmp_path):
+    make_env(JinjaBytecodeCache(tmp_path, "commit-a"), {"foo.txt": "1"}).get_template("foo.txt")
+    make_env(JinjaBytecodeCache(tmp_path, "commit-a"), {"foo.txt": "2"}).get_template("foo.txt")
+    make_env(JinjaBytecodeCache(tmp_path, "commit-b"), {"foo.txt": "1"}).get_template("foo.txt")
+
+    assert len(cache_entries(JinjaBytecodeCache(tmp_path))) == 3
+
+
+def test_size_bounded(tmp_path):
+    cache = JinjaBytecodeCache(tmp_path / "cache", max_size_bytes=1)
+    make_env(cache, {"foo.txt": "{{ foo }}"}).get_template("foo.txt")
+
+    # only the entry just written is kept
+    assert len(cache_entries(cache)) == 1
+
+
+def test_worker_uses_cache(tmp_path):
+    git = new_dir_with_git(tmp_path / "template")
+    DirectoryContent({"foo.txt.jinja": "{{ app_name }}", "bar.txt": "static"}).to_fs(str(git.dir))
+    git.commit_all("Initial commit")
+
+    for dst in ("a", "b"):
+        run_copy(str(git.dir), tmp_path / dst, data={"app_name": dst}, vcs_ref="HEAD", quiet=True)
+        assert (tmp_path / dst / "foo.txt").read_text() == dst
+
+    assert len(cache_entries(JinjaBytecodeCache(default_bytecode_cache_dir()))) == 1
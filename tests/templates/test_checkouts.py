@@ -0,0 +1,173 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+import nava.platform.util.git_mirror as git_mirror
+from nava.platform.templates.checkouts import TemplateCheckouts
+from nava.platform.util.git import GitProject
+from nava.platform.util.git_mirror import GitMirrorCache
+from tests.lib.new_directory import new_dir_with_git
+
+
+@pytest.fixture
+def template_repo(tmp_path):
+    git = new_dir_with_git(tmp_path / "template")
+    (git.dir / "version.txt").write_text("1")
+    git.commit_all("First")
+    git.tag("v0.1.0")
+    (git.dir / "version.txt").write_text("2")
+    git.commit_all("Second")
+    git.tag("v0.2.0")
+    git.tag("v0.3.0rc1")
+    return git
+
+
+@pytest.fixture
+def checkouts(tmp_path):
+    return TemplateCheckouts(tmp_path / "checkouts")
+
+
+def test_checkout_shared_per_commit(checkouts, template_repo):
+    url = str(template_repo.dir)
+
+    latest = checkouts.checkout(url, None)
+    by_tag = checkouts.checkout(url, "v0.2.0")
+    by_head = checkouts.checkout(url, "HEAD")
+    older = checkouts.checkout(url, "v0.1.0")
+
+    assert latest is not None
+    assert latest == by_tag == by_head
+    assert (latest / "version.txt").read_text() == "2"
+    assert checkouts.owns(latest)
+
+    assert older is not None
+    assert older != latest
+    assert (older / "version.txt").read_text() == "1"
+
+
+def test_checkout_dirty_local_head_not_shared(checkouts, template_repo):
+    (template_repo.dir / "version.txt").write_text("dirty")
+
+    assert checkouts.checkout(str(template_repo.dir), "HEAD") is None
+    assert checkouts.checkout(str(template_repo.dir), "v0.1.0") is not None
+
+
+def test_checkout_unknown_ref(checkouts, template_repo):
+    with pytest.raises(ValueError, match="Can not find"):
+        checkouts.checkout(str(template_repo.dir), "v9.9.9")
+
+
+def test_remote_tag_checkout_is_shallow_without_mirror(
+    checkouts, template_repo, tmp_path, monkeypatch
+):
+    cache = GitMirrorCache(tmp_path / "mirrors")
+    monkeypatch.setattr(git_mirror, "default_mirror_cache", lambda: cache)
+    url = template_repo.dir.as_uri()
+
+    checkout = checkouts.checkout(url, "v0.1.0")
+
+    assert checkout is not None
+    assert (checkout / "version.txt").read_text() == "1"
+    assert GitProject(checkout).get_commit_count() == 1
+    # what Copier records as the template version
+    assert GitProject(checkout).get_commit_description() == "v0.1.0"
+    assert not cache.mirror_path(url).exists()
+    assert checkouts.checkout(url, "v0.1.0") == checkout
+
+    # anything that isn't a tag needs the full history
+    by_head = checkouts.checkout(url, "HEAD")
+    assert by_head is not None
+    assert cache.mirror_path(url).exists()
+    assert GitProject(by_head).get_commit_count() == 2
+
+
+def test_checkout_sparse_from_src_exclude(checkouts, template_repo):
+    (template_repo.dir / "copier.yml").write_text("_src_exclude:\n  - skip-by-template.txt\n")
+    (template_repo.dir / "skip-by-template.txt").write_text("")
+    (template_repo.dir / "{{app_name}}").mkdir()
+    (template_repo.dir / "{{app_name}}" / "file.txt").write_text("")
+    template_repo.commit_all("More files")
+    url = str(template_repo.dir)
+
+    full = checkouts.checkout(url, "HEAD")
+    sparse = checkouts.checkout(url, "HEAD", src_exclude=["*", "!*{{app_name}}*"])
+
+    assert full is not None
+    assert sparse is not None
+    assert sparse != full
+    assert {p.name for p in full.iterdir()} >= {"version.txt", "skip-by-template.txt"}
+    assert {p.name for p in sparse.iterdir() if p.name != ".git"} == {"copier.yml", "{{app_name}}"}
+    assert checkouts.checkout(url, "HEAD", src_exclude=["*", "!*{{app_name}}*"]) == sparse
+
+    sparse_base = checkouts.checkout(url, "HEAD", src_exclude=["*{{app_name}}*"])
+    assert sparse_base is not None
+    assert {p.name for p in sparse_base.iterdir() if p.name != ".git"} == {
+        "copier.yml",
+        "version.txt",
+    }
+
+
+@pytest.mark.parametrize(
+    ("config", "app_template"),
+    [
+        ("{}", '{% include "shared/part.txt" %}'),
+        ("{}", '{%- from "shared/macros.jinja" import part %}{{ part() }}'),
+        ("_tasks:\n  - ./shared/task.sh\n", ""),
+        ("_migrations:\n  - ./shared/task.sh\n", ""),
+        ("_external_data:\n  shared: shared/data.yml\n", ""),
+    ],
+)
+def test_checkout_full_when_template_needs_excluded_files(
+    checkouts, template_repo, config, app_template
+):
+    (template_repo.dir / "copier.yml").write_text(config)
+    (template_repo.dir / "shared").mkdir()
+    (template_repo.dir / "shared" / "part.txt").write_text("")
+    (template_repo.dir / "{{app_name}}").mkdir()
+    (template_repo.dir / "{{app_name}}" / "file.txt.jinja").write_text(app_template)
+    template_repo.commit_all("More files")
+
+    checkout = checkouts.checkout(
+        str(template_repo.dir), "HEAD", src_exclude=["*", "!*{{app_name}}*"]
+    )
+
+    assert checkout is not None
+    assert (checkout / "shared" / "part.txt").exists()
+
+
+def test_checkout_sparse_when_only_excluded_templates_include(checkouts, template_repo):
+    (template_repo.dir / "copier.yml").write_text("{}")
+    (template_repo.dir / "shared").mkdir()
+    (template_repo.dir / "shared" / "part.txt.jinja").write_text('{% include "other.txt" %}')
+    (template_repo.dir / "{{app_name}}").mkdir()
+    (template_repo.dir / "{{app_name}}" / "file.txt").write_text("")
+    template_repo.commit_all("More files")
+
+    checkout = checkouts.checkout(
+        str(template_repo.dir), "HEAD", src_exclude=["*", "!*{{app_name}}*"]
+    )
+
+    assert checkout is not None
+    assert not (checkout / "shared").exists()
+
+
+def test_checkouts_shared_with_child_processes(checkouts, template_repo):
+    checkout = checkouts.checkout(str(template_repo.dir), "v0.1.0")
+
+    child = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys; from nava.platform.templates.checkouts import template_checkouts; "
+            "print(template_checkouts.checkout(sys.argv[1], 'v0.1.0'))",
+            str(template_repo.dir),
+        ],
+        env=os.environ | checkouts.child_env(),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    assert child.stdout.strip() == str(checkout)
@@ -0,0 +1,40 @@
+import subprocess
+
+import nava.platform.templates.remote_tags as remote_tags
+from nava.platform.templates.remote_tags import latest_template_tag, template_tags
+from tests.lib.new_directory import new_dir_with_git
+
+
+def test_local_and_remote_tags_match(tmp_path, monkeypatch):
+    monkeypatch.setattr(remote_tags, "_remote_tags", {})
+    git = new_dir_with_git(tmp_path / "template")
+    (git.dir / "README.md").write_text("hello")
+    git.commit_all("Initial commit")
+    for tag in ("v0.1.0", "v0.2.0", "v0.3.0rc1"):
+        git.tag(tag)
+
+    local_tags = template_tags(str(git.dir))
+    remote_tags_ = template_tags(f"git+file://{git.dir}")
+
+    assert local_tags is not None
+    assert remote_tags_ == local_tags
+    assert latest_template_tag(f"git+file://{git.dir}") == "v0.2.0"
+    assert latest_template_tag(str(git.dir), use_prereleases=True) == "v0.3.0rc1"
+
+
+def test_remote_tags_listed_once(tmp_path, monkeypatch):
+    monkeypatch.setattr(remote_tags, "_remote_tags", {})
+    git = new_dir_with_git(tmp_path / "template")
+    (git.dir / "README.md").write_text("hello")
+    git.commit_all("Initial commit")
+    git.tag("v0.1.0")
+    url = f"git+file://{git.dir}"
+
+    assert latest_template_tag(url) == "v0.1.0"
+
+    subprocess.run(["git", "tag", "v0.2.0"], cwd=git.dir, check=True)
+    assert latest_template_tag(url) == "v0.1.0"
+
+
+def test_not_a_repo(tmp_path):
+    assert template_tags(str(tmp_path)) is None
@@ -0,0 +1,168 @@
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from nava.platform.projects.infra_project import InfraProject
+from nava.platform.templates import checkouts, rendered_snapshots
+from nava.platform.util.git import run_text
+from tests.lib import DirectoryContent
+from tests.lib.changeset import ChangeSet, FileChange
+from tests.lib.infra_template_writable import InfraTemplateWritable
+from tests.lib.new_directory import new_dir_with_git
+
+BASE_REF = "refs/nava/rendered/template-infra/base"
+APP_REF = "refs/nava/rendered/template-infra/app-foo"
+ANSWERS_FILE = Path(".template-infra/base.yml")
+
+
+@pytest.fixture
+def checked_out_refs(monkeypatch) -> list[str | None]:
+    refs = []
+    checkout = checkouts.template_checkouts.checkout
+
+    def record_checkout(url, ref, *args, **kwargs):
+        refs.append(ref)
+        return checkout(url, ref, *args, **kwargs)
+
+    monkeypatch.setattr(checkouts.template_checkouts, "checkout", record_checkout)
+    return refs
+
+
+def update(
+    cli: Callable[..., Any], infra_template: InfraTemplateWritable, new_project: InfraProject
+) -> None:
+    cli(
+        [
+            "infra",
+            "update",
+            str(new_project.dir),
+            "--template-uri",
+            str(infra_template.template_dir),
+        ]
+    )
+
+
+def release_template_change(infra_template: InfraTemplateWritable, tag: str, content: str) -> None:
+    ChangeSet([FileChange("infra/modules/service/main.tf", "", content)]).apply(
+        infra_template.template_dir
+    )
+    infra_template.git_project.commit_all(f"Release {tag}")
+    infra_template.git_project.tag(tag)
+
+
+def refs(project_dir: Path) -> list[str]:
+    result = run_text(["git", "for-each-ref", "--format=%(refname)", "refs/nava"], cwd=project_dir)
+    return result.stdout.split()
+
+
+def test_record_find_restore(tmp_path):
+    project = new_dir_with_git(tmp_path / "project")
+    rendered = tmp_path / "rendered"
+    DirectoryContent(
+        {".template-infra": {"base.yml": "_commit: v0.1.0\n"}, "README.md": "hi\n"}
+    ).to_fs(str(rendered))
+    DirectoryContent({".template-infra": {"base.yml": "_commit: v0.1.0\n"}}).to_fs(str(project.dir))
+
+    rendered_snapshots.record(
+        project.dir,
+        BASE_REF,
+        rendered,
+        key="key",
+        commit="v0.1.0",
+        version="0.1.0",
+        config={"_subdirectory": "template"},
+    )
+
+    snapshot = rendered_snapshots.find(project.dir, BASE_REF, ANSWERS_FILE, "key")
+    assert snapshot is not None
+    assert (snapshot.commit, snapshot.version) == ("v0.1.0", "0.1.0")
+    assert snapshot.config == {"_subdirectory": "template"}
+
+    rendered_snapshots.restore(snapshot, tmp_path / "restored")
+    assert DirectoryContent.from_fs(tmp_path / "restored") == DirectoryContent.from_fs(rendered)
+
+    # rendered with other options
+    assert rendered_snapshots.find(project.dir, BASE_REF, ANSWERS_FILE, "other key") is None
+
+    # the project is on something else now
+    (project.dir / ANSWERS_FILE).write_text("_commit: v0.2.0\n")
+    assert rendered_snapshots.find(project.dir, BASE_REF, ANSWERS_FILE, "key") is None
+
+
+def test_install_records_snapshots(new_project, clean_install):
+    assert refs(new_project.dir) == [APP_REF, BASE_REF]
+
+    # out of the way of the project history
+    log = run_text(["git", "log", "--all", "--oneline"], cwd=new_project.dir).stdout
+    assert len(log.splitlines()) == 2
+
+
+def test_update_restores_old_version(
+    cli, infra_template, new_project, clean_install, checked_out_refs
+):
+    installed_version = new_project.template_version
+    release_template_change(infra_template, "v0.1.0", "v0.1.0\n")
+
+    update(cli, infra_template, new_project)
+
+    assert new_project.template_version == "v0.1.0"
+    assert (new_project.dir / "infra/modules/service/main.tf").read_text() == "v0.1.0\n"
+    assert installed_version not in checked_out_refs
+
+    release_template_change(infra_template, "v0.2.0", "v0.2.0\n")
+    checked_out_refs.clear()
+
+    update(cli, infra_template, new_project)
+
+    assert (new_project.dir / "infra/modules/service/main.tf").read_text() == "v0.2.0\n"
+    assert "v0.1.0" not in checked_out_refs
+
+
+def test_update_without_snapshot(cli, infra_template, new_project, clean_install, checked_out_refs):
+    installed_version = new_project.template_version
+    for ref in refs(new_project.dir):
+        rendered_snapshots.delete(new_project.dir, ref)
+    release_template_change(infra_template, "v0.1.0", "v0.1.0\n")
+
+    update(cli, infra_template, new_project)
+
+    assert (new_project.dir / "infra/modules/service/main.tf").read_text() == "v0.1.0\n"
+    assert installed_version in checked_out_refs
+    assert refs(new_project.dir) == [APP_REF, BASE_REF]
+
+
+def test_update_keeps_deleted_files_deleted(cli, infra_template, new_project, clean_install):
+    (new_project.dir / "infra/networks/main.tf").unlink()
+    new_project.git.commit_all("Delete networks")
+
+    for tag in ["v0.1.0", "v0.2.0"]:
+        release_template_change(infra_template, tag, f"{tag}\n")
+        update(cli, infra_template, new_project)
+
+    assert new_project.template_version == "v0.2.0"
+    assert not (new_project.dir / "infra/networks/main.tf").exists()
+
+    # as it was rendered, for the next update to see it was deleted
+    in_snapshot = run_text(
+        ["git", "cat-file", "-e", f"{BASE_REF}:files/infra/networks/main.tf"],
+        cwd=new_project.dir,
+    )
+    assert in_snapshot.returncode == 0
+
+
+def test_update_deletes_files_removed_from_template(
+    cli, infra_template, new_project, clean_install, checked_out_refs
+):
+    installed_version = new_project.template_version
+    (infra_template.template_dir / "infra/modules/database/main.tf").unlink()
+    release_template_change(infra_template, "v0.1.0", "v0.1.0\n")
+
+    update(cli, infra_template, new_project)
+
+    assert installed_version not in checked_out_refs
+    assert new_project.template_version == "v0.1.0"
+    assert not (new_project.dir / "infra/modules/database/main.tf").exists()
+    # the deletion is committed along with the rest of the update
+    assert new_project.git.is_clean()
@@ -0,0 +1,132 @@
+from pathlib import Path
+
+import pytest
+from pathspec import PathSpec
+
+from nava.platform.templates.src_exclude import sparse_checkout_patterns, src_exclude_matcher
+
+PATHS = [
+    "copier.yml",
+    "README.md",
+    ".template-infra/base.yml",
+    ".template-infra/{{app_name}}.yml",
+    "infra/modules/network/main.tf",
+    "infra/{{app_name}}/app-config/main.tf",
+    "infra/{{app_name}}/service/main.tf",
+    "infra/project-config/main.tf",
+]
+
+
+def kept(patterns: list[str]) -> set[str]:
+    """Which of PATHS the (simple, literal) sparse patterns select."""
+    result = set()
+    for path in PATHS:
+        for pattern in patterns:
+            pattern = pattern.replace("\\", "")
+            if pattern == "/*" or ("/" + path).startswith(pattern):
+                result.add(path)
+    return result
+
+
+def test_src_exclude_matcher_directories_cover_contents():
+    matcher = src_exclude_matcher(["*", "!*{{app_name}}*"])
+
+    assert matcher(Path("README.md"))
+    assert not matcher(Path("infra/{{app_name}}/service/main.tf"))
+
+
+def test_sparse_checkout_patterns_base():
+    patterns = sparse_checkout_patterns(PATHS, ["*{{app_name}}*"])
+
+    assert patterns == [
+        "/.template-infra/base.yml",
+        "/README.md",
+        "/copier.yml",
+        "/infra/modules/",
+        "/infra/project-config/",
+    ]
+
+
+def test_sparse_checkout_patterns_app():
+    patterns = sparse_checkout_patterns(PATHS, ["*", "!*{{app_name}}*", "!/.template-infra/"])
+
+    assert patterns == ["/.template-infra/", "/infra/{{app_name}}/"]
+    assert kept(patterns) == {
+        ".template-infra/base.yml",
+        ".template-infra/{{app_name}}.yml",
+        "infra/{{app_name}}/app-config/main.tf",
+        "infra/{{app_name}}/service/main.tf",
+    }
+
+
+def test_sparse_checkout_patterns_nothing_excluded():
+    assert sparse_checkout_patterns(PATHS, []) == ["/*"]
+
+
+def test_sparse_checkout_patterns_subdirectory():
+    paths = ["copier.yml", "template/keep.txt", "template/skip.txt"]
+
+    patterns = sparse_checkout_patterns(paths, ["skip.txt"], subdirectory="template")
+
+    assert patterns == ["/copier.yml", "/template/keep.txt"]
+
+
+@pytest.mark.parametrize(
+    ("path", "expected"),
+    [
+        ("weird*name.txt", "/weird\\*name.txt"),
+        ("[brackets].txt", "/\\[brackets].txt"),
+    ],
+)
+def test_sparse_checkout_patterns_escaped(path, expected):
+    assert sparse_checkout_patterns([path, "skip.txt"], ["skip.txt"]) == [expected]
+
+
+PATTERN_SETS = [
+    [],
+    ["*{{app_name}}*"],
+    ["*", "!*{{app_name}}*", "!/.template-infra/"],
+    ["infra/", "!infra/project-config/"],
+    ["/infra/modules/", "*.md", "!README.md"],
+    ["# comment", "", "**/main.tf"],
+]
+
+
+@pytest.mark.parametrize("patterns", PATTERN_SETS)
+def test_src_exclude_matcher_matches_pathspec(patterns):
+    expected = PathSpec.from_lines("gitwildmatch", patterns)
+    matcher = src_exclude_matcher(patterns)
+
+    for path in [*PATHS, "infra", "infra/{{app_name}}", ".template-infra"]:
+        assert matcher(Path(path)) == expected.match_file(path), path
+
+
+def test_src_exclude_matcher_cached():
+    assert src_exclude_matcher(["*.md"]) is src_exclude_matcher(("*.md",))
+
+
+@pytest.mark.parametrize(
+    ("patterns", "dir_path", "expected"),
+    [
+        ([], "infra", False),
+        (["*{{app_name}}*"], "infra/{{app_name}}", True),
+        (["*{{app_name}}*"], "infra", False),
+        (["infra/"], "infra", True),
+        (["infra/"], "infra/modules", True),
+        (["infra/", "!infra/project-config/"], "infra", False),
+        (["infra/", "!infra/project-config/"], "infra/modules", True),
+        (["infra/", "!infra/project-config/"], "infra/project-config", False),
+        (["infra/", "!/infra/*-config/"], "infra/modules", True),
+        (["infra/", "!/infra/*-config/"], "infra/project-config", False),
+        # could match something at any depth
+        (["*", "!*{{app_name}}*"], "infra", False),
+        (["*", "!*{{app_name}}*", "!/.template-infra/"], "docs", False),
+        (["*", "!/.template-infra/"], "docs", True),
+        (["*", "!/.template-infra/"], ".template-infra", False),
+        # later exclusions don't matter
+        (["*", "!/docs/", "/docs/"], "docs", True),
+        (["*.md"], "docs", False),
+    ],
+)
+def test_is_dir_excluded(patterns, dir_path, expected):
+    assert src_exclude_matcher(patterns).is_dir_excluded(Path(dir_path)) == expected
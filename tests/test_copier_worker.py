@@ -0,0 +1,204 @@
+from pathlib import Path
+
+import pytest
+
+import nava.platform.util.git_mirror as git_mirror
+from nava.platform.copier_worker import (
+    NavaTemplate,
+    render_template_files,
+    run_copy,
+    run_update,
+)
+from nava.platform.util.git_mirror import GitMirrorCache
+from tests.lib import DirectoryContent
+from tests.lib.new_directory import new_dir_with_git
+
+
+@pytest.fixture
+def upstream(tmp_path):
+    git = new_dir_with_git(tmp_path / "upstream")
+    (git.dir / "README.md").write_text("v1")
+    git.commit_all("Initial commit")
+    git.tag("v0.1.0")
+    (git.dir / "README.md").write_text("v2")
+    git.commit_all("Second commit")
+    return git
+
+
+def test_remote_template_checkouts_shared_from_mirror(upstream, monkeypatch, tmp_path):
+    cache = GitMirrorCache(tmp_path / "mirrors")
+    monkeypatch.setattr(git_mirror, "default_mirror_cache", lambda: cache)
+    url = "git+" + upstream.dir.as_uri()
+
+    template = NavaTemplate(url=url)
+
+    assert (template.local_abspath / "README.md").read_text() == "v1"
+    assert template.commit == "v0.1.0"
+    assert cache.mirror_path(upstream.dir.as_uri()).exists()
+
+    head_template = NavaTemplate(url=url, ref="HEAD")
+    assert (head_template.local_abspath / "README.md").read_text() == "v2"
+
+    # checkouts are shared and outlive any single template object
+    same_version_template = NavaTemplate(url=url, ref="v0.1.0")
+    assert same_version_template.local_abspath == template.local_abspath
+
+    template._cleanup()
+    assert template.local_abspath.exists()
+
+
+def test_parallel_rendering_matches_serial(tmp_path):
+    git = new_dir_with_git(tmp_path / "template")
+    DirectoryContent(
+        {
+            "copier.yml": "app_name:\n  type: str\n",
+            "README.md": "not {{ templated }}",
+            "skipped.txt.jinja": "{{ app_name }}",
+            "{{app_name}}": {f"file-{i}.txt.jinja": f"{i} {{{{ app_name }}}}" for i in range(20)},
+            "static": {"data.bin": "\x00\x01"},
+        }
+    ).to_fs(str(git.dir))
+    git.commit_all("Initial commit")
+
+    for jobs in (1, 4):
+        run_copy(
+            str(git.dir),
+            tmp_path / f"jobs-{jobs}",
+            data={"app_name": "foo"},
+            vcs_ref="HEAD",
+            src_exclude=["skipped*"],
+            defaults=True,
+            quiet=True,
+            jobs=jobs,
+        )
+
+    serial = DirectoryContent.from_fs(tmp_path / "jobs-1")
+    parallel = DirectoryContent.from_fs(tmp_path / "jobs-4")
+
+    assert parallel == serial
+    assert (tmp_path / "jobs-4" / "foo" / "file-3.txt").read_text() == "3 foo"
+    assert not (tmp_path / "jobs-4" / "skipped.txt").exists()
+
+
+def test_render_template_files(tmp_path):
+    git = new_dir_with_git(tmp_path / "template")
+    DirectoryContent(
+        {
+            "networks.tf.jinja": "{{ app_names | join(',') }}",
+            "{{app_name}}.txt.jinja": "{{ app_names | length }}",
+            "other.txt": "not rendered",
+        }
+    ).to_fs(str(git.dir))
+    git.commit_all("Initial commit")
+
+    render_template_files(
+        str(git.dir),
+        [("networks.tf.jinja", "infra/networks/main.tf"), ("{{app_name}}.txt.jinja", None)],
+        dst_path=tmp_path / "project",
+        data={"app_names": ["foo", "bar"], "app_name": "foo"},
+        vcs_ref="HEAD",
+        quiet=True,
+    )
+
+    assert DirectoryContent.from_fs(tmp_path / "project") == DirectoryContent(
+        {"infra": {"networks": {"main.tf": "foo,bar"}}, "foo.txt": "2"}
+    )
+
+
+def test_unchanged_files_not_rewritten(tmp_path):
+    git = new_dir_with_git(tmp_path / "template")
+    DirectoryContent(
+        {"foo.txt.jinja": "{{ foo }}", "bar.txt.jinja": "{{ bar }}", "baz.txt": "static"}
+    ).to_fs(str(git.dir))
+    git.commit_all("Initial commit")
+
+    dst = tmp_path / "project"
+    worker = run_copy(str(git.dir), dst, data={"foo": "1", "bar": "1"}, vcs_ref="HEAD", quiet=True)
+    assert sorted(worker.files_written) == [Path("bar.txt"), Path("baz.txt"), Path("foo.txt")]
+    assert worker.files_skipped == []
+
+    unchanged_mtime = (dst / "bar.txt").stat().st_mtime_ns
+
+    worker = run_copy(
+        str(git.dir),
+        dst,
+        data={"foo": "2", "bar": "1"},
+        vcs_ref="HEAD",
+        overwrite=True,
+        quiet=True,
+    )
+
+    assert worker.files_written == [Path("foo.txt")]
+    assert sorted(worker.files_skipped) == [Path("bar.txt"), Path("baz.txt")]
+    assert (dst / "foo.txt").read_text() == "2"
+    assert (dst / "bar.txt").stat().st_mtime_ns == unchanged_mtime
+
+
+def test_manifest(tmp_path):
+    template = new_dir_with_git(tmp_path / "template")
+    DirectoryContent(
+        {
+            "{{_copier_conf.answers_file}}.jinja": "{{ _copier_answers|to_nice_yaml }}",
+            "copier.yml": "foo:\n  type: str\n",
+            "foo.txt.jinja": "{{ foo }}",
+            "same.txt": "same",
+            "removed.txt": "removed",
+        }
+    ).to_fs(str(template.dir))
+    template.commit_all("Initial commit")
+    template.tag("v0.1.0")
+
+    project = new_dir_with_git(tmp_path / "project")
+    (project.dir / "unrelated.txt").write_text("unrelated")
+    project.commit_all("Initial commit")
+
+    worker = run_copy(
+        str(template.dir), project.dir, data={"foo": "1"}, vcs_ref="v0.1.0", quiet=True
+    )
+
+    assert sorted(worker.manifest.created) == [
+        Path(".copier-answers.yml"),
+        Path("foo.txt"),
+        Path("removed.txt"),
+        Path("same.txt"),
+    ]
+    assert worker.manifest.modified == []
+    assert worker.manifest.complete
+    project.commit_all("Install")
+
+    (template.dir / "removed.txt").unlink()
+    (template.dir / "added.txt").write_text("added")
+    template.commit_all("Second commit")
+    template.tag("v0.2.0")
+
+    worker = run_update(
+        project.dir,
+        data={"foo": "2"},
+        vcs_ref="v0.2.0",
+        overwrite=True,
+        skip_answered=True,
+        quiet=True,
+    )
+
+    manifest = worker.manifest
+    assert manifest.created == [Path("added.txt")]
+    assert manifest.deleted == [Path("removed.txt")]
+    assert Path("foo.txt") in manifest.modified
+    assert Path("unrelated.txt") not in manifest.paths
+    assert (project.dir / "foo.txt").read_text() == "2"
+
+
+def test_render_stats_not_in_render_context(tmp_path):
+    git = new_dir_with_git(tmp_path / "template")
+    DirectoryContent(
+        {"conf.txt.jinja": "{{ _copier_conf.keys() | sort | join(',') }}", "foo.txt": "foo"}
+    ).to_fs(str(git.dir))
+    git.commit_all("Initial commit")
+
+    worker = run_copy(str(git.dir), tmp_path / "project", vcs_ref="HEAD", quiet=True)
+
+    conf_keys = (tmp_path / "project" / "conf.txt").read_text().split(",")
+    assert "dst_path" in conf_keys
+    assert "render_stats" not in conf_keys
+    assert "update_renders" not in conf_keys
+    assert sorted(worker.files_written) == [Path("conf.txt"), Path("foo.txt")]
@@ -0,0 +1,30 @@
+import os
+
+from nava.platform.util.files.cache import dir_size, mark_used, prune_lru
+
+
+def test_prune_lru_removes_least_recently_used_first(tmp_path):
+    entries = []
+    for i, name in enumerate(["old", "middle", "new"]):
+        entry = tmp_path / name
+        entry.mkdir()
+        (entry / "data").write_bytes(b"x" * 100)
+        mark_used(entry)
+        os.utime(entry / ".nava-last-used", (i, i))
+        entries.append(entry)
+
+    removed = prune_lru(entries, max_size_bytes=250)
+
+    assert removed == [tmp_path / "old"]
+    assert not (tmp_path / "old").exists()
+    assert (tmp_path / "middle").exists()
+    assert (tmp_path / "new").exists()
+
+
+def test_prune_lru_never_removes_kept_entries(tmp_path):
+    entry = tmp_path / "only"
+    entry.mkdir()
+    (entry / "data").write_bytes(b"x" * 100)
+
+    assert prune_lru([entry], max_size_bytes=0, keep=[entry]) == []
+    assert dir_size(entry) == 100
@@ -0,0 +1,151 @@
+import pytest
+
+from nava.platform.util.git import CloneStrategy, GitProject, clone_to, select_clone_strategy
+from tests.lib.new_directory import new_dir_with_git
+
+
+@pytest.fixture
+def upstream(tmp_path) -> GitProject:
+    git = new_dir_with_git(tmp_path / "upstream")
+    (git.dir / "README.md").write_text("v1")
+    git.commit_all("First")
+    git.tag("v0.1.0")
+    (git.dir / "README.md").write_text("v2")
+    git.commit_all("Second")
+    return git
+
+
+@pytest.mark.parametrize(
+    ("ref", "needs_history", "expected"),
+    [
+        (None, False, CloneStrategy.FULL),
+        ("HEAD", False, CloneStrategy.FULL),
+        ("v0.1.0", False, CloneStrategy.SHALLOW_REF),
+        ("v0.1.0", True, CloneStrategy.FULL),
+        ("main", False, CloneStrategy.SHALLOW_REF),
+        ("a" * 40, False, CloneStrategy.SHALLOW_COMMIT),
+        ("abc1234", False, CloneStrategy.FULL),
+        ("v0.1.0-3-gabc1234", False, CloneStrategy.FULL),
+    ],
+)
+def test_select_clone_strategy(ref, needs_history, expected):
+    assert select_clone_strategy(ref, needs_history=needs_history) == expected
+
+
+def test_clone_to_shallow_ref(upstream, tmp_path):
+    dest = tmp_path / "dest"
+
+    result = clone_to(upstream.dir.as_uri(), dest, "v0.1.0", CloneStrategy.SHALLOW_REF)
+
+    assert result.returncode == 0
+    assert (dest / "README.md").read_text() == "v1"
+    assert GitProject(dest).get_commit_count() == 1
+
+
+def test_clone_to_shallow_commit(upstream, tmp_path):
+    dest = tmp_path / "dest"
+    commit = upstream.resolve_commit("v0.1.0")
+    assert commit
+
+    result = clone_to(upstream.dir.as_uri(), dest, commit, CloneStrategy.SHALLOW_COMMIT)
+
+    assert result.returncode == 0
+    assert (dest / "README.md").read_text() == "v1"
+    assert GitProject(dest).get_commit_count() == 1
+
+
+def test_clone_to_shallow_falls_back_to_full(upstream, tmp_path):
+    dest = tmp_path / "dest"
+    commit = upstream.resolve_commit("v0.1.0")
+    assert commit
+
+    # not a tag or branch, so can't be cloned shallowly by name
+    result = clone_to(upstream.dir.as_uri(), dest, commit[:10], CloneStrategy.SHALLOW_REF)
+
+    assert result.returncode == 0
+    assert (dest / "README.md").read_text() == "v1"
+    assert GitProject(dest).get_commit_count() == 1
+    assert len(GitProject(dest).get_tags()) == 1
+
+
+def test_status_limited_to_paths(upstream):
+    (upstream.dir / "README.md").write_text("v3")
+    (upstream.dir / "new").mkdir()
+    (upstream.dir / "new" / "file.txt").write_text("new")
+    (upstream.dir / "unrelated.txt").write_text("unrelated")
+
+    status = upstream.status(["README.md", "new/file.txt", "missing.txt"])
+
+    assert status.changed == ["README.md"]
+    assert status.untracked == ["new/file.txt"]
+    assert upstream.status([]).is_clean
+    assert sorted(upstream.status().untracked) == ["new/", "unrelated.txt"]
+
+
+def test_commit_paths(upstream):
+    (upstream.dir / "README.md").unlink()
+    (upstream.dir / "new.txt").write_text("new")
+    (upstream.dir / "unrelated.txt").write_text("unrelated")
+    parent = upstream.get_commit_hash_for_head()
+
+    result = upstream.commit_paths("Change\n\nDetails", ["README.md", "new.txt", "missing.txt"])
+
+    assert result.returncode == 0
+    assert result.stdout == f"[main {upstream.get_commit_hash_for_head()[:7]}] Change\n"
+    assert upstream.status().untracked == ["unrelated.txt"]
+    assert upstream.status().changed == []
+    show = upstream._run_cmd(["git", "show", "--name-status", "--format=", "HEAD"])
+    assert show.stdout.splitlines() == ["D\tREADME.md", "A\tnew.txt"]
+    assert upstream.log("-1", "--format=%P%n%B").stdout.strip() == f"{parent}\nChange\n\nDetails"
+    assert upstream.log("-1", "--walk-reflogs", "--format=%gs").stdout.strip() == "commit: Change"
+
+
+def test_commit_paths_skips_ignored(upstream):
+    (upstream.dir / ".gitignore").write_text("generated.txt\n")
+    upstream.commit_all("Ignore generated")
+    (upstream.dir / "generated.txt").write_text("generated")
+    (upstream.dir / "README.md").write_text("v3")
+
+    result = upstream.commit_paths("Change", ["README.md", "generated.txt"])
+
+    assert result.returncode == 0
+    show = upstream._run_cmd(["git", "show", "--name-status", "--format=", "HEAD"])
+    assert show.stdout.splitlines() == ["M\tREADME.md"]
+    assert upstream.status().untracked == []
+
+
+def test_commit_paths_nothing_to_commit(upstream):
+    (upstream.dir / "unrelated.txt").write_text("unrelated")
+    head = upstream.get_commit_hash_for_head()
+
+    result = upstream.commit_paths("Change", ["README.md"])
+
+    assert result.returncode != 0
+    assert upstream.get_commit_hash_for_head() == head
+
+
+@pytest.mark.parametrize("run_hooks", [None, True])
+def test_commit_paths_runs_hooks(upstream, run_hooks):
+    hook = upstream.dir / ".git" / "hooks" / "pre-commit"
+    hook.write_text("#!/bin/sh\ntouch ran-hook\n")
+    hook.chmod(0o755)
+    (upstream.dir / "README.md").write_text("v3")
+
+    result = upstream.commit_paths("Change", ["README.md"], run_hooks=run_hooks)
+
+    assert result.returncode == 0
+    assert (upstream.dir / "ran-hook").exists()
+    assert upstream.status().changed == []
+
+
+def test_commit_paths_skips_hooks(upstream):
+    hook = upstream.dir / ".git" / "hooks" / "pre-commit"
+    hook.write_text("#!/bin/sh\ntouch ran-hook\n")
+    hook.chmod(0o755)
+    (upstream.dir / "README.md").write_text("v3")
+
+    result = upstream.commit_paths("Change", ["README.md"], run_hooks=False)
+
+    assert result.returncode == 0
+    assert not (upstream.dir / "ran-hook").exists()
+    assert upstream.status().changed == []
@@ -0,0 +1,105 @@
+import subprocess
+
+import pytest
+
+from nava.platform.util.git import GitProject, run_text
+from nava.platform.util.git_describe import DescribeIndex
+from tests.lib.new_directory import new_dir_with_git
+
+
+def commit(git: GitProject, name: str) -> str:
+    (git.dir / f"{name}.txt").write_text(name)
+    git.commit_all(name)
+    return git.get_commit_hash_for_head()  # type: ignore[return-value]
+
+
+@pytest.fixture
+def git(tmp_path) -> GitProject:
+    r"""A history with a merge.
+
+    a - b (v0.1.0) - c - f (merge) - g (v0.2.0) - h
+          \             /
+           d ---- e ---
+    """
+    git = new_dir_with_git(tmp_path / "repo")
+    commit(git, "a")
+    commit(git, "b")
+    git.tag("v0.1.0")
+    git.checkout("-b", "feature")
+    commit(git, "d")
+    commit(git, "e")
+    git.checkout("main")
+    commit(git, "c")
+    subprocess.run(["git", "merge", "--no-ff", "-m", "f", "feature"], cwd=git.dir, check=True)
+    commit(git, "g")
+    subprocess.run(["git", "tag", "-a", "-m", "release", "v0.2.0"], cwd=git.dir, check=True)
+    commit(git, "h")
+    return git
+
+
+def all_commits(git: GitProject) -> list[str]:
+    return run_text(["git", "rev-list", "--all"], cwd=git.dir).stdout.split()
+
+
+def test_describe_matches_git(git):
+    index = DescribeIndex(git)
+
+    for commit_hash in all_commits(git):
+        expected = run_text(
+            ["git", "describe", "--tags", "--always", commit_hash], cwd=git.dir
+        ).stdout.strip()
+        assert str(index.describe(commit_hash)) == expected
+
+
+def test_containing_tag_matches_git(git):
+    index = DescribeIndex(git)
+
+    for commit_hash in all_commits(git):
+        result = run_text(["git", "describe", "--contains", commit_hash], cwd=git.dir)
+        expected = result.stdout.strip().partition("~")[0].partition("^")[0] or None
+        assert index.closest_containing_tag(commit_hash) == expected
+
+
+def test_containing_tag_distance(git):
+    index = DescribeIndex(git)
+
+    b = git.resolve_commit("v0.1.0")
+    assert index.containing_tag(b) == index.containing_tag("v0.1.0")
+    assert index.containing_tag(f"{b}~1").distance == 1  # type: ignore[union-attr]
+    assert index.containing_tag("HEAD") is None
+
+
+def test_containing_tag_exclude(git):
+    index = DescribeIndex(git)
+
+    assert index.closest_containing_tag("v0.1.0") == "v0.1.0"
+    assert index.closest_containing_tag("v0.1.0", exclude="v0.1.*") == "v0.2.0"
+
+
+def test_unknown_commit(git):
+    index = DescribeIndex(git)
+
+    assert not index.has_commit("0" * 40)
+    assert index.describe("0" * 40) is None
+
+
+def test_rebuilt_when_refs_change(git):
+    index = DescribeIndex(git)
+    head = commit(git, "i")
+    assert str(index.describe()) == f"v0.2.0-2-g{head[:7]}"
+
+    git.tag("v0.3.0")
+
+    assert str(index.describe()) == "v0.3.0"
+
+
+def test_git_project_uses_index(git, monkeypatch):
+    b = git.resolve_commit("v0.1.0")
+    assert git.get_closest_tag(b) == "v0.1.0"
+    assert git.get_commit_description() == str(DescribeIndex(git).describe())
+
+    def fail(*args: str) -> None:
+        raise AssertionError("should not have needed git describe")
+
+    monkeypatch.setattr(git, "_run_cmd", fail)
+    assert git.get_closest_tag(f"{b}~1") == "v0.1.0"
@@ -0,0 +1,112 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import nava.platform.util.git_mirror as git_mirror
+from nava.platform.util.git import GitProject
+from nava.platform.util.git_mirror import GitMirrorCache
+from tests.lib.new_directory import new_dir_with_git
+
+
+@pytest.fixture
+def upstream(tmp_path) -> GitProject:
+    git = new_dir_with_git(tmp_path / "upstream")
+    (git.dir / "README.md").write_text("hello")
+    git.commit_all("Initial commit")
+    git.tag("v0.1.0")
+    return git
+
+
+@pytest.fixture
+def cache(tmp_path) -> GitMirrorCache:
+    return GitMirrorCache(tmp_path / "mirrors")
+
+
+@pytest.fixture(autouse=True)
+def reset_fetched(monkeypatch):
+    monkeypatch.setattr(git_mirror, "_fetched_this_process", set())
+
+
+def test_mirror_is_reused(cache, upstream):
+    url = upstream.dir.as_uri()
+
+    mirror = cache.mirror(url)
+
+    assert mirror == cache.mirror_path(url)
+    assert (mirror / "HEAD").exists()
+    assert cache.mirror(url) == mirror
+
+
+def test_mirror_fetches_once_per_process(cache, upstream):
+    url = upstream.dir.as_uri()
+    mirror = cache.mirror(url)
+
+    upstream.tag("v0.2.0")
+    assert "v0.2.0" not in GitProject(mirror).get_tags()
+
+    # same "process", so no fetch
+    cache.mirror(url)
+    assert "v0.2.0" not in GitProject(mirror).get_tags()
+
+    git_mirror._fetched_this_process.clear()
+    cache.mirror(url)
+    assert "v0.2.0" in GitProject(mirror).get_tags()
+
+
+def test_mirror_fetched_by_parent_process_not_fetched_again(cache, upstream):
+    url = upstream.dir.as_uri()
+    mirror = cache.mirror(url)
+    upstream.tag("v0.2.0")
+
+    child = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys; from nava.platform.util.git_mirror import GitMirrorCache; "
+            "GitMirrorCache(sys.argv[1]).mirror(sys.argv[2])",
+            str(cache.root),
+            url,
+        ],
+        env=os.environ | git_mirror.fetched_mirrors_env(),
+    )
+
+    assert child.returncode == 0
+    assert "v0.2.0" not in GitProject(mirror).get_tags()
+
+
+def test_clone_to_from_mirror(cache, upstream, tmp_path):
+    dest = tmp_path / "clone"
+
+    cache.clone_to(upstream.dir.as_uri(), dest, "v0.1.0").check_returncode()
+
+    assert (dest / "README.md").read_text() == "hello"
+    assert GitProject(dest).get_tags() == ["v0.1.0"]
+
+
+def test_prune_keeps_size_bound(tmp_path, upstream):
+    cache = GitMirrorCache(tmp_path / "mirrors", max_size_bytes=0)
+    other = new_dir_with_git(tmp_path / "other")
+    other.commit_all("--allow-empty")
+    (other.dir / "file").write_text("other")
+    other.commit_all("Other")
+
+    first = cache.mirror(upstream.dir.as_uri())
+    second = cache.mirror(other.dir.as_uri())
+
+    assert not first.exists()
+    assert second.exists()
+
+
+def test_clone_if_necessary_uses_mirror(upstream, monkeypatch, tmp_path):
+    cache = GitMirrorCache(tmp_path / "mirrors")
+    monkeypatch.setattr(git_mirror, "default_mirror_cache", lambda: cache)
+    url = upstream.dir.as_uri()
+
+    with GitProject.clone_if_necessary("git+" + url) as template_git:
+        assert Path(template_git.dir, "README.md").exists()
+        assert template_git.get_tags() == ["v0.1.0"]
+
+    assert cache.mirror_path(url).exists()
@@ -0,0 +1,148 @@
+import subprocess
+
+import pytest
+
+from nava.platform.util.git import GitProject
+from nava.platform.util.git_plumbing import GitCatFile, parse_status, ref_state
+from tests.lib.new_directory import new_dir_with_git
+
+
+@pytest.fixture
+def git(tmp_path) -> GitProject:
+    git = new_dir_with_git(tmp_path / "repo")
+    (git.dir / "README.md").write_text("hello")
+    git.commit_all("Initial commit")
+    return git
+
+
+def test_cat_file_info_and_read(git):
+    cat_file = GitCatFile(git.dir)
+
+    info = cat_file.info("HEAD")
+    assert info is not None
+    assert info.type == "commit"
+    assert info.oid == git.get_commit_hash_for_head()
+
+    result = cat_file.read("HEAD:README.md")
+    assert result is not None
+    assert result[0].type == "blob"
+    assert result[1] == b"hello"
+
+    assert cat_file.info("does-not-exist") is None
+    assert cat_file.read("does-not-exist") is None
+
+    cat_file.close()
+
+
+def test_parse_status():
+    output = "\0".join(
+        [
+            "# branch.oid 1234abcd",
+            "# branch.head main",
+            "1 .M N... 100644 100644 100644 aaaa bbbb changed file.txt",
+            "2 R. N... 100644 100644 100644 aaaa bbbb R100 new.txt",
+            "old.txt",
+            "u UU N... 100644 100644 100644 100644 aaaa bbbb cccc conflicted.txt",
+            "? untracked.txt",
+            "! ignored.txt",
+            "",
+        ]
+    )
+
+    status = parse_status(output)
+
+    assert status.head == "1234abcd"
+    assert status.branch == "main"
+    assert status.changed == ["changed file.txt", "new.txt"]
+    assert status.unmerged == ["conflicted.txt"]
+    assert status.untracked == ["untracked.txt"]
+    assert status.ignored == ["ignored.txt"]
+    assert not status.is_clean
+
+
+def test_parse_status_empty_repo():
+    status = parse_status("# branch.oid (initial)\0# branch.head main\0")
+
+    assert status.head is None
+    assert status.branch == "main"
+    assert status.is_clean
+
+
+def test_ref_state_changes_with_refs(git):
+    git_dir = git.dir / ".git"
+    before = ref_state(git_dir)
+
+    assert ref_state(git_dir) == before
+
+    # created outside of GitProject, so nothing knows to invalidate anything
+    subprocess.run(["git", "tag", "v1.0.0"], cwd=git.dir, check=True)
+
+    after_tag = ref_state(git_dir)
+    assert after_tag != before
+
+    # nested in an existing directory, straight after the previous one
+    subprocess.run(["git", "tag", "migration/v1.0.0"], cwd=git.dir, check=True)
+    after_nested_tag = ref_state(git_dir)
+    assert after_nested_tag != after_tag
+    subprocess.run(["git", "tag", "migration/v2.0.0"], cwd=git.dir, check=True)
+    assert ref_state(git_dir) != after_nested_tag
+
+    # a commit only changes the file of the checked out branch
+    after_tags = ref_state(git_dir)
+    subprocess.run(
+        ["git", "commit", "--allow-empty", "--quiet", "-m", "Empty"], cwd=git.dir, check=True
+    )
+    assert ref_state(git_dir) != after_tags
+
+
+def test_git_project_status(git):
+    assert git.status().is_clean
+
+    (git.dir / "README.md").write_text("goodbye")
+    (git.dir / "new.txt").write_text("new")
+
+    status = git.status()
+    assert status.head == git.get_commit_hash_for_head()
+    assert status.branch == "main"
+    assert status.changed == ["README.md"]
+    assert status.untracked == ["new.txt"]
+    assert not git.has_merge_conflicts(status)
+
+
+def test_git_project_has_merge_conflicts(git):
+    (git.dir / "README.md").write_text("<<<<<<< before\nhello\n=======\nbye\n>>>>>>> after\n")
+    (git.dir / "other.txt").write_text("no conflicts\n")
+    git.add("other.txt")
+
+    assert git.has_merge_conflicts()
+    assert git.merge_conflict_paths() == ["README.md"]
+
+
+def test_git_project_queries_follow_ref_changes(git):
+    assert git.get_tags() == []
+    assert git.get_commit_count() == 1
+
+    subprocess.run(["git", "tag", "v1.0.0"], cwd=git.dir, check=True)
+    assert git.get_tags() == ["v1.0.0"]
+    assert git.get_commit_description() == "v1.0.0"
+
+    (git.dir / "README.md").write_text("goodbye")
+    git.commit_all("Second commit")
+    assert git.get_commit_count() == 2
+    assert git.get_commit_description().startswith("v1.0.0-1-")
+
+
+def test_git_project_resolve_commit(git):
+    head = git.get_commit_hash_for_head()
+    git.tag("v1.0.0")
+
+    assert git.resolve_commit("v1.0.0") == head
+    assert git.resolve_commit("does-not-exist") is None
+
+
+def test_git_project_empty_repo(tmp_path):
+    git = new_dir_with_git(tmp_path / "empty")
+
+    assert git.get_commit_hash_for_head() is None
+    assert git.get_commit_count() is None
+    assert git.status().is_clean
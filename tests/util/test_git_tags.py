@@ -0,0 +1,148 @@
+import subprocess
+import tempfile
+
+import pytest
+from packaging.version import Version
+
+import nava.platform.util.git_tags as git_tags
+from nava.platform.projects.migrate_from_legacy_template import get_closest_migration_tag
+from nava.platform.util.git import GitProject
+from nava.platform.util.git_tags import TagIndex, parse_ls_remote_tags, tag_index
+from tests.lib.new_directory import new_dir_with_git
+
+
+@pytest.fixture
+def git(tmp_path) -> GitProject:
+    git = new_dir_with_git(tmp_path / "repo")
+    (git.dir / "README.md").write_text("hello")
+    git.commit_all("Initial commit")
+    return git
+
+
+def add_tags(git: GitProject, *tags: str) -> None:
+    for tag in tags:
+        git.tag(tag)
+
+
+@pytest.mark.parametrize(
+    ("tags", "use_prereleases", "expected"),
+    [
+        ([], False, None),
+        (["not-a-version"], False, None),
+        (["v0.1.0", "v0.10.0", "v0.2.0"], False, "v0.10.0"),
+        (["v0.1.0", "v0.2.0rc1"], False, "v0.1.0"),
+        (["v0.1.0", "v0.2.0rc1"], True, "v0.2.0rc1"),
+        (["v0.1.0", "prefix/v0.2.0"], False, "v0.1.0"),
+    ],
+)
+def test_latest(git, tags, use_prereleases, expected):
+    add_tags(git, *tags)
+
+    assert TagIndex(git).latest(use_prereleases=use_prereleases) == expected
+
+
+def test_entries_sorted_by_version(git):
+    add_tags(git, "v0.10.0", "not-a-version", "v0.2.0", "v0.1.0")
+
+    entries = TagIndex(git).entries
+
+    assert [e.name for e in entries] == ["v0.1.0", "v0.2.0", "v0.10.0", "not-a-version"]
+    assert {e.commit for e in entries} == {git.get_commit_hash_for_head()}
+
+
+def test_annotated_tags_point_to_commit(git):
+    subprocess.run(["git", "tag", "-a", "-m", "release", "v1.0.0"], cwd=git.dir, check=True)
+
+    assert TagIndex(git).entries[0].commit == git.get_commit_hash_for_head()
+
+
+def test_newer_versions(git):
+    add_tags(git, "v0.1.0", "v0.2.0", "v0.3.0", "platform-cli-migration/v0.4.0")
+
+    assert TagIndex(git).newer_versions(Version("0.2.0")) == [Version("0.2.0"), Version("0.3.0")]
+
+
+def test_parse_ls_remote_tags(git):
+    add_tags(git, "v1.0.0", "not-a-version")
+    subprocess.run(["git", "tag", "-a", "-m", "Release", "v1.1.0"], cwd=git.dir, check=True)
+    commit = git.get_commit_hash_for_head()
+
+    result = subprocess.run(
+        ["git", "ls-remote", "--tags", str(git.dir)], capture_output=True, text=True, check=True
+    )
+    entries = parse_ls_remote_tags(result.stdout)
+
+    assert [e.name for e in entries] == [e.name for e in tag_index(git).entries]
+    assert {e.commit for e in entries} == {commit}
+
+
+def test_rebuilt_when_refs_change(git):
+    index = TagIndex(git)
+    assert index.entries == []
+
+    # outside of GitProject
+    subprocess.run(["git", "tag", "v1.0.0"], cwd=git.dir, check=True)
+
+    assert [e.name for e in index.entries] == ["v1.0.0"]
+
+
+def test_persisted(git, tmp_path, monkeypatch):
+    index_file = tmp_path / "index.json"
+    add_tags(git, "v1.0.0")
+
+    assert TagIndex(git, index_file).latest() == "v1.0.0"
+    assert index_file.exists()
+
+    def fail() -> None:
+        raise AssertionError("should have used persisted index")
+
+    fresh_index = TagIndex(git, index_file)
+    monkeypatch.setattr(fresh_index, "_list_tags", fail)
+    assert fresh_index.latest() == "v1.0.0"
+
+
+def test_tag_index_shared_per_repo(git, monkeypatch):
+    monkeypatch.setattr(git_tags, "_indexes", {})
+
+    assert tag_index(git) is tag_index(GitProject(git.dir))
+
+
+def test_tag_index_persisted_unless_temporary(git, tmp_path, monkeypatch):
+    monkeypatch.setattr(git_tags, "_indexes", {})
+    monkeypatch.setattr(tempfile, "tempdir", str(tmp_path / "elsewhere"))
+
+    assert tag_index(git).index_file is not None
+
+    monkeypatch.setattr(git_tags, "_indexes", {})
+    monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+
+    assert tag_index(git).index_file is None
+
+
+def test_closest_migration_tag(git):
+    add_tags(git, "v0.1.0", "platform-cli-migration/v0.1.0")
+    (git.dir / "README.md").write_text("goodbye")
+    git.commit_all("Second commit")
+    commit = git.get_commit_hash_for_head()
+    add_tags(git, "v0.2.0")
+
+    assert get_closest_migration_tag(git, commit) == ("platform-cli-migration/v0.1.0", False)
+
+    (git.dir / "README.md").write_text("migrated")
+    git.commit_all("Migration commit")
+    add_tags(git, "platform-cli-migration/v0.2.0")
+
+    assert get_closest_migration_tag(git, commit) == ("platform-cli-migration/v0.2.0", True)
+
+
+def test_closest_migration_tag_unversioned(git):
+    add_tags(git, "v0.1.0")
+    commit = git.get_commit_hash_for_head()
+    assert commit
+    (git.dir / "README.md").write_text("migrated")
+    git.commit_all("Migration commit")
+    add_tags(git, "platform-cli-migration/v0.1.0", "platform-cli-migration/latest")
+
+    # even with an exact match
+    with pytest.raises(Exception, match="from platform-cli-migration/latest"):
+        get_closest_migration_tag(git, commit)
@@ -0,0 +1,90 @@
+import pytest
+
+from nava.platform.util import hcl
+
+
+def test_parse_blocks_and_attributes():
+    body = hcl.parse(
+        """
+        # comment
+        terraform {
+          required_version = ">= 1.2.0"
+        }
+
+        /* a block
+           comment */
+        output "name" { value = local.name }  // trailing comment
+        """
+    )
+
+    assert [block.type for block in body.blocks] == ["terraform", "output"]
+    assert body.blocks[0].body.attributes == [
+        hcl.Attribute("required_version", hcl.Literal(">= 1.2.0"))
+    ]
+    assert body.blocks[1].labels == ["name"]
+    assert body.blocks[1].body.attributes == [
+        hcl.Attribute("value", hcl.Reference(("local", "name")))
+    ]
+
+
+@pytest.mark.parametrize(
+    ("source", "expected"),
+    [
+        ('"foo"', "foo"),
+        (r'"a\"b\\c\ndé"', 'a"b\\c\ndé'),
+        ('"$${literal}"', "${literal}"),
+        ("42", 42),
+        ("-1.5", -1.5),
+        ("true", True),
+        ("null", None),
+        ('"${local.name}-suffix"', "app-suffix"),
+        ('"${local.count} ${local.enabled}"', "3 true"),
+        ("local.name", "app"),
+        ("<<-EOT\n    line ${local.name}\n      indented\n    EOT", "line app\n  indented\n"),
+        ("var.name", hcl.UNKNOWN),
+        ('"${var.name}-suffix"', hcl.UNKNOWN),
+        ('upper("foo")', hcl.UNKNOWN),
+        ('["a", "b"]', hcl.UNKNOWN),
+        ('{\n  a = "b"\n}', hcl.UNKNOWN),
+        ('local.enabled ? "a" : "b"', hcl.UNKNOWN),
+        ('"%{if local.enabled}a%{endif}"', hcl.UNKNOWN),
+        ("local.missing", hcl.UNKNOWN),
+        ("local.cycle", hcl.UNKNOWN),
+    ],
+)
+def test_module_outputs(tmp_path, source, expected):
+    (tmp_path / "main.tf").write_text(
+        f"""
+        locals {{
+          name = "app"
+          count = 3
+          enabled = true
+          cycle = local.cycle
+          value = {source}
+        }}
+        """
+    )
+    (tmp_path / "outputs.tf").write_text('output "value" {\n  value = local.value\n}\n')
+
+    outputs = hcl.module_outputs(tmp_path)
+
+    if expected is hcl.UNKNOWN:
+        assert "value" not in outputs
+    else:
+        assert outputs["value"] == expected
+
+
+@pytest.mark.parametrize(
+    "source",
+    [
+        'locals {\n  a = "b"\n',
+        'locals {\n  a = "b\n}',
+        "locals {\n  a =\n}",
+        "locals {\n  a = [1, 2\n}",
+        "/* unterminated",
+        "}",
+    ],
+)
+def test_parse_invalid(source):
+    with pytest.raises(hcl.HclSyntaxError):
+        hcl.parse(source)